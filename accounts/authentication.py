@@ -0,0 +1,175 @@
+import copy
+import logging
+import time
+import uuid
+from time import perf_counter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache, caches
+from django.core.cache.backends.db import DatabaseCache
+from django.db import transaction
+from rest_framework.authentication import BaseAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from livestock_management.metrics import add_timing
+
+logger = logging.getLogger('accounts.authentication')
+
+_user_cache = {}
+# Shared cache key of a user's version; cached entries are only used while
+# it matches the version they were loaded at.
+USER_VERSION_KEY = 'auth-user-version:%s'
+
+
+def new_version():
+    return uuid.uuid4().hex
+
+
+def user_cache_enabled():
+    """
+    Whether users are cached. Checking the version in a database cache costs
+    the query the cache is meant to save, so it is then disabled and a
+    warning logged once per process.
+    """
+    if not settings.AUTH_USER_CACHE_TTL:
+        return False
+    if isinstance(caches['default'], DatabaseCache):
+        if not getattr(user_cache_enabled, 'warned', False):
+            user_cache_enabled.warned = True
+            logger.warning(
+                'AUTH_USER_CACHE_TTL is ignored: the default cache is a database table, so checking '
+                'a cached user would cost as much as loading it. Set REDIS_URL or use a memory cache.'
+            )
+        return False
+    return True
+
+
+def forget_user(user_id):
+    """
+    Drops the user from this process's cache now, and from every other
+    process's once the change commits.
+    """
+    _user_cache.pop(user_id, None)
+    transaction.on_commit(lambda: cache.set(USER_VERSION_KEY % user_id, new_version(), None))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that keeps recently seen users in a short-lived,
+    per-process cache so authenticated requests skip the user lookup.
+
+    Entries expire after AUTH_USER_CACHE_TTL seconds (0 disables the cache).
+    Saving or deleting a user bumps their version in the default cache,
+    which every request checks. With Redis a deactivated user is therefore
+    rejected by all processes on their next request; with the per-process
+    memory cache, other processes notice within AUTH_USER_CACHE_TTL seconds.
+    The cache stays off when the default cache is database-backed. Each
+    request gets its own copy of the cached user. Time spent here is
+    reported to the request metrics.
+    """
+    max_entries = 10000
+
+    def authenticate(self, request):
+        start = perf_counter()
+        try:
+            return super().authenticate(request)
+        finally:
+            add_timing('auth', perf_counter() - start)
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = None
+        if user_id is not None and user_cache_enabled():
+            version = cache.get_or_set(USER_VERSION_KEY % user_id, new_version, None)
+        user = self.get_cached_user(validated_token, version)
+        if user is None:
+            user = super().get_user(validated_token)
+            self.cache_user(validated_token, user, version)
+        return user
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for the async views; only a cache miss leaves the
+        event loop to load the user.
+        """
+        start = perf_counter()
+        try:
+            return await self._aauthenticate(request)
+        finally:
+            add_timing('auth', perf_counter() - start)
+
+    async def _aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        version = None
+        if user_id is not None and user_cache_enabled():
+            version = await cache.aget_or_set(USER_VERSION_KEY % user_id, new_version, None)
+        user = self.get_cached_user(validated_token, version)
+        if user is None:
+            user = await sync_to_async(super().get_user)(validated_token)
+            self.cache_user(validated_token, user, version)
+        return user, validated_token
+
+    def get_cached_user(self, validated_token, version):
+        entry = _user_cache.get(validated_token.get(api_settings.USER_ID_CLAIM))
+        if version is None or entry is None or entry[0] <= time.monotonic() or entry[1] != version:
+            return None
+
+        user = entry[2]
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed("The user's password has been changed.", code='password_changed')
+        # Model.__getstate__ copies _state and its related-object cache too.
+        return copy.copy(user)
+
+    def cache_user(self, validated_token, user, version):
+        ttl = settings.AUTH_USER_CACHE_TTL
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if not ttl or user_id is None or version is None:
+            return
+        if len(_user_cache) >= self.max_entries:
+            _user_cache.clear()
+        _user_cache[user_id] = (time.monotonic() + ttl, version, copy.copy(user))
+
+
+class StreamTicketAuthentication(BaseAuthentication):
+    """
+    Accepts ?ticket=, a signed user id from issue_ticket(), for clients such
+    as the browser EventSource that cannot send an Authorization header.
+    Unlike an access token, a ticket only opens event streams and expires
+    after EVENT_TICKET_SECONDS, so one left in an access log is of little
+    use.
+    """
+    query_param = 'ticket'
+    salt = 'accounts.stream-ticket'
+
+    @classmethod
+    def issue_ticket(cls, user):
+        return signing.dumps(user.pk, salt=cls.salt)
+
+    def authenticate(self, request):
+        ticket = request.query_params.get(self.query_param)
+        if not ticket:
+            return None
+        try:
+            user_id = signing.loads(ticket, salt=self.salt, max_age=settings.EVENT_TICKET_SECONDS)
+        except signing.BadSignature:
+            raise AuthenticationFailed('Invalid or expired stream ticket.', code='invalid_ticket')
+        user = get_user_model().objects.filter(pk=user_id, is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed('User not found or inactive.', code='user_inactive')
+        return user, None
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+from .throttles import LOGIN_THROTTLE_SCOPES, THROTTLE_CACHE_ALIAS
+
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_throttle_cache(app_configs, **kwargs):
+    """Login limits kept in a per-process cache multiply by the worker count."""
+    rates = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})
+    if settings.DEBUG or not any(rates.get(scope) for scope in LOGIN_THROTTLE_SCOPES):
+        return []
+    backend = settings.CACHES.get(THROTTLE_CACHE_ALIAS, settings.CACHES['default'])['BACKEND']
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    return [Error(
+        f'The login rate limits need a cache shared by every worker, not {backend}.',
+        hint=f'Set REDIS_URL, or point CACHES[{THROTTLE_CACHE_ALIAS!r}] at the database cache.',
+        id='accounts.E001',
+    )]
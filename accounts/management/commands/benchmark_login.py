@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from jobs import process
+from livestock_management.benchmark import BenchmarkRunner, default_scenarios
+from livestock_management.synthetic import DEFAULT_PASSWORD, DEFAULT_PREFIX
+
+PASSWORD = 'correct horse battery staple'
+
+
+def median_time(func, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = perf_counter()
+        func()
+        timings.append(perf_counter() - start)
+    return statistics.median(timings)
+
+
+def verify_repeatedly(hasher_path, encoded, iterations):
+    hasher = import_string(hasher_path)()
+    for _ in range(iterations):
+        hasher.verify(PASSWORD, encoded)
+    return iterations
+
+
+class Command(BaseCommand):
+    help = 'Measure password hashing, token issuance and login requests per second per core for each hasher profile'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', action='append', dest='profiles', choices=list(settings.PASSWORD_HASHER_PROFILES),
+                            help='Only measure this hasher profile (repeatable)')
+        parser.add_argument('--iterations', type=int, default=20, help='Hashes timed per profile')
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                            help='Processes verifying in parallel for the throughput figure; 0 skips it')
+        parser.add_argument('--requests', type=int, default=50,
+                            help='Login requests sent through the API with the active profile; 0 skips them')
+        parser.add_argument('--username', default=f'{DEFAULT_PREFIX}_owner_0000')
+        parser.add_argument('--password', default=DEFAULT_PASSWORD)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        user = User(pk=1, username='benchmark')
+        token_time = median_time(lambda: str(RefreshToken.for_user(user).access_token), iterations)
+        self.stdout.write(f'token issuance: {token_time * 1000:.2f} ms')
+
+        for profile in options['profiles'] or settings.PASSWORD_HASHER_PROFILES:
+            hasher_path = settings.PASSWORD_HASHER_PROFILES[profile]
+            hasher = import_string(hasher_path)()
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except ValueError as exc:
+                self.stdout.write(self.style.WARNING(f'{profile:<8} skipped: {exc}'))
+                continue
+            hash_time = median_time(lambda: hasher.encode(PASSWORD, hasher.salt()), iterations)
+            verify_time = median_time(lambda: hasher.verify(PASSWORD, encoded), iterations)
+            line = (
+                f'{profile:<8} hash {hash_time * 1000:7.2f} ms  verify {verify_time * 1000:7.2f} ms  '
+                f'~{1 / (verify_time + token_time):6.1f} logins/s/core'
+            )
+            if options['processes']:
+                line += '  ' + self.measure_parallel(hasher_path, encoded, verify_time, options['processes'])
+            self.stdout.write(line)
+
+        if options['requests']:
+            self.measure_requests(options)
+
+    def measure_parallel(self, hasher_path, encoded, verify_time, processes):
+        # About two seconds of work per process, enough to amortise start-up.
+        per_process = max(1, int(2 / verify_time))
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(processes, mp_context=context, initializer=process.setup) as pool:
+            list(pool.map(verify_repeatedly, [hasher_path] * processes, [encoded] * processes, [1] * processes))
+            start = perf_counter()
+            total = sum(pool.map(verify_repeatedly, [hasher_path] * processes, [encoded] * processes,
+                                 [per_process] * processes))
+            elapsed = perf_counter() - start
+        return f'{processes} processes: {total / elapsed:7.1f} verifies/s ({total / elapsed / processes:.1f}/core)'
+
+    def measure_requests(self, options):
+        login = next(scenario for scenario in default_scenarios(options['username'], options['password'])
+                     if scenario.name == 'login')
+        runner = BenchmarkRunner(options['username'], options['password'], iterations=options['requests'], warmup=2)
+        try:
+            result = runner.run([login])['login']
+        except RuntimeError as exc:
+            raise CommandError(f'{exc}. Generate data first with: manage.py generate_farm_data')
+        self.stdout.write(self.style.SUCCESS(
+            f"POST /api/auth/login/ with {settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1]}: "
+            f"{result['requests_per_s']} requests/s on one core, p50 {result['latency_ms']['p50']} ms, "
+            f"p99 {result['latency_ms']['p99']} ms, {result['errors']} errors"
+        ))
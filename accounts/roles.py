@@ -0,0 +1,36 @@
+"""
+Role -> permission registry.
+
+Built once at import time; views and permission checks look roles up here
+instead of rebuilding the lists on every request. The payloads are shared,
+so treat them as read-only.
+"""
+
+ROLE_PERMISSIONS = {
+    'admin': {
+        'dashboard_sections': (
+            'overview', 'livestock', 'health', 'breeding',
+            'feeding', 'finances', 'reports', 'settings', 'users',
+        ),
+        'actions': ('create', 'read', 'update', 'delete', 'manage_users'),
+    },
+    'standard': {
+        'dashboard_sections': ('overview', 'livestock', 'health', 'reports'),
+        'actions': ('create', 'read', 'update'),
+    },
+}
+
+DEFAULT_ROLE = 'standard'
+
+ROLE_ACTIONS = {
+    role: frozenset(permissions['actions'])
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
+def get_role_permissions(role):
+    return ROLE_PERMISSIONS.get(role, ROLE_PERMISSIONS[DEFAULT_ROLE])
+
+
+def role_has_action(role, action):
+    return action in ROLE_ACTIONS.get(role, ROLE_ACTIONS[DEFAULT_ROLE])
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from livestock_management.cache import bump_cache_version
+from .authentication import forget_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_responses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        forget_user(instance.pk)
+        bump_cache_version(instance.pk)
@@ -0,0 +1,83 @@
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from rest_framework.throttling import SimpleRateThrottle
+
+# The limits must hold across every server process, so they are kept in the
+# 'throttle' cache (Redis or a database table), never in process memory.
+THROTTLE_CACHE_ALIAS = 'throttle'
+
+
+class LoginRateThrottle(SimpleRateThrottle):
+    """
+    Limits login attempts per client address. Throttles run before the view,
+    so rejected requests never reach the password hasher.
+    """
+    scope = 'login'
+    cache = ConnectionProxy(caches, THROTTLE_CACHE_ALIAS)
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginUsernameRateThrottle(SimpleRateThrottle):
+    """
+    Limits failed logins per username and client address. Only failures
+    count, recorded by the login view with record_failure(), and attempts
+    from other addresses do not count, so guessing a password cannot lock
+    the real user out.
+    """
+    scope = 'login_username'
+    cache = ConnectionProxy(caches, THROTTLE_CACHE_ALIAS)
+
+    def get_cache_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        ident = f'{self.get_ident(request)}:{username.strip().lower()}'
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.now = self.timer()
+        self.history = [timestamp for timestamp in self.cache.get(self.key, []) if timestamp > self.now - self.duration]
+        if len(self.history) >= self.num_requests:
+            return self.throttle_failure()
+        return True
+
+    @classmethod
+    def record_failure(cls, request):
+        throttle = cls()
+        key = throttle.get_cache_key(request, None)
+        if throttle.rate is None or key is None:
+            return
+        now = throttle.timer()
+        history = [timestamp for timestamp in throttle.cache.get(key, []) if timestamp > now - throttle.duration]
+        throttle.cache.set(key, [now, *history], throttle.duration)
+
+
+class RegisterRateThrottle(LoginRateThrottle):
+    scope = 'register'
+
+
+LOGIN_THROTTLE_SCOPES = (LoginRateThrottle.scope, LoginUsernameRateThrottle.scope, RegisterRateThrottle.scope)
+
+
+@contextmanager
+def login_throttles_disabled():
+    """
+    Lifts the login and registration limits in this process, for benchmarks
+    that log in far more often than a real client would.
+    """
+    rates = SimpleRateThrottle.THROTTLE_RATES
+    saved = {scope: rates.get(scope) for scope in LOGIN_THROTTLE_SCOPES}
+    rates.update(dict.fromkeys(LOGIN_THROTTLE_SCOPES))
+    try:
+        yield
+    finally:
+        rates.update(saved)
@@ -1,13 +1,19 @@
 from rest_framework import status, generics, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
 from .models import User
+from .roles import get_role_permissions
 from .serializers import UserRegistrationSerializer, UserSerializer, LoginSerializer
+from .throttles import LoginRateThrottle, LoginUsernameRateThrottle, RegisterRateThrottle
+from livestock_management.cache import cache_response
+from livestock_management.metrics import InstrumentedViewMixin
+from livestock_management.optimization import OptimizedQuerysetMixin
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([RegisterRateThrottle])
 def register(request):
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid():
@@ -22,6 +28,7 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([LoginRateThrottle, LoginUsernameRateThrottle])
 def login(request):
     serializer = LoginSerializer(data=request.data)
     if serializer.is_valid():
@@ -32,6 +39,7 @@ def login(request):
             'refresh': str(refresh),
             'access': str(refresh.access_token),
         })
+    LoginUsernameRateThrottle.record_failure(request)
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
@@ -40,30 +48,11 @@ def profile(request):
     return Response(serializer.data)
 
 @api_view(['GET'])
+@cache_response('user-permissions')
 def user_permissions(request):
-    user = request.user
-    permissions = {
-        'dashboard_sections': [],
-        'actions': []
-    }
-    
-    if user.is_admin:
-        permissions['dashboard_sections'] = [
-            'overview', 'livestock', 'health', 'breeding', 
-            'feeding', 'finances', 'reports', 'settings', 'users'
-        ]
-        permissions['actions'] = [
-            'create', 'read', 'update', 'delete', 'manage_users'
-        ]
-    else:
-        permissions['dashboard_sections'] = [
-            'overview', 'livestock', 'health', 'reports'
-        ]
-        permissions['actions'] = ['create', 'read', 'update']
-    
-    return Response(permissions)
+    return Response(get_role_permissions(request.user.role))
 
-class UserListView(generics.ListAPIView):
+class UserListView(InstrumentedViewMixin, OptimizedQuerysetMixin, generics.ListAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -1,45 +0,0 @@
-from django.db import models
-from django.contrib.auth.models import AbstractUser, BaseUserManager
-
-class UserManager(BaseUserManager):
-    def create_user(self, email, password=None, **extra_fields):
-        if not email:
-            raise ValueError('The Email field must be set')
-        email = self.normalize_email(email)
-        user = self.model(email=email, **extra_fields)
-        user.set_password(password)
-        user.save(using=self._db)
-        return user
-
-    def create_superuser(self, email, password=None, **extra_fields):
-        extra_fields.setdefault('is_staff', True)
-        extra_fields.setdefault('is_superuser', True)
-        extra_fields.setdefault('role', 'admin')
-
-        return self.create_user(email, password, **extra_fields)
-
-class User(AbstractUser):
-    ROLE_CHOICES = (
-        ('admin', 'Admin'),
-        ('standard', 'Standard User'),
-    )
-    
-    email = models.EmailField(unique=True)
-    name = models.CharField(max_length=255)
-    role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='standard')
-    
-    USERNAME_FIELD = 'email'
-    REQUIRED_FIELDS = ['name']
-    
-    objects = UserManager()
-    
-    def __str__(self):
-        return self.email
-    
-    @property
-    def is_admin(self):
-        return self.role == 'admin'
-    
-    @property
-    def is_standard(self):
-        return self.role == 'standard'
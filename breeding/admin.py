@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import BreedingEvent
+
+@admin.register(BreedingEvent)
+class BreedingEventAdmin(admin.ModelAdmin):
+    list_display = ('dam', 'sire', 'sire_reference', 'method', 'date', 'expected_due_date', 'status')
+    list_filter = ('method', 'status', 'date')
+    search_fields = ('dam__tag_number', 'sire__tag_number', 'sire_reference')
+    raw_id_fields = ('dam', 'sire')
+    readonly_fields = ('inbreeding_coefficient', 'created_by', 'created_at', 'updated_at')
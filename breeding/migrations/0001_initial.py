@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('livestock', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BreedingEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sire_reference', models.CharField(blank=True, help_text='Semen code or name of a sire not on record', max_length=100)),
+                ('method', models.CharField(choices=[('natural', 'Natural Service'), ('artificial_insemination', 'Artificial Insemination'), ('embryo_transfer', 'Embryo Transfer')], default='natural', max_length=30)),
+                ('date', models.DateField()),
+                ('expected_due_date', models.DateField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('bred', 'Bred'), ('pregnant', 'Pregnant'), ('open', 'Open'), ('delivered', 'Delivered'), ('lost', 'Lost')], default='bred', max_length=20)),
+                ('offspring_count', models.PositiveIntegerField(default=0)),
+                ('inbreeding_coefficient', models.FloatField(default=0)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('dam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='breeding_events', to='livestock.livestock')),
+                ('sire', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sired_breeding_events', to='livestock.livestock')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['dam', '-date'], name='breeding_dam_date_idx'), models.Index(fields=['sire', '-date'], name='breeding_sire_date_idx'), models.Index(fields=['-date', '-id'], name='breeding_date_idx')],
+            },
+        ),
+    ]
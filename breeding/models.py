@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from django.db import models
+from django.contrib.auth import get_user_model
+from livestock.lineage import expected_inbreeding
+from livestock.models import Livestock
+
+User = get_user_model()
+
+# Typical gestation (incubation for chickens) in days, for expected due dates.
+GESTATION_DAYS = {
+    'cattle': 283,
+    'sheep': 147,
+    'goat': 150,
+    'pig': 114,
+    'chicken': 21,
+}
+
+class BreedingEvent(models.Model):
+    """
+    A mating or insemination of a dam. The sire is either an animal on
+    record or, e.g. for purchased semen, only named in sire_reference.
+    """
+    METHOD_CHOICES = [
+        ('natural', 'Natural Service'),
+        ('artificial_insemination', 'Artificial Insemination'),
+        ('embryo_transfer', 'Embryo Transfer'),
+    ]
+
+    STATUS_CHOICES = [
+        ('bred', 'Bred'),
+        ('pregnant', 'Pregnant'),
+        ('open', 'Open'),
+        ('delivered', 'Delivered'),
+        ('lost', 'Lost'),
+    ]
+
+    dam = models.ForeignKey(Livestock, on_delete=models.CASCADE, related_name='breeding_events')
+    sire = models.ForeignKey(
+        Livestock, on_delete=models.SET_NULL, null=True, blank=True, related_name='sired_breeding_events',
+    )
+    sire_reference = models.CharField(max_length=100, blank=True, help_text="Semen code or name of a sire not on record")
+    method = models.CharField(max_length=30, choices=METHOD_CHOICES, default='natural')
+    date = models.DateField()
+    expected_due_date = models.DateField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='bred')
+    offspring_count = models.PositiveIntegerField(default=0)
+    # Expected inbreeding of the offspring: the coancestry of sire and dam.
+    inbreeding_coefficient = models.FloatField(default=0)
+    notes = models.TextField(blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['dam', '-date'], name='breeding_dam_date_idx'),
+            models.Index(fields=['sire', '-date'], name='breeding_sire_date_idx'),
+            # Keyset pagination seeks on (date, id).
+            models.Index(fields=['-date', '-id'], name='breeding_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.dam.tag_number} - {self.method} ({self.date})"
+
+    def save(self, *args, **kwargs):
+        if self.expected_due_date is None and self.dam.animal_type in GESTATION_DAYS:
+            self.expected_due_date = self.date + timedelta(days=GESTATION_DAYS[self.dam.animal_type])
+        self.inbreeding_coefficient = expected_inbreeding(self.sire_id, self.dam_id)
+        super().save(*args, **kwargs)
@@ -0,0 +1,55 @@
+from rest_framework import serializers
+from .models import BreedingEvent
+
+# Most candidate sires ranked per pairing request.
+MAX_PAIRING_CANDIDATES = 1000
+
+class BreedingEventSerializer(serializers.ModelSerializer):
+    dam_tag = serializers.CharField(source='dam.tag_number', read_only=True)
+    sire_tag = serializers.CharField(source='sire.tag_number', read_only=True, allow_null=True)
+    created_by_name = serializers.CharField(source='created_by.username', read_only=True, allow_null=True)
+
+    class Meta:
+        model = BreedingEvent
+        fields = [
+            'id', 'dam', 'dam_tag', 'sire', 'sire_tag', 'sire_reference', 'method',
+            'date', 'expected_due_date', 'status', 'offspring_count',
+            'inbreeding_coefficient', 'notes', 'created_by', 'created_by_name',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ('id', 'inbreeding_coefficient', 'created_by', 'created_at', 'updated_at')
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+        dam = attrs.get('dam', getattr(self.instance, 'dam', None))
+        sire = attrs.get('sire', getattr(self.instance, 'sire', None))
+        errors = {}
+        for field, animal, gender in (('dam', dam, 'female'), ('sire', sire, 'male')):
+            if animal is None:
+                continue
+            if field in attrs and not user.is_admin and animal.owner_id != user.pk:
+                errors[field] = self.fields[field].error_messages['does_not_exist'].format(pk_value=animal.pk)
+            elif animal.gender != gender:
+                errors[field] = f'The {field} must be {gender}.'
+        if not errors and sire is not None and sire.animal_type != dam.animal_type:
+            errors['sire'] = f'The sire must be a {dam.animal_type}.'
+        if errors:
+            raise serializers.ValidationError(errors)
+        if self.instance and {'dam', 'date'} & attrs.keys():
+            # Recomputed from the new date and dam unless given.
+            attrs.setdefault('expected_due_date', None)
+        return attrs
+
+    def create(self, validated_data):
+        validated_data['created_by'] = self.context['request'].user
+        return super().create(validated_data)
+
+class PairingQuerySerializer(serializers.Serializer):
+    """
+    Without sires, every active male of the dam's type in her herd is ranked.
+    """
+    dam = serializers.IntegerField()
+    sire = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=MAX_PAIRING_CANDIDATES,
+    )
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_PAIRING_CANDIDATES, default=20)
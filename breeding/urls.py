@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.BreedingEventListCreateView.as_view(), name='breeding-event-list-create'),
+    path('<int:pk>/', views.BreedingEventDetailView.as_view(), name='breeding-event-detail'),
+    path('pairings/', views.PairingView.as_view(), name='breeding-pairings'),
+]
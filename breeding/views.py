@@ -0,0 +1,95 @@
+from django.conf import settings
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+
+from livestock.lineage import Pedigree
+from livestock.models import Livestock
+from livestock_management.pagination import KeysetPagination
+from .models import BreedingEvent
+from .serializers import BreedingEventSerializer, PairingQuerySerializer
+
+# Statuses of animals that can still be bred.
+ACTIVE_STATUSES = ('healthy', 'sick', 'pregnant')
+
+class BreedingEventPagination(KeysetPagination):
+    key_field = 'date'
+
+class BreedingEventListCreateView(generics.ListCreateAPIView):
+    serializer_class = BreedingEventSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = BreedingEventPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        events = BreedingEvent.objects.select_related('dam', 'sire', 'created_by')
+        if user.is_admin:
+            return events
+        return events.filter(dam__owner=user)
+
+class BreedingEventDetailView(generics.RetrieveUpdateDestroyAPIView):
+    serializer_class = BreedingEventSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        events = BreedingEvent.objects.select_related('dam', 'sire', 'created_by')
+        if user.is_admin:
+            return events
+        return events.filter(dam__owner=user)
+
+class PairingView(generics.GenericAPIView):
+    """
+    Ranks candidate sires for a dam by the inbreeding coefficient their
+    offspring would have, lowest first. Pairings above
+    BREEDING_MAX_INBREEDING are marked unacceptable. All candidates are
+    scored against one pedigree load.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return Livestock.objects.all()
+        return Livestock.objects.filter(owner=user)
+
+    def get(self, request):
+        params = PairingQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        options = params.validated_data
+        livestock = self.get_queryset()
+
+        dam = livestock.filter(pk=options['dam'], gender='female').first()
+        if dam is None:
+            return Response({'detail': 'Dam not found'}, status=status.HTTP_404_NOT_FOUND)
+        if 'sire' in options:
+            ids = set(options['sire'])
+            sires = livestock.filter(pk__in=ids, gender='male', animal_type=dam.animal_type)
+            sires = {row['id']: row for row in sires.values('id', 'tag_number', 'breed', 'birth_date', 'status')}
+            if ids - sires.keys():
+                return Response({
+                    'detail': 'Some sires were not found',
+                    'sire': sorted(ids - sires.keys()),
+                }, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            sires = livestock.filter(
+                owner=dam.owner_id, gender='male', animal_type=dam.animal_type, status__in=ACTIVE_STATUSES,
+            ).exclude(pk=dam.pk)
+            sires = {row['id']: row for row in sires.values('id', 'tag_number', 'breed', 'birth_date', 'status')}
+
+        pedigree = Pedigree.load([dam.pk, *sires])
+        coefficients = {pk: round(value, 6) for pk, value in pedigree.coancestries(dam.pk, sires).items()}
+        ranked = sorted(sires, key=lambda pk: (coefficients[pk], pk))[:options['limit']]
+        dam_ancestors = pedigree.ancestors(dam.pk)
+        return Response({
+            'dam': {'id': dam.pk, 'tag_number': dam.tag_number, 'inbreeding_coefficient': dam.inbreeding_coefficient},
+            'max_inbreeding': settings.BREEDING_MAX_INBREEDING,
+            'candidates': len(sires),
+            'results': [{
+                **sires[pk],
+                'inbreeding_coefficient': coefficients[pk],
+                'acceptable': coefficients[pk] <= settings.BREEDING_MAX_INBREEDING,
+                'common_ancestors': sorted(
+                    dam_ancestors & pedigree.ancestors(pk), key=lambda ancestor: (pedigree.generation[ancestor], ancestor),
+                ),
+            } for pk in ranked],
+        })
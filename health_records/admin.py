@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import HealthRecord
+from .models import AppointmentReminder, HealthRecord, HealthRecordDailyRollup
 
 @admin.register(HealthRecord)
 class HealthRecordAdmin(admin.ModelAdmin):
@@ -26,3 +26,16 @@ class HealthRecordAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+@admin.register(HealthRecordDailyRollup)
+class HealthRecordDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('owner', 'date', 'record_type', 'records', 'cost')
+    list_filter = ('record_type', 'date')
+    readonly_fields = ('owner', 'date', 'record_type', 'records', 'cost')
+
+@admin.register(AppointmentReminder)
+class AppointmentReminderAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'health_record', 'kind', 'due_date', 'status', 'created_at', 'sent_at')
+    list_filter = ('kind', 'status', 'due_date')
+    search_fields = ('recipient__username', 'message')
+    raw_id_fields = ('health_record', 'recipient')
@@ -0,0 +1,316 @@
+"""
+Herd health analytics: rolling incidence, treatment costs and outbreaks.
+
+Records are aggregated in the database into one row per group and day (or
+month, or animal), with running totals computed by window functions over
+those rows, so even a multi-year history reaches Python as a few thousand
+rows. Rolling windows, rates and statistics are then derived from the
+running totals with NumPy.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from django.db.models import Count, DateField, F, FloatField, Func, IntegerField, Sum, Value, Window
+from django.db.models.functions import Cast, TruncMonth
+
+from livestock.growth import encode_groups, grouped_mean, grouped_percentiles
+from livestock.models import Livestock
+
+GROUP_FIELDS = ('animal_type', 'breed')
+EPOCH = date(1970, 1, 1)
+PERCENTILES = (50, 90)
+# Outbreak scoring: the daily rate of the baseline period before each window
+# gives the expected count, and a window is flagged when its count exceeds
+# that by OUTBREAK_THRESHOLD standard deviations (Poisson) and is at least
+# OUTBREAK_MIN_CASES.
+BASELINE_DAYS = 365
+OUTBREAK_THRESHOLD = 4.0
+OUTBREAK_MIN_CASES = 5
+
+
+class RunningSum(Func):
+    """
+    SUM() of an aggregate as a window expression, i.e. SUM(COUNT(*)) OVER
+    (...), which Django's Sum refuses because it nests aggregates.
+    """
+    function = 'SUM'
+    window_compatible = True
+
+
+def day_number(field='date'):
+    return Func(
+        F(field), Value(EPOCH, output_field=DateField()),
+        template='(%(expressions)s)', arg_joiner=' - ', output_field=IntegerField(),
+    )
+
+
+def _money(value):
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def _rate(value):
+    return None if np.isnan(value) else round(float(value), 3)
+
+
+def count_animals(livestock_queryset, group_by):
+    return dict(livestock_queryset.order_by().values_list(group_by).annotate(animals=Count('id')))
+
+
+def load_running_counts(records, group_by, start, end):
+    """
+    Running record counts per group_by value on every day with records
+    between start and end, as (group labels, day numbers, running totals).
+    The totals come from SUM(COUNT(*)) OVER (PARTITION BY group ORDER BY day).
+    """
+    group, day = F('livestock__' + group_by), day_number()
+    rows = list(
+        records.filter(date__gte=start, date__lte=end).order_by()
+        .values(group=group, day=day)
+        .annotate(cases=Count('id'))
+        # Annotated separately so the window is not added to the GROUP BY.
+        .annotate(running=Window(RunningSum(Count('id')), partition_by=[group], order_by=day))
+        .values_list('group', 'day', 'running')
+    )
+    labels = [row[0] for row in rows]
+    data = np.array([row[1:] for row in rows], dtype=np.int64).reshape(-1, 2)
+    return labels, data[:, 0], data[:, 1]
+
+
+def running_total_at(codes, days, running, group_count, query_days):
+    """
+    Evaluates the running totals at arbitrary days: a (group_count,
+    len(query_days)) array holding, per group, the total on the last day
+    with records on or before each query day. The count over (a, b] is then
+    total_at(b) - total_at(a).
+    """
+    query_days = np.asarray(query_days, dtype=np.int64)
+    if not len(days):
+        return np.zeros((group_count, len(query_days)), dtype=np.int64)
+    # One sorted key per (group, day) lets a single searchsorted serve every group.
+    base = min(days.min(), query_days.min())
+    stride = max(days.max(), query_days.max()) - base + 1
+    order = np.lexsort((days, codes))
+    keys = codes[order] * stride + (days[order] - base)
+    running = running[order]
+    starts = np.searchsorted(keys, np.arange(group_count) * stride)
+
+    queries = np.arange(group_count)[:, None] * stride + (query_days - base)[None, :]
+    index = np.searchsorted(keys, queries, side='right') - 1
+    found = index >= starts[:, None]
+    return np.where(found, running[np.maximum(index, 0)], 0)
+
+
+def _series_days(since, until, step):
+    last = (until - EPOCH).days
+    return last - np.arange(0, (until - since).days + 1, step)[::-1]
+
+
+def _label_codes(groups, labels):
+    lookup = {group: code for code, group in enumerate(groups.tolist())}
+    return np.array([lookup[str(label)] for label in labels], dtype=np.int64)
+
+
+def get_incidence(records, livestock_queryset, group_by='animal_type', record_type='illness',
+                  since=None, until=None, window=30, step=7):
+    """
+    Rolling incidence of record_type per group_by value: records in the
+    window days up to each sampled day, per 100 animals of the group, every
+    step days from since to until.
+    """
+    until = until or date.today()
+    since = since or until - timedelta(days=365)
+    animals = count_animals(livestock_queryset, group_by)
+    groups, _ = encode_groups(list(animals))
+    labels, days, running = load_running_counts(
+        records.filter(record_type=record_type), group_by, since - timedelta(days=window - 1), until,
+    )
+    codes = _label_codes(groups, labels)
+
+    sample_days = _series_days(since, until, step)
+    cases = (
+        running_total_at(codes, days, running, len(groups), sample_days)
+        - running_total_at(codes, days, running, len(groups), sample_days - window)
+    )
+    period_days = np.array([(since - EPOCH).days - 1, (until - EPOCH).days])
+    period = running_total_at(codes, days, running, len(groups), period_days)
+    herd = np.array([animals[group] for group in groups.tolist()], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        incidence = cases / herd[:, None] * 100
+
+    dates = [EPOCH + timedelta(days=int(day)) for day in sample_days]
+    results = []
+    for i, group in enumerate(groups.tolist()):
+        results.append({
+            'group': group,
+            'animals': int(herd[i]),
+            'cases': int(period[i, 1] - period[i, 0]),
+            'mean_incidence': _rate(np.mean(incidence[i])) if len(dates) else None,
+            'peak_incidence': _rate(np.max(incidence[i])) if len(dates) else None,
+            'series': [
+                {'date': dates[j], 'cases': int(cases[i, j]), 'incidence': _rate(incidence[i, j])}
+                for j in range(len(dates))
+            ],
+        })
+    return results
+
+
+def detect_outbreaks(records, group_by='animal_type', record_type='illness', since=None, until=None, window=7,
+                     threshold=OUTBREAK_THRESHOLD, min_cases=OUTBREAK_MIN_CASES, baseline_days=BASELINE_DAYS):
+    """
+    Clusters of record_type records: for every day from since to until and
+    every group, the count over the trailing window is compared with the
+    count expected from the group's rate over the baseline_days before that
+    window. Consecutive flagged days are merged into one outbreak.
+    """
+    until = until or date.today()
+    since = since or until - timedelta(days=90)
+    labels, days, running = load_running_counts(
+        records.filter(record_type=record_type), group_by,
+        since - timedelta(days=window + baseline_days - 1), until,
+    )
+    groups, codes = encode_groups(labels)
+    groups = groups.tolist()
+    if not groups:
+        return []
+
+    check_days = _series_days(since, until, 1)
+    window_start = check_days - window
+    total_at = lambda query_days: running_total_at(codes, days, running, len(groups), query_days)
+    observed = total_at(check_days) - total_at(window_start)
+    baseline = total_at(window_start) - total_at(window_start - baseline_days)
+    expected = baseline * (window / baseline_days)
+    scores = (observed - expected) / np.sqrt(np.maximum(expected, 1.0))
+    flagged = (observed >= min_cases) & (scores >= threshold)
+
+    # Runs of consecutive flagged days: a run starts where flagged goes from False to True.
+    padded = np.zeros((len(groups), 1), dtype=bool)
+    edges = np.diff(np.hstack((padded, flagged, padded)).astype(np.int8), axis=1)
+    outbreaks = []
+    for group_code, start in zip(*np.nonzero(edges == 1)):
+        end = np.flatnonzero(edges[group_code, start:] == -1)[0] + start
+        peak = start + int(np.argmax(observed[group_code, start:end]))
+        outbreaks.append({
+            'group': groups[group_code],
+            'start': EPOCH + timedelta(days=int(window_start[start]) + 1),
+            'end': EPOCH + timedelta(days=int(check_days[end - 1])),
+            'days_flagged': int(end - start),
+            'peak_date': EPOCH + timedelta(days=int(check_days[peak])),
+            'peak_cases': int(observed[group_code, peak]),
+            'expected_cases': round(float(expected[group_code, peak]), 2),
+            'score': round(float(scores[group_code, peak]), 2),
+        })
+    outbreaks.sort(key=lambda outbreak: (outbreak['start'], outbreak['group']))
+    return outbreaks
+
+
+def get_monthly_costs(records, livestock_queryset, since=None, until=None):
+    """
+    Treatment spend per month with the running total from a window
+    function, the cost per animal in the herd and the monthly trend.
+    """
+    until = until or date.today()
+    since = since or date(until.year - 1, until.month, 1)
+    month = TruncMonth('date')
+    rows = list(
+        records.filter(date__gte=since, date__lte=until).order_by()
+        .values(month=month)
+        .annotate(records=Count('id'), total=Cast(Sum('cost'), FloatField()))
+        .annotate(running=Window(RunningSum(Cast(Sum('cost'), FloatField())), order_by=month))
+        .order_by('month')
+        .values_list('month', 'records', 'total', 'running')
+    )
+    herd = livestock_queryset.count()
+    spend = np.nan_to_num(np.array([row[2] for row in rows], dtype=np.float64))
+    running = np.nan_to_num(np.array([row[3] for row in rows], dtype=np.float64))
+
+    if len(rows) > 1:
+        # Least-squares change in monthly spend, in currency per month.
+        months = np.array([row[0].year * 12 + row[0].month for row in rows], dtype=np.float64)
+        trend = np.polyfit(months - months[0], spend, 1)[0]
+    else:
+        trend = np.nan
+    return {
+        'animals': herd,
+        'total_cost': _money(spend.sum()),
+        'mean_monthly_cost': _money(spend.mean()) if len(rows) else None,
+        'median_monthly_cost': _money(np.median(spend)) if len(rows) else None,
+        'monthly_trend': _money(trend),
+        'months': [
+            {
+                'month': row[0],
+                'records': row[1],
+                'total_cost': _money(spend[i]),
+                'cost_per_animal': _money(spend[i] / herd) if herd else None,
+                'cumulative_cost': _money(running[i]),
+            }
+            for i, row in enumerate(rows)
+        ],
+    }
+
+
+def percent_rank(values, codes, group_count, positions):
+    """
+    PERCENT_RANK() within the group of values at the given positions: the
+    share of the rest of the group with a lower value.
+    """
+    order = np.lexsort((values, codes))
+    sorted_values, sorted_codes = values[order], codes[order]
+    starts = np.searchsorted(sorted_codes, np.arange(group_count))
+    counts = np.bincount(codes, minlength=group_count)
+    ranks = []
+    for position in positions:
+        code = codes[position]
+        group_values = sorted_values[starts[code]:starts[code] + counts[code]]
+        lower = np.searchsorted(group_values, values[position])
+        ranks.append(lower / (counts[code] - 1) if counts[code] > 1 else 0.0)
+    return ranks
+
+
+def get_animal_costs(records, group_by='animal_type', since=None, until=None, limit=20):
+    """
+    Treatment spend per animal: distribution statistics per group_by value
+    and the most expensive animals with their percentile rank in the group.
+    """
+    until = until or date.today()
+    since = since or until - timedelta(days=365)
+    rows = list(
+        records.filter(date__gte=since, date__lte=until).order_by()
+        .values('livestock_id', group=F('livestock__' + group_by))
+        .annotate(records=Count('id'), total=Cast(Sum('cost', default=0), FloatField()))
+        .values_list('livestock_id', 'group', 'records', 'total')
+    )
+    groups, codes = encode_groups([row[1] for row in rows])
+    groups = groups.tolist()
+    costs = np.array([row[3] for row in rows], dtype=np.float64)
+    percentiles = grouped_percentiles(costs, codes, len(groups), PERCENTILES)
+    means, counts = grouped_mean(costs, codes, len(groups))
+    sums = np.bincount(codes, weights=costs, minlength=len(groups))
+
+    summary = []
+    for i, label in enumerate(groups):
+        row = {
+            'group': label,
+            'animals': int(counts[i]),
+            'total_cost': _money(sums[i]),
+            'mean_cost': _money(means[i]),
+        }
+        row.update(('p%d_cost' % percentile, _money(percentiles[i, j])) for j, percentile in enumerate(PERCENTILES))
+        summary.append(row)
+
+    top = np.argsort(-costs, kind='stable')[:limit].tolist()
+    ranks = percent_rank(costs, codes, len(groups), top)
+    tag_numbers = dict(Livestock.objects.filter(pk__in=[rows[i][0] for i in top]).values_list('pk', 'tag_number'))
+    return {
+        'groups': summary,
+        'top_animals': [
+            {
+                'id': rows[i][0],
+                'tag_number': tag_numbers[rows[i][0]],
+                'group': rows[i][1],
+                'records': rows[i][2],
+                'total_cost': _money(costs[i]),
+                'percentile': round(float(rank) * 100, 1),
+            }
+            for i, rank in zip(top, ranks)
+        ],
+    }
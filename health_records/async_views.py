@@ -0,0 +1,27 @@
+from livestock_management.async_views import AsyncAPIView, AsyncDetailView, AsyncListView
+from .filters import HealthRecordFilterMixin
+from .serializers import HealthRecordCompactSerializer, HealthRecordSerializer, HealthRecordStatsSerializer
+from .stats import format_stats, get_record_queryset, get_stats_aggregates
+from .views import HealthRecordPagination
+
+
+class HealthRecordScopeMixin:
+    serializer_class = HealthRecordSerializer
+
+    def get_queryset(self):
+        return get_record_queryset(self.request.user)
+
+
+class AsyncHealthRecordListView(HealthRecordScopeMixin, HealthRecordFilterMixin, AsyncListView):
+    pagination_class = HealthRecordPagination
+    compact_serializer_class = HealthRecordCompactSerializer
+
+
+class AsyncHealthRecordDetailView(HealthRecordScopeMixin, AsyncDetailView):
+    pass
+
+
+class AsyncHealthRecordStatsView(AsyncAPIView):
+    async def get(self, request):
+        totals = await get_record_queryset(request.user).aaggregate(**get_stats_aggregates())
+        return HealthRecordStatsSerializer(format_stats(totals)).data
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+from rest_framework.filters import OrderingFilter
+
+from livestock_management.filters import FullTextSearchFilter, QueryParamFilterBackend
+from .models import SEARCH_VECTOR_FIELDS, HealthRecord
+
+
+class HealthRecordFilterMixin:
+    """
+    Server-side filtering, search and ordering shared by the health record
+    list and export views. Every filter is backed by an index on HealthRecord.
+    """
+    filter_backends = [QueryParamFilterBackend, FullTextSearchFilter, OrderingFilter]
+    filter_params = {
+        'record_type': ('record_type__in', serializers.ChoiceField(choices=HealthRecord.RECORD_TYPES)),
+        'date_after': ('date__gte', serializers.DateField()),
+        'date_before': ('date__lte', serializers.DateField()),
+        'livestock': ('livestock_id', serializers.IntegerField()),
+    }
+    search_vector_fields = SEARCH_VECTOR_FIELDS
+    ordering_fields = ['date', 'created_at', 'record_type', 'cost']
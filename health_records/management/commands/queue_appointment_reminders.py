@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from health_records.models import AppointmentReminder
+from health_records.reminders import DAYS_AHEAD, OVERDUE_DAYS, queue_reminders
+
+
+class Command(BaseCommand):
+    help = 'Queue reminders for upcoming and overdue health record appointments into the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=DAYS_AHEAD,
+                            help='Remind about appointments due within this many days')
+        parser.add_argument('--overdue-days', type=int, default=OVERDUE_DAYS,
+                            help='Keep reminding about missed appointments for this many days')
+        parser.add_argument('--date', type=date.fromisoformat, default=None,
+                            help='Run as if today were this date (YYYY-MM-DD)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        pending_before = AppointmentReminder.objects.filter(status='pending').count()
+        considered = queue_reminders(
+            today=options['date'],
+            days=options['days'],
+            overdue_days=options['overdue_days'],
+            batch_size=options['batch_size'],
+        )
+        queued = AppointmentReminder.objects.filter(status='pending').count() - pending_before
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {considered} open appointments, queued {queued} new reminders'
+        ))
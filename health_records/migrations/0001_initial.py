@@ -0,0 +1,123 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:42
+
+from django.conf import settings
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('livestock', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HealthRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('record_type', models.CharField(choices=[('vaccination', 'Vaccination'), ('treatment', 'Treatment'), ('checkup', 'Regular Checkup'), ('injury', 'Injury'), ('illness', 'Illness'), ('other', 'Other')], max_length=20)),
+                ('date', models.DateField()),
+                ('veterinarian', models.CharField(blank=True, max_length=100)),
+                ('diagnosis', models.TextField()),
+                ('treatment', models.TextField()),
+                ('medication', models.CharField(blank=True, max_length=200)),
+                ('cost', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('next_appointment', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('change_txid', models.BigIntegerField(default=0, editable=False)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('livestock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='health_records', to='livestock.livestock')),
+                ('owner', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AppointmentReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('upcoming', 'Upcoming'), ('overdue', 'Overdue')], max_length=10)),
+                ('due_date', models.DateField()),
+                ('message', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('health_record', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='health_records.healthrecord')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='appointment_reminders', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HealthRecordDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('record_type', models.CharField(choices=[('vaccination', 'Vaccination'), ('treatment', 'Treatment'), ('checkup', 'Regular Checkup'), ('injury', 'Injury'), ('illness', 'Illness'), ('other', 'Other')], max_length=20)),
+                ('records', models.IntegerField(default=0)),
+                ('cost', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='health_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='health_rollup_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='healthrecorddailyrollup',
+            constraint=models.UniqueConstraint(fields=('owner', 'date', 'record_type'), name='health_rollup_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(fields=['livestock', '-date', '-id'], name='health_rec_livestock_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(fields=['-date', '-id'], name='health_rec_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(fields=['owner', 'change_txid', 'id'], name='health_rec_owner_txid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(fields=['change_txid', 'id'], name='health_rec_txid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(fields=['record_type', '-date'], name='health_rec_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(fields=['livestock', 'record_type'], name='health_rec_livestock_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('diagnosis', 'notes', config='simple'), name='health_rec_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='healthrecord',
+            index=models.Index(condition=models.Q(('next_appointment__isnull', False)), fields=['next_appointment'], name='health_rec_next_appt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointmentreminder',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['created_at'], name='reminder_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appointmentreminder',
+            index=models.Index(fields=['recipient', '-created_at'], name='reminder_recipient_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='appointmentreminder',
+            constraint=models.UniqueConstraint(fields=('health_record', 'due_date', 'kind'), name='reminder_unique'),
+        ),
+    ]
@@ -1,9 +1,43 @@
-from django.db import models
+from datetime import date
+
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db.models.functions import Coalesce
 from livestock.models import Livestock
 
 User = get_user_model()
 
+# Columns covered by the full-text search GIN index.
+SEARCH_VECTOR_FIELDS = ('diagnosis', 'notes')
+
+class HealthRecordQuerySet(models.QuerySet):
+    def appointments_due(self, start, end):
+        """
+        Records whose next_appointment falls between start and end and that
+        have no later record for the same animal on or after that date, i.e.
+        the follow-up has not happened yet.
+        """
+        # The latest other record per candidate is one probe of the
+        # (livestock, date) index; a NOT EXISTS here gets planned as an
+        # anti-join over the whole table.
+        latest_record = HealthRecord.objects.filter(
+            livestock=models.OuterRef('livestock'),
+        ).exclude(pk=models.OuterRef('pk')).order_by('-date', '-id').values('date')[:1]
+        return self.filter(
+            next_appointment__gte=start, next_appointment__lte=end,
+        ).alias(
+            latest_record=Coalesce(models.Subquery(latest_record), models.Value(date.min)),
+        ).filter(latest_record__lt=models.F('next_appointment'))
+
+    def with_days_until_appointment(self, today=None):
+        today = models.Value(today or date.today(), output_field=models.DateField())
+        return self.annotate(days_until=models.Func(
+            models.F('next_appointment'), today, template='(%(expressions)s)', arg_joiner=' - ',
+            output_field=models.IntegerField(),
+        ))
+
 class HealthRecord(models.Model):
     RECORD_TYPES = [
         ('vaccination', 'Vaccination'),
@@ -14,7 +48,11 @@ class HealthRecord(models.Model):
         ('other', 'Other'),
     ]
 
+
     livestock = models.ForeignKey(Livestock, on_delete=models.CASCADE, related_name='health_records')
+    # Copied from the animal on save (and moved with it on transfer) so the
+    # sync change feed can seek per owner without joining livestock.
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', editable=False)
     record_type = models.CharField(max_length=20, choices=RECORD_TYPES)
     date = models.DateField()
     veterinarian = models.CharField(max_length=100, blank=True)
@@ -27,9 +65,172 @@ class HealthRecord(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Transaction that last wrote the row, set by a trigger; the sync change
+    # feed is ordered by it (see sync.feed).
+    change_txid = models.BigIntegerField(default=0, editable=False)
+
+    objects = HealthRecordQuerySet.as_manager()
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            # Keyset pagination seeks on (date, id).
+            models.Index(fields=['livestock', '-date', '-id'], name='health_rec_livestock_date_idx'),
+            models.Index(fields=['-date', '-id'], name='health_rec_date_idx'),
+            # The sync change feed seeks on (change_txid, id) within one owner.
+            models.Index(fields=['owner', 'change_txid', 'id'], name='health_rec_owner_txid_idx'),
+            models.Index(fields=['change_txid', 'id'], name='health_rec_txid_idx'),
+            # Server-side list filters.
+            models.Index(fields=['record_type', '-date'], name='health_rec_type_date_idx'),
+            models.Index(fields=['livestock', 'record_type'], name='health_rec_livestock_type_idx'),
+            GinIndex(SearchVector(*SEARCH_VECTOR_FIELDS, config='simple'), name='health_rec_search_idx'),
+            # Due-appointment scans; most records never have a follow-up.
+            models.Index(
+                fields=['next_appointment'], name='health_rec_next_appt_idx',
+                condition=models.Q(next_appointment__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.livestock.tag_number} - {self.record_type} ({self.date})"
+
+    def save(self, *args, **kwargs):
+        self.owner_id = self.livestock.owner_id
+        super().save(*args, **kwargs)
+
+class HealthRecordDailyRollup(models.Model):
+    """
+    Record count and cost per owner, day and record type.
+
+    Time-range reports read these instead of the records: a year is at most
+    365 rows per record type. Kept current by health_records.signals and
+    rebuilt for any date range with the rebuild_rollups management command.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='health_rollups')
+    date = models.DateField()
+    record_type = models.CharField(max_length=20, choices=HealthRecord.RECORD_TYPES)
+    records = models.IntegerField(default=0)
+    cost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'date', 'record_type'], name='health_rollup_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='health_rollup_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner} - {self.date} {self.record_type}: {self.records}"
+
+    @classmethod
+    def adjust(cls, owner_id, day, record_type, records, cost):
+        key = {'owner_id': owner_id, 'date': day, 'record_type': record_type}
+        changes = {'records': models.F('records') + records, 'cost': models.F('cost') + cost}
+        if not cls.objects.filter(**key).update(**changes):
+            rollup, created = cls.objects.get_or_create(**key, defaults={'records': records, 'cost': cost})
+            if not created:
+                cls.objects.filter(pk=rollup.pk).update(**changes)
+        if records < 0:
+            # Drop emptied days so the table matches what rebuild() writes.
+            cls.objects.filter(**key, records=0).delete()
+
+    @classmethod
+    def transfer(cls, livestock_id, from_owner_id, to_owner_id):
+        """
+        Moves one animal's record counts and costs from its previous owner's
+        rollups to the new owner's, leaving every other row untouched.
+        """
+        rows = HealthRecord.objects.filter(livestock_id=livestock_id).values('date', 'record_type').annotate(
+            total=models.Count('id'), total_cost=models.Sum('cost', default=0),
+        ).order_by()
+        with transaction.atomic():
+            for row in rows:
+                cls.adjust(from_owner_id, row['date'], row['record_type'], -row['total'], -row['total_cost'])
+                cls.adjust(to_owner_id, row['date'], row['record_type'], row['total'], row['total_cost'])
+
+    @classmethod
+    def remove_livestock(cls, livestock_id, owner_id):
+        """
+        Takes one animal's record counts and costs out of its owner's
+        rollups in a single UPDATE, before the animal and its records are
+        deleted, and drops the days it empties.
+        """
+        records = HealthRecord.objects.filter(
+            livestock_id=livestock_id, date=models.OuterRef('date'), record_type=models.OuterRef('record_type'),
+        ).order_by().values('livestock_id')
+        cls.objects.filter(owner_id=owner_id).filter(models.Exists(records)).update(
+            records=models.F('records') - models.Subquery(records.annotate(total=models.Count('id')).values('total')),
+            cost=models.F('cost') - models.Subquery(
+                records.annotate(total_cost=models.Sum('cost', default=0)).values('total_cost')
+            ),
+        )
+        cls.objects.filter(owner_id=owner_id, records__lte=0).delete()
+
+    @classmethod
+    def rebuild(cls, owner_ids=None, since=None, until=None):
+        """
+        Recomputes the rollups of the given owners and date range from the
+        records. Running it again for the same range gives the same rows.
+        """
+        records = HealthRecord.objects.all()
+        rollups = cls.objects.all()
+        if owner_ids is not None:
+            records = records.filter(owner_id__in=owner_ids)
+            rollups = rollups.filter(owner_id__in=owner_ids)
+        if since is not None:
+            records = records.filter(date__gte=since)
+            rollups = rollups.filter(date__gte=since)
+        if until is not None:
+            records = records.filter(date__lte=until)
+            rollups = rollups.filter(date__lte=until)
+        rows = records.values('date', 'record_type', 'owner_id').annotate(
+            total=models.Count('id'), total_cost=models.Sum('cost', default=0),
+        ).order_by()
+        rollups.delete()
+        created = cls.objects.bulk_create([
+            cls(owner_id=row['owner_id'], date=row['date'], record_type=row['record_type'],
+                records=row['total'], cost=row['total_cost'])
+            for row in rows
+        ], batch_size=2000)
+        return len(created)
+
+class AppointmentReminder(models.Model):
+    """
+    Outbox of appointment reminders waiting to be delivered to owners.
+
+    Rows are queued in bulk by the queue_appointment_reminders command; the
+    unique constraint makes re-running it for the same day a no-op.
+    """
+    KIND_CHOICES = [
+        ('upcoming', 'Upcoming'),
+        ('overdue', 'Overdue'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    health_record = models.ForeignKey(HealthRecord, on_delete=models.CASCADE, related_name='reminders')
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='appointment_reminders')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    due_date = models.DateField()
+    message = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['health_record', 'due_date', 'kind'], name='reminder_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at'], name='reminder_pending_idx', condition=models.Q(status='pending')),
+            models.Index(fields=['recipient', '-created_at'], name='reminder_recipient_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient} - {self.kind} {self.due_date} ({self.status})"
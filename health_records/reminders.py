@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+from itertools import islice
+
+from .models import AppointmentReminder, HealthRecord
+
+DAYS_AHEAD = 7
+OVERDUE_DAYS = 30
+
+
+def get_due_window(today=None, days=DAYS_AHEAD, overdue_days=OVERDUE_DAYS):
+    today = today or date.today()
+    return today - timedelta(days=overdue_days), today + timedelta(days=days)
+
+
+def build_message(tag_number, record_type, due_date, overdue):
+    label = dict(HealthRecord.RECORD_TYPES).get(record_type, record_type)
+    verb = 'was due' if overdue else 'is due'
+    return f"{label} follow-up for {tag_number} {verb} on {due_date.isoformat()}"
+
+
+def queue_reminders(today=None, days=DAYS_AHEAD, overdue_days=OVERDUE_DAYS, batch_size=5000):
+    """
+    Queues an outbox row for every open appointment in the window across all
+    owners. The candidates come from one query on the partial
+    next_appointment index, streamed in chunks and written with one
+    INSERT ... ON CONFLICT DO NOTHING per batch. Returns the number of
+    appointments considered.
+    """
+    today = today or date.today()
+    start, end = get_due_window(today, days, overdue_days)
+    rows = HealthRecord.objects.appointments_due(start, end).order_by('next_appointment', 'id').values_list(
+        'pk', 'livestock__owner_id', 'livestock__tag_number', 'record_type', 'next_appointment',
+    ).iterator(chunk_size=batch_size)
+
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        AppointmentReminder.objects.bulk_create([
+            AppointmentReminder(
+                health_record_id=pk,
+                recipient_id=owner_id,
+                kind='overdue' if due_date < today else 'upcoming',
+                due_date=due_date,
+                message=build_message(tag_number, record_type, due_date, due_date < today),
+            )
+            for pk, owner_id, tag_number, record_type, due_date in batch
+        ], ignore_conflicts=True)
+        total += len(batch)
+    return total
@@ -1,5 +1,8 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import HealthRecord
+from .analytics import GROUP_FIELDS, OUTBREAK_MIN_CASES, OUTBREAK_THRESHOLD
+from .models import AppointmentReminder, HealthRecord
+from .reminders import DAYS_AHEAD, OVERDUE_DAYS
 from livestock.serializers import LivestockSerializer
 
 class HealthRecordSerializer(serializers.ModelSerializer):
@@ -19,3 +22,107 @@ class HealthRecordSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data['created_by'] = self.context['request'].user
         return super().create(validated_data)
+
+class HealthRecordCompactSerializer(HealthRecordSerializer):
+    """
+    Table-view representation served for ?compact=true: the nested animal is
+    reduced to its id and tag number.
+    """
+    livestock_info = None
+    livestock_tag = serializers.CharField(source='livestock.tag_number', read_only=True)
+
+    class Meta(HealthRecordSerializer.Meta):
+        fields = [
+            'id', 'livestock', 'livestock_tag', 'record_type', 'date',
+            'veterinarian', 'diagnosis', 'treatment', 'medication',
+            'cost', 'next_appointment', 'created_by', 'created_at',
+        ]
+
+class HealthRecordSyncSerializer(HealthRecordSerializer):
+    """
+    Change feed representation: animals are synced in their own stream, so
+    records refer to them by id only.
+    """
+    livestock_info = None
+
+    class Meta(HealthRecordSerializer.Meta):
+        fields = [
+            'id', 'livestock', 'record_type', 'date',
+            'veterinarian', 'diagnosis', 'treatment', 'medication',
+            'cost', 'notes', 'next_appointment', 'created_by',
+            'created_by_name', 'created_at', 'updated_at'
+        ]
+
+class HealthRecordStatsSerializer(serializers.Serializer):
+    total_records = serializers.IntegerField()
+    by_record_type = serializers.DictField()
+    total_cost = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+class HealthRecordTemplateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HealthRecord
+        fields = [
+            'record_type', 'date', 'veterinarian', 'diagnosis', 'treatment',
+            'medication', 'cost', 'notes', 'next_appointment'
+        ]
+
+class HealthRecordBatchSerializer(serializers.Serializer):
+    record = HealthRecordTemplateSerializer()
+    livestock = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    tag_numbers = serializers.ListField(child=serializers.CharField(), required=False, default=list)
+
+    def validate(self, attrs):
+        if not attrs['livestock'] and not attrs['tag_numbers']:
+            raise serializers.ValidationError('Provide livestock ids or tag_numbers')
+        limit = settings.HEALTH_RECORD_BATCH_MAX_SIZE
+        if len(attrs['livestock']) + len(attrs['tag_numbers']) > limit:
+            raise serializers.ValidationError(f'At most {limit} animals can be recorded at once; split the batch')
+        return attrs
+
+class DueAppointmentSerializer(serializers.ModelSerializer):
+    tag_number = serializers.CharField(source='livestock.tag_number', read_only=True)
+    animal_type = serializers.CharField(source='livestock.animal_type', read_only=True)
+    days_until = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = HealthRecord
+        fields = [
+            'id', 'livestock', 'tag_number', 'animal_type', 'record_type', 'date',
+            'veterinarian', 'diagnosis', 'next_appointment', 'days_until',
+        ]
+        # days_until is annotated by HealthRecordQuerySet.with_days_until_appointment().
+        field_dependencies = {'days_until': []}
+
+class DueAppointmentQuerySerializer(serializers.Serializer):
+    days = serializers.IntegerField(min_value=0, max_value=365, default=DAYS_AHEAD)
+    overdue_days = serializers.IntegerField(min_value=0, max_value=365, default=OVERDUE_DAYS)
+
+class HealthAnalyticsQuerySerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(choices=GROUP_FIELDS, default='animal_type')
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('since') and attrs.get('until') and attrs['since'] > attrs['until']:
+            raise serializers.ValidationError({'since': 'Must not be after until.'})
+        return attrs
+
+class IncidenceQuerySerializer(HealthAnalyticsQuerySerializer):
+    record_type = serializers.ChoiceField(choices=HealthRecord.RECORD_TYPES, default='illness')
+    window = serializers.IntegerField(min_value=1, max_value=365, default=30)
+    step = serializers.IntegerField(min_value=1, max_value=365, default=7)
+
+class OutbreakQuerySerializer(HealthAnalyticsQuerySerializer):
+    record_type = serializers.ChoiceField(choices=HealthRecord.RECORD_TYPES, default='illness')
+    window = serializers.IntegerField(min_value=1, max_value=90, default=7)
+    threshold = serializers.FloatField(min_value=0, default=OUTBREAK_THRESHOLD)
+    min_cases = serializers.IntegerField(min_value=1, default=OUTBREAK_MIN_CASES)
+
+class AnimalCostQuerySerializer(HealthAnalyticsQuerySerializer):
+    limit = serializers.IntegerField(min_value=0, max_value=500, default=20)
+
+class AppointmentReminderSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AppointmentReminder
+        fields = ['id', 'health_record', 'kind', 'due_date', 'message', 'status', 'created_at', 'sent_at']
+        read_only_fields = fields
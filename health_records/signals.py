@@ -0,0 +1,82 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from livestock.models import Livestock
+from livestock.signals import get_origin_model, is_owner_deletion
+from livestock_management.cache import bump_cache_version
+from livestock_management.events import publish_event
+from sync.models import Tombstone
+from .models import HealthRecord, HealthRecordDailyRollup
+
+
+def get_owner_id(instance):
+    if HealthRecord.livestock.is_cached(instance):
+        return instance.livestock.owner_id
+    return Livestock.objects.filter(pk=instance.livestock_id).values_list('owner_id', flat=True).first()
+
+
+def get_rollup_key(instance):
+    return get_owner_id(instance), instance.date, instance.record_type, instance.cost or 0
+
+
+def get_event_data(instance):
+    return {
+        'id': instance.pk, 'livestock': instance.livestock_id,
+        'record_type': instance.record_type, 'date': instance.date,
+    }
+
+
+def adjust_rollup(key, records):
+    owner_id, day, record_type, cost = key
+    if owner_id is not None:
+        HealthRecordDailyRollup.adjust(owner_id, day, record_type, records, cost * records)
+
+
+@receiver(pre_save, sender=HealthRecord)
+def remember_previous_rollup(sender, instance, raw=False, **kwargs):
+    instance._previous_rollup_key = None
+    if instance.pk and not raw:
+        previous = HealthRecord.objects.filter(pk=instance.pk).values_list(
+            'livestock__owner_id', 'date', 'record_type', 'cost'
+        ).first()
+        if previous is not None:
+            instance._previous_rollup_key = previous[:3] + (previous[3] or 0,)
+
+
+@receiver(post_save, sender=HealthRecord)
+def update_rollup_on_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rollup_key', None)
+    current = get_rollup_key(instance)
+    bump_cache_version(current[0], previous[0] if previous else None)
+    event_type = 'health_record.created' if created else 'health_record.updated'
+    publish_event(current[0], event_type, get_event_data(instance))
+    if previous != current:
+        if previous is not None:
+            adjust_rollup(previous, -1)
+        adjust_rollup(current, 1)
+
+
+def is_cascade(origin):
+    """
+    Whether the records are deleted with their animal or owner, which
+    livestock.signals accounts for in bulk.
+    """
+    return is_owner_deletion(origin) or issubclass(get_origin_model(origin), Livestock)
+
+
+@receiver(pre_delete, sender=HealthRecord)
+def remember_rollup_on_delete(sender, instance, origin=None, **kwargs):
+    if not is_cascade(origin):
+        instance._previous_rollup_key = get_rollup_key(instance)
+
+
+@receiver(post_delete, sender=HealthRecord)
+def update_rollup_on_delete(sender, instance, origin=None, **kwargs):
+    if not is_cascade(origin):
+        key = getattr(instance, '_previous_rollup_key', None) or get_rollup_key(instance)
+        bump_cache_version(key[0])
+        adjust_rollup(key, -1)
+        Tombstone.record(key[0], 'health_record', [instance.pk])
+        publish_event(key[0], 'health_record.deleted', get_event_data(instance))
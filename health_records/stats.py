@@ -0,0 +1,27 @@
+from django.db.models import Count, Q, Sum
+
+from .models import HealthRecord
+
+
+def get_record_queryset(user):
+    if user.is_admin:
+        return HealthRecord.objects.all()
+    return HealthRecord.objects.filter(livestock__owner=user)
+
+
+def get_stats_aggregates():
+    aggregates = {'total_records': Count('id'), 'total_cost': Sum('cost')}
+    for record_type, _ in HealthRecord.RECORD_TYPES:
+        aggregates['type_' + record_type] = Count('id', filter=Q(record_type=record_type))
+    return aggregates
+
+
+def format_stats(totals):
+    return {
+        'total_records': totals['total_records'],
+        'by_record_type': {
+            record_type: totals['type_' + record_type]
+            for record_type, _ in HealthRecord.RECORD_TYPES if totals['type_' + record_type]
+        },
+        'total_cost': totals['total_cost'] or 0,
+    }
@@ -0,0 +1,10 @@
+from datetime import date
+
+from jobs.registry import task
+from .reminders import DAYS_AHEAD, OVERDUE_DAYS, queue_reminders
+
+
+@task('health_records.queue_reminders')
+def queue_appointment_reminders(job, days=DAYS_AHEAD, overdue_days=OVERDUE_DAYS, today=None):
+    today = date.fromisoformat(today) if today else None
+    return {'appointments': queue_reminders(today=today, days=days, overdue_days=overdue_days)}
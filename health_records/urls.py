@@ -1,7 +1,20 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('records/', views.HealthRecordListCreateView.as_view(), name='health-record-list-create'),
     path('records/<int:pk>/', views.HealthRecordDetailView.as_view(), name='health-record-detail'),
+    path('records/batch/', views.HealthRecordBatchCreateView.as_view(), name='health-record-batch-create'),
+    path('records/export/<str:export_format>/', views.HealthRecordExportView.as_view(), name='health-record-export'),
+    path('records/due/', views.DueAppointmentListView.as_view(), name='health-record-due'),
+    path('reminders/', views.AppointmentReminderListView.as_view(), name='appointment-reminder-list'),
+    path('records/stats/', views.health_record_stats, name='health-record-stats'),
+    path('reports/', views.HealthRecordReportView.as_view(), name='health-record-report'),
+    path('analytics/incidence/', views.IncidenceView.as_view(), name='health-analytics-incidence'),
+    path('analytics/outbreaks/', views.OutbreakView.as_view(), name='health-analytics-outbreaks'),
+    path('analytics/costs/monthly/', views.MonthlyCostView.as_view(), name='health-analytics-monthly-costs'),
+    path('analytics/costs/animals/', views.AnimalCostView.as_view(), name='health-analytics-animal-costs'),
+    path('records/async/', async_views.AsyncHealthRecordListView.as_view(), name='health-record-list-async'),
+    path('records/async/<int:pk>/', async_views.AsyncHealthRecordDetailView.as_view(), name='health-record-detail-async'),
+    path('records/async/stats/', async_views.AsyncHealthRecordStatsView.as_view(), name='health-record-stats-async'),
 ]
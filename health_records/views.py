@@ -1,10 +1,42 @@
-from rest_framework import generics, permissions
-from .models import HealthRecord
-from .serializers import HealthRecordSerializer
+from collections import Counter
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Q, Sum
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from livestock.models import Livestock
+from .analytics import detect_outbreaks, get_animal_costs, get_incidence, get_monthly_costs
+from .models import AppointmentReminder, HealthRecord, HealthRecordDailyRollup
+from .filters import HealthRecordFilterMixin
+from .reminders import get_due_window
+from .serializers import (
+    HealthRecordSerializer, HealthRecordCompactSerializer, HealthRecordBatchSerializer, HealthRecordStatsSerializer,
+    DueAppointmentSerializer, DueAppointmentQuerySerializer, AppointmentReminderSerializer,
+    HealthAnalyticsQuerySerializer, IncidenceQuerySerializer, OutbreakQuerySerializer, AnimalCostQuerySerializer,
+)
+from .stats import format_stats, get_record_queryset, get_stats_aggregates
+from livestock_management.cache import CachedListMixin, bump_cache_version, cache_response, serve_cached
+from livestock_management.events import publish_herd_changed
+from livestock_management.export import StreamingExportView
+from livestock_management.fastpath import FastListMixin
+from livestock_management.fieldsets import SparseFieldsetMixin
+from livestock_management.metrics import InstrumentedViewMixin
+from livestock_management.optimization import OptimizedQuerysetMixin
+from livestock_management.pagination import KeysetPagination
+from livestock_management.reports import ReportView, period_starts, truncate
 
-class HealthRecordListCreateView(generics.ListCreateAPIView):
+class HealthRecordPagination(KeysetPagination):
+    key_field = 'date'
+
+class HealthRecordListCreateView(InstrumentedViewMixin, SparseFieldsetMixin, CachedListMixin, FastListMixin,
+                                 HealthRecordFilterMixin, OptimizedQuerysetMixin, generics.ListCreateAPIView):
+    cache_name = 'health-record-list'
     serializer_class = HealthRecordSerializer
+    compact_serializer_class = HealthRecordCompactSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = HealthRecordPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -12,7 +44,7 @@ class HealthRecordListCreateView(generics.ListCreateAPIView):
             return HealthRecord.objects.all()
         return HealthRecord.objects.filter(livestock__owner=user)
 
-class HealthRecordDetailView(generics.RetrieveUpdateDestroyAPIView):
+class HealthRecordDetailView(InstrumentedViewMixin, SparseFieldsetMixin, OptimizedQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = HealthRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -21,3 +53,192 @@ class HealthRecordDetailView(generics.RetrieveUpdateDestroyAPIView):
         if user.is_admin:
             return HealthRecord.objects.all()
         return HealthRecord.objects.filter(livestock__owner=user)
+
+class HealthRecordBatchCreateView(APIView):
+    """
+    Applies one record template to many animals, e.g. a herd-wide vaccination.
+
+    Ownership of every referenced animal is checked with a single query and
+    all rows are written with bulk_create. Unknown or foreign animals reject
+    the whole batch so a corrected request can be resent safely.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    batch_size = 1000
+
+    def post(self, request):
+        serializer = HealthRecordBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        template = serializer.validated_data['record']
+        ids = set(serializer.validated_data['livestock'])
+        tag_numbers = set(serializer.validated_data['tag_numbers'])
+
+        livestock = Livestock.objects.filter(Q(id__in=ids) | Q(tag_number__in=tag_numbers))
+        if not request.user.is_admin:
+            livestock = livestock.filter(owner=request.user)
+        found = list(livestock.values_list('id', 'tag_number', 'owner_id'))
+
+        missing_ids = ids - {pk for pk, _, _ in found}
+        missing_tags = tag_numbers - {tag for _, tag, _ in found}
+        if missing_ids or missing_tags:
+            return Response({
+                'detail': 'Some livestock were not found',
+                'livestock': sorted(missing_ids),
+                'tag_numbers': sorted(missing_tags),
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        owners = {pk: owner_id for pk, _, owner_id in found}
+        records = [
+            HealthRecord(livestock_id=pk, owner_id=owner_id, created_by=request.user, **template)
+            for pk, owner_id in sorted(owners.items())
+        ]
+        with transaction.atomic():
+            HealthRecord.objects.bulk_create(records, batch_size=self.batch_size)
+            for owner_id, count in Counter(owners.values()).items():
+                HealthRecordDailyRollup.adjust(
+                    owner_id, template['date'], template['record_type'], count, (template.get('cost') or 0) * count,
+                )
+        bump_cache_version(*owners.values())
+        publish_herd_changed(owners.values(), 'health_records', len(records))
+
+        return Response({
+            'created': len(records),
+            'record_type': template['record_type'],
+            'date': template['date'],
+        }, status=status.HTTP_201_CREATED)
+
+class DueAppointmentListView(InstrumentedViewMixin, SparseFieldsetMixin, CachedListMixin, FastListMixin,
+                             HealthRecordFilterMixin, OptimizedQuerysetMixin, generics.ListAPIView):
+    """
+    Open follow-up appointments due within ?days (default 7) or missed in the
+    last ?overdue_days (default 30), soonest first.
+    """
+    cache_name = 'health-record-due'
+    serializer_class = DueAppointmentSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        params = DueAppointmentQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        start, end = get_due_window(**params.validated_data)
+
+        user = self.request.user
+        records = HealthRecord.objects.all()
+        if not user.is_admin:
+            records = records.filter(livestock__owner=user)
+        return records.appointments_due(start, end).with_days_until_appointment().order_by('next_appointment', 'id')
+
+class AppointmentReminderListView(InstrumentedViewMixin, generics.ListAPIView):
+    serializer_class = AppointmentReminderSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return AppointmentReminder.objects.filter(recipient=self.request.user)
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+@cache_response('health-record-stats')
+def health_record_stats(request):
+    totals = get_record_queryset(request.user).aggregate(**get_stats_aggregates())
+    serializer = HealthRecordStatsSerializer(format_stats(totals))
+    return Response(serializer.data)
+
+class HealthAnalyticsView(APIView):
+    """
+    Base for the analytics endpoints: validates the query options and
+    serves the cached analysis of the user's records.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    query_serializer_class = HealthAnalyticsQuerySerializer
+    cache_name = None
+
+    def get(self, request):
+        return serve_cached(request, self.cache_name, self.render)
+
+    def render(self):
+        params = self.query_serializer_class(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return Response(self.analyse(params.validated_data))
+
+    def get_records(self):
+        return get_record_queryset(self.request.user)
+
+    def get_livestock(self):
+        user = self.request.user
+        if user.is_admin:
+            return Livestock.objects.all()
+        return Livestock.objects.filter(owner=user)
+
+class IncidenceView(HealthAnalyticsView):
+    """
+    Rolling incidence of a record type (illness by default) per animal type
+    or breed, per 100 animals.
+    """
+    query_serializer_class = IncidenceQuerySerializer
+    cache_name = 'health-analytics-incidence'
+
+    def analyse(self, options):
+        return {**options, 'results': get_incidence(self.get_records(), self.get_livestock(), **options)}
+
+class OutbreakView(HealthAnalyticsView):
+    """
+    Clusters of illness records well above each group's usual rate.
+    """
+    query_serializer_class = OutbreakQuerySerializer
+    cache_name = 'health-analytics-outbreaks'
+
+    def analyse(self, options):
+        return {**options, 'results': detect_outbreaks(self.get_records(), **options)}
+
+class MonthlyCostView(HealthAnalyticsView):
+    cache_name = 'health-analytics-monthly-costs'
+
+    def analyse(self, options):
+        return get_monthly_costs(self.get_records(), self.get_livestock(), options.get('since'), options.get('until'))
+
+class AnimalCostView(HealthAnalyticsView):
+    query_serializer_class = AnimalCostQuerySerializer
+    cache_name = 'health-analytics-animal-costs'
+
+    def analyse(self, options):
+        return {'group_by': options['group_by'], **get_animal_costs(self.get_records(), **options)}
+
+class HealthRecordReportView(ReportView):
+    """
+    Record counts and cost per day, week, month or year, read from the
+    daily rollups.
+    """
+    model = HealthRecordDailyRollup
+    cache_name = 'health-record-report'
+    filter_params = {
+        'record_type': ('record_type__in', serializers.ChoiceField(choices=HealthRecord.RECORD_TYPES)),
+    }
+
+    def report(self, rollups, period, since, until):
+        results = {
+            start: {'period': start, 'records': 0, 'cost': Decimal(0), 'by_record_type': {}}
+            for start in period_starts(since, until, period)
+        }
+        rows = rollups.filter(date__gte=since, date__lte=until).values(
+            'record_type', start=truncate('date', period),
+        ).annotate(records=Sum('records'), cost=Sum('cost')).order_by()
+        for row in rows:
+            result = results[row['start']]
+            result['records'] += row['records']
+            result['cost'] += row['cost']
+            result['by_record_type'][row['record_type']] = {'records': row['records'], 'cost': row['cost']}
+        return list(results.values())
+
+class HealthRecordExportView(HealthRecordFilterMixin, StreamingExportView):
+    filename = 'health_records'
+    export_fields = (
+        'id', 'livestock_id', 'livestock__tag_number', 'record_type', 'date',
+        'veterinarian', 'diagnosis', 'treatment', 'medication', 'cost', 'notes',
+        'next_appointment', 'created_by_id', 'created_by__username',
+        'created_at', 'updated_at',
+    )
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return HealthRecord.objects.all()
+        return HealthRecord.objects.filter(livestock__owner=user)
@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'progress', 'attempts', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'name', 'created_at')
+    search_fields = ('name', 'error')
+    readonly_fields = (
+        'name', 'payload', 'progress', 'progress_message', 'result', 'error', 'attempts',
+        'worker', 'created_by', 'created_at', 'started_at', 'finished_at', 'updated_at',
+    )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs on a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Number of worker processes (default: CPU count)')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait between polls when the queue is empty')
+        parser.add_argument('--stale-after', type=int, default=300,
+                            help='Requeue running jobs without a heartbeat for this many seconds')
+        parser.add_argument('--burst', action='store_true',
+                            help='Exit once the queue is empty instead of polling forever')
+
+    def handle(self, *args, **options):
+        worker = Worker(
+            concurrency=options['concurrency'],
+            poll_interval=options['poll_interval'],
+            stale_after=options['stale_after'],
+            burst=options['burst'],
+        )
+        self.stdout.write(f'Worker {worker.name} running {worker.concurrency} processes')
+        worker.run()
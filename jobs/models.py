@@ -0,0 +1,60 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+User = get_user_model()
+
+class Job(models.Model):
+    """
+    A unit of background work, queued in the database and executed by the
+    run_jobs worker command.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete")
+    progress_message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Doubles as the heartbeat of running jobs.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Workers claim the oldest runnable job; only queued rows are indexed.
+            models.Index(fields=['run_after', 'id'], name='job_queued_idx', condition=models.Q(status='queued')),
+            models.Index(fields=['updated_at'], name='job_running_idx', condition=models.Q(status='running')),
+            models.Index(fields=['created_by', '-created_at', '-id'], name='job_created_by_idx'),
+            models.Index(fields=['-created_at', '-id'], name='job_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    def set_progress(self, progress, message=''):
+        """
+        Records progress from inside a running task; also refreshes the
+        heartbeat. Does nothing once the job was handed to another worker;
+        returns whether it was recorded.
+        """
+        self.progress = max(0, min(100, int(progress)))
+        self.progress_message = message[:255]
+        return bool(Job.objects.filter(pk=self.pk, status='running', worker=self.worker).update(
+            progress=self.progress, progress_message=self.progress_message, updated_at=timezone.now(),
+        ))
@@ -0,0 +1,20 @@
+"""
+Entry points for worker pool processes.
+
+Pool processes are spawned, not forked, so they never share the parent's
+database connection. They import this module before Django is set up, so
+it must not import models at module level.
+"""
+import signal
+
+
+def setup():
+    import django
+    # Ctrl-C is handled by the parent, which lets running jobs finish.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+
+
+def execute(job_id, worker):
+    from .queue import run_job
+    run_job(job_id, worker)
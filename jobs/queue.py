@@ -0,0 +1,120 @@
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+
+def enqueue(name, payload=None, user=None, run_after=None):
+    """
+    Queues a registered task and returns its Job; a worker picks it up on its next poll.
+    """
+    task = get_task(name)
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        created_by=user,
+        max_attempts=task.max_attempts,
+        run_after=run_after or timezone.now(),
+    )
+
+
+def claim_jobs(worker, limit):
+    """
+    Marks up to limit runnable jobs as running for this worker. SKIP LOCKED
+    lets any number of workers poll the same table without handing out a
+    job twice or waiting on each other.
+    """
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='queued', run_after__lte=now)
+            .order_by('run_after', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        if ids:
+            Job.objects.filter(pk__in=ids).update(
+                status='running', worker=worker, attempts=F('attempts') + 1,
+                started_at=now, finished_at=None, updated_at=now,
+            )
+    return ids
+
+
+def get_retry_delay(attempts):
+    """
+    Exponential backoff with jitter: the base delay doubles with every failed
+    attempt up to the configured maximum.
+    """
+    delay = min(settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def fail_job(job_id, worker, error, retry=True, updated_before=None):
+    """
+    Requeues a failed attempt after its backoff delay, or marks the job failed
+    once it has used up max_attempts. Only a job still running on worker is
+    changed, so a late report cannot overwrite a newer attempt; returns
+    whether it was.
+    """
+    running = Job.objects.filter(pk=job_id, status='running', worker=worker)
+    if updated_before is not None:
+        running = running.filter(updated_at__lt=updated_before)
+    job = running.values('attempts', 'max_attempts').first()
+    if job is None:
+        return False
+    now = timezone.now()
+    if retry and job['attempts'] < job['max_attempts']:
+        run_after = now + timedelta(seconds=get_retry_delay(job['attempts']))
+        return bool(running.update(status='queued', run_after=run_after, error=error, worker=''))
+    return bool(running.update(status='failed', error=error, finished_at=now))
+
+
+def heartbeat(worker, job_ids):
+    if job_ids:
+        Job.objects.filter(pk__in=job_ids, status='running', worker=worker).update(updated_at=timezone.now())
+
+
+def requeue_stale_jobs(stale_after):
+    """
+    Hands jobs whose worker stopped sending heartbeats back to the queue,
+    counting the lost run as a failed attempt. Returns how many were.
+    """
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    stale = Job.objects.filter(status='running', updated_at__lt=cutoff).values_list('id', 'worker')
+    return sum(
+        fail_job(job_id, worker, 'Worker stopped responding', updated_before=cutoff)
+        for job_id, worker in stale
+    )
+
+
+def run_job(job_id, worker):
+    """
+    Executes one job claimed by worker; runs inside a worker pool process.
+    """
+    close_old_connections()
+    try:
+        job = Job.objects.get(pk=job_id)
+        try:
+            task = get_task(job.name)
+        except LookupError as exc:
+            fail_job(job_id, worker, str(exc), retry=False)
+            return
+        try:
+            result = task.func(job, **job.payload)
+        except Exception:
+            fail_job(job_id, worker, traceback.format_exc())
+            return
+        Job.objects.filter(pk=job_id, status='running', worker=worker).update(
+            status='succeeded', result=result, error='', progress=100, finished_at=timezone.now(),
+        )
+    finally:
+        close_old_connections()
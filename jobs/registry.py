@@ -0,0 +1,26 @@
+"""
+Background task registry.
+
+Apps declare tasks in their tasks module with the @task decorator; the jobs
+app imports every tasks module at startup, in web and worker processes alike.
+A task is called as func(job, **payload) and returns a JSON-serialisable result.
+"""
+from collections import namedtuple
+
+Task = namedtuple('Task', ['name', 'func', 'max_attempts'])
+
+TASKS = {}
+
+
+def task(name, max_attempts=3):
+    def decorator(func):
+        TASKS[name] = Task(name, func, max_attempts)
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return TASKS[name]
+    except KeyError:
+        raise LookupError(f'Unknown task: {name}')
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+from .models import Job
+from .registry import TASKS
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'name', 'status', 'progress', 'progress_message', 'result', 'error',
+            'attempts', 'max_attempts', 'run_after', 'created_by', 'created_at',
+            'started_at', 'finished_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+class JobCreateSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    payload = serializers.DictField(required=False, default=dict)
+
+    def validate_name(self, value):
+        if value not in TASKS:
+            raise serializers.ValidationError(f'Unknown task: {value}')
+        return value
@@ -0,0 +1,56 @@
+from django.urls import reverse
+from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+from livestock_management.metrics import InstrumentedViewMixin
+from livestock_management.optimization import OptimizedQuerysetMixin
+from livestock_management.pagination import KeysetPagination
+from .models import Job
+from .queue import enqueue
+from .serializers import JobCreateSerializer, JobSerializer
+
+class JobPagination(KeysetPagination):
+    key_field = 'created_at'
+
+class JobListCreateView(InstrumentedViewMixin, OptimizedQuerysetMixin, generics.ListCreateAPIView):
+    """
+    Lists the user's background jobs. Admins see every job and may queue any
+    registered task directly; other users start jobs through the feature
+    endpoints that offer background processing.
+    """
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = JobPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return Job.objects.all()
+        return Job.objects.filter(created_by=user)
+
+    def create(self, request, *args, **kwargs):
+        if not request.user.is_admin:
+            raise PermissionDenied('Only admins can queue tasks directly.')
+        serializer = JobCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = enqueue(serializer.validated_data['name'], serializer.validated_data['payload'], user=request.user)
+        return job_accepted_response(request, job)
+
+class JobDetailView(InstrumentedViewMixin, OptimizedQuerysetMixin, generics.RetrieveAPIView):
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return Job.objects.all()
+        return Job.objects.filter(created_by=user)
+
+def job_accepted_response(request, job):
+    """
+    202 response for a request that was handed to the job queue; poll the
+    Location URL for status and progress.
+    """
+    response = Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+    response['Location'] = request.build_absolute_uri(reverse('job-detail', args=[job.pk]))
+    return response
@@ -0,0 +1,123 @@
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.db import InterfaceError, OperationalError, close_old_connections, connection
+
+from . import process
+from .queue import claim_jobs, fail_job, heartbeat, requeue_stale_jobs
+
+logger = logging.getLogger('jobs.worker')
+
+
+class Worker:
+    """
+    Polls the job table and runs claimed jobs on a pool of processes.
+
+    The parent process only claims jobs, sends heartbeats for the ones in
+    flight and notices crashed pool processes; the jobs themselves record
+    their own outcome. SIGINT/SIGTERM stop claiming and wait for running jobs.
+    If the database goes away, the parent logs it and keeps retrying every
+    poll_interval instead of exiting.
+    """
+    def __init__(self, concurrency=None, poll_interval=1.0, heartbeat_interval=30,
+                 stale_after=300, burst=False):
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.burst = burst
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def make_pool(self):
+        return ProcessPoolExecutor(
+            max_workers=self.concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=process.setup,
+        )
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        requeued = requeue_stale_jobs(self.stale_after)
+        if requeued:
+            logger.info('Requeued %s stale jobs', requeued)
+
+        pool = self.make_pool()
+        inflight = {}
+        self.last_heartbeat = self.last_stale_check = time.monotonic()
+        try:
+            while not self.stopping:
+                # Drops a connection that broke or outlived CONN_MAX_AGE.
+                close_old_connections()
+                try:
+                    pool, claimed = self.poll(pool, inflight)
+                except (OperationalError, InterfaceError):
+                    logger.exception('Lost the database connection; retrying in %s seconds', self.poll_interval)
+                    connection.close()
+                    time.sleep(self.poll_interval)
+                    continue
+                if self.burst and not claimed and not inflight:
+                    break
+
+                if not claimed:
+                    if inflight:
+                        wait(inflight, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    else:
+                        time.sleep(self.poll_interval)
+        finally:
+            if inflight:
+                logger.info('Waiting for %s running jobs', len(inflight))
+            done, _ = wait(inflight)
+            self.collect(pool, inflight, done)
+            pool.shutdown()
+
+    def poll(self, pool, inflight):
+        """
+        One round of the parent loop: records finished jobs, claims new ones
+        for the free processes and sends the periodic heartbeat and stale
+        check. Returns the (possibly replaced) pool and the claimed job ids.
+        """
+        pool = self.collect(pool, inflight, [future for future in inflight if future.done()])
+
+        claimed = claim_jobs(self.name, self.concurrency - len(inflight))
+        for job_id in claimed:
+            inflight[pool.submit(process.execute, job_id, self.name)] = job_id
+            logger.info('Started job %s', job_id)
+
+        now = time.monotonic()
+        if now - self.last_heartbeat >= self.heartbeat_interval:
+            heartbeat(self.name, list(inflight.values()))
+            self.last_heartbeat = now
+        if now - self.last_stale_check >= self.stale_after:
+            requeue_stale_jobs(self.stale_after)
+            self.last_stale_check = now
+        return pool, claimed
+
+    def collect(self, pool, inflight, done):
+        broken = False
+        for future in done:
+            job_id = inflight[future]
+            try:
+                future.result()
+            except BrokenProcessPool:
+                broken = True
+                fail_job(job_id, self.name, 'Worker process died')
+            except Exception as exc:
+                fail_job(job_id, self.name, repr(exc))
+            # Only forgotten once recorded, so a database error retries it.
+            del inflight[future]
+            logger.info('Finished job %s', job_id)
+        if broken and not self.stopping:
+            pool.shutdown(wait=False)
+            pool = self.make_pool()
+        return pool
@@ -1,12 +1,13 @@
 from django.contrib import admin
-from .models import Livestock
+from .models import HerdDailyChange, Livestock, LivestockSummary, WeightMeasurement
 
 @admin.register(Livestock)
 class LivestockAdmin(admin.ModelAdmin):
     list_display = ('tag_number', 'animal_type', 'breed', 'gender', 'status', 'owner', 'created_at')
     list_filter = ('animal_type', 'gender', 'status', 'created_at')
     search_fields = ('tag_number', 'breed', 'owner__username')
-    readonly_fields = ('created_at', 'updated_at', 'age_in_days', 'age_in_months')
+    readonly_fields = ('inbreeding_coefficient', 'created_at', 'updated_at', 'age_in_days', 'age_in_months')
+    raw_id_fields = ('sire', 'dam')
     
     fieldsets = (
         ('Basic Information', {
@@ -15,6 +16,9 @@ class LivestockAdmin(admin.ModelAdmin):
         ('Physical Details', {
             'fields': ('birth_date', 'weight', 'status')
         }),
+        ('Pedigree', {
+            'fields': ('sire', 'dam', 'inbreeding_coefficient')
+        }),
         ('Financial Information', {
             'fields': ('purchase_price', 'purchase_date')
         }),
@@ -26,3 +30,25 @@ class LivestockAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+@admin.register(LivestockSummary)
+class LivestockSummaryAdmin(admin.ModelAdmin):
+    list_display = ('owner', 'animal_type', 'status', 'count')
+    list_filter = ('animal_type', 'status')
+    readonly_fields = ('owner', 'animal_type', 'status', 'count')
+
+@admin.register(HerdDailyChange)
+class HerdDailyChangeAdmin(admin.ModelAdmin):
+    list_display = ('owner', 'date', 'animal_type', 'status', 'delta')
+    list_filter = ('animal_type', 'status', 'date')
+    readonly_fields = ('owner', 'date', 'animal_type', 'status', 'delta')
+
+@admin.register(WeightMeasurement)
+class WeightMeasurementAdmin(admin.ModelAdmin):
+    list_display = ('livestock', 'weight', 'measured_at', 'source', 'scale_id')
+    list_filter = ('source', 'measured_at')
+    search_fields = ('livestock__tag_number', 'scale_id')
+    raw_id_fields = ('livestock',)
+
+    def has_change_permission(self, request, obj=None):
+        return False
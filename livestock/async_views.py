@@ -0,0 +1,31 @@
+from livestock_management.async_views import AsyncAPIView, AsyncDetailView, AsyncListView
+from .filters import LivestockFilterMixin
+from .models import Livestock
+from .serializers import LivestockCompactSerializer, LivestockSerializer, LivestockStatsSerializer
+from .stats import format_stats, get_stats_aggregates, get_summary_queryset
+from .views import LivestockPagination
+
+
+class LivestockScopeMixin:
+    serializer_class = LivestockSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return Livestock.objects.with_age()
+        return Livestock.objects.filter(owner=user).with_age()
+
+
+class AsyncLivestockListView(LivestockScopeMixin, LivestockFilterMixin, AsyncListView):
+    pagination_class = LivestockPagination
+    compact_serializer_class = LivestockCompactSerializer
+
+
+class AsyncLivestockDetailView(LivestockScopeMixin, AsyncDetailView):
+    pass
+
+
+class AsyncLivestockStatsView(AsyncAPIView):
+    async def get(self, request):
+        totals = await get_summary_queryset(request.user).aaggregate(**get_stats_aggregates())
+        return LivestockStatsSerializer(format_stats(totals)).data
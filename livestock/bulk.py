@@ -0,0 +1,153 @@
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from livestock_management.cache import bump_cache_version
+from livestock_management.events import publish_herd_changed
+from .models import HerdDailyChange, Livestock, LivestockSummary, WeightMeasurement
+from .serializers import LivestockBulkSerializer
+
+
+class LivestockBulkUpsert:
+    """
+    Creates or updates many animals for one user, keyed on tag_number.
+
+    Rows are validated and written in batches of batch_size, each batch in its
+    own transaction with a single INSERT ... ON CONFLICT (tag_number) DO UPDATE.
+    Invalid rows are skipped and reported by their position in the payload;
+    a malformed NDJSON line aborts the run after the batches already written.
+
+    The conflict update only applies to rows of the same owner, so a tag
+    that another owner inserts after the ownership lookup is reported
+    instead of taken over.
+    """
+    batch_size = 1000
+    update_fields = [
+        'animal_type', 'breed', 'gender', 'birth_date', 'weight', 'status',
+        'purchase_price', 'purchase_date', 'notes', 'updated_at',
+    ]
+
+    def __init__(self, user, batch_size=None):
+        self.user = user
+        self.batch_size = batch_size or self.batch_size
+        self.result = {'created': 0, 'updated': 0, 'errors': []}
+        self.owner_ids = {user.id}
+        self.seen_tags = set()
+
+    def run(self, rows, on_batch=None):
+        """
+        Writes every row and returns the created/updated/errors summary;
+        on_batch(rows_done) is called after each batch.
+        """
+        rows = enumerate(rows)
+        done = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.upsert_batch(batch)
+            done += len(batch)
+            if on_batch is not None:
+                on_batch(done)
+
+        with transaction.atomic():
+            LivestockSummary.rebuild(owner_ids=self.owner_ids)
+            HerdDailyChange.reconcile(owner_ids=self.owner_ids)
+        bump_cache_version(*self.owner_ids)
+        publish_herd_changed(self.owner_ids, 'import', self.result['created'] + self.result['updated'])
+        return self.result
+
+    def upsert_batch(self, batch):
+        valid = []
+        for index, row in batch:
+            serializer = LivestockBulkSerializer(data=row)
+            if not serializer.is_valid():
+                self.result['errors'].append({'row': index, 'errors': serializer.errors})
+                continue
+            tag_number = serializer.validated_data['tag_number']
+            if tag_number in self.seen_tags:
+                self.result['errors'].append({'row': index, 'errors': {'tag_number': ['Duplicate tag_number in request.']}})
+                continue
+            self.seen_tags.add(tag_number)
+            valid.append((index, serializer.validated_data))
+
+        existing = {
+            tag_number: (owner_id, weight)
+            for tag_number, owner_id, weight in Livestock.objects.filter(
+                tag_number__in=[data['tag_number'] for _, data in valid]
+            ).values_list('tag_number', 'owner_id', 'weight')
+        }
+
+        objects, rows = [], {}
+        for index, data in valid:
+            owner_id = existing.get(data['tag_number'], (self.user.id, None))[0]
+            if owner_id != self.user.id and not self.user.is_admin:
+                self.add_owner_error(index)
+                continue
+            objects.append(Livestock(owner_id=owner_id, **data))
+            rows[data['tag_number']] = index
+
+        with transaction.atomic():
+            written = self.upsert(objects)
+            self.record_weights([
+                (written[obj.tag_number][0], obj) for obj in objects
+                if obj.tag_number in written and obj.weight != existing.get(obj.tag_number, (None, None))[1]
+            ])
+        for obj in objects:
+            if obj.tag_number not in written:
+                self.add_owner_error(rows[obj.tag_number])
+                continue
+            self.owner_ids.add(obj.owner_id)
+            self.result['created' if written[obj.tag_number][1] else 'updated'] += 1
+
+    def add_owner_error(self, index):
+        self.result['errors'].append({
+            'row': index,
+            'errors': {'tag_number': ['Livestock with this tag number belongs to another owner.']},
+        })
+
+    def upsert(self, objects):
+        """
+        INSERT ... ON CONFLICT (tag_number) DO UPDATE ... WHERE the existing
+        row has the same owner. Returns {tag_number: (id, created)} for the
+        rows written; rows held by another owner are left out.
+        """
+        if not objects:
+            return {}
+        fields = [field for field in Livestock._meta.concrete_fields if not field.primary_key]
+        quote = connection.ops.quote_name
+        table = quote(Livestock._meta.db_table)
+        columns = ', '.join(quote(field.column) for field in fields)
+        updates = ', '.join(
+            f'{quote(column)} = EXCLUDED.{quote(column)}'
+            for column in (Livestock._meta.get_field(name).column for name in self.update_fields)
+        )
+        placeholders = '(%s)' % ', '.join(['%s'] * len(fields))
+        params = [
+            field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+            for obj in objects for field in fields
+        ]
+        sql = (
+            f'INSERT INTO {table} ({columns}) VALUES {", ".join([placeholders] * len(objects))} '
+            f'ON CONFLICT ({quote("tag_number")}) DO UPDATE SET {updates} '
+            f'WHERE {table}.{quote("owner_id")} = EXCLUDED.{quote("owner_id")} '
+            # xmax is 0 on freshly inserted row versions.
+            f'RETURNING {quote("tag_number")}, {quote("id")}, xmax = 0'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return {tag_number: (pk, created) for tag_number, pk, created in cursor.fetchall()}
+
+    def record_weights(self, written):
+        """
+        Appends a weight reading for every new animal or changed weight, as
+        the per-row signal handlers would; written holds (id, animal) pairs.
+        """
+        if not written:
+            return
+        measured_at = timezone.now()
+        WeightMeasurement.objects.bulk_create([
+            WeightMeasurement(livestock_id=pk, weight=obj.weight, measured_at=measured_at)
+            for pk, obj in written
+        ])
@@ -0,0 +1,35 @@
+from rest_framework import serializers
+
+from livestock_management.filters import AliasOrderingFilter, FullTextSearchFilter, QueryParamFilterBackend
+from .models import SEARCH_VECTOR_FIELDS, Livestock, age_at_least, age_at_most
+
+
+class LivestockFilterMixin:
+    """
+    Server-side filtering, search and ordering shared by the livestock list
+    and export views. Every filter is backed by an index on Livestock.
+    """
+    filter_backends = [QueryParamFilterBackend, FullTextSearchFilter, AliasOrderingFilter]
+    filter_params = {
+        'animal_type': ('animal_type__in', serializers.ChoiceField(choices=Livestock.ANIMAL_TYPES)),
+        'status': ('status__in', serializers.ChoiceField(choices=Livestock.STATUS_CHOICES)),
+        'gender': ('gender', serializers.ChoiceField(choices=Livestock.GENDER_CHOICES)),
+        'breed': ('breed', serializers.CharField()),
+        'birth_date_after': ('birth_date__gte', serializers.DateField()),
+        'birth_date_before': ('birth_date__lte', serializers.DateField()),
+        'weight_min': ('weight__gte', serializers.DecimalField(max_digits=8, decimal_places=2)),
+        'weight_max': ('weight__lte', serializers.DecimalField(max_digits=8, decimal_places=2)),
+        # Age bounds become birth_date bounds so they stay on the birth_date index.
+        'age_min_days': (age_at_least, serializers.IntegerField(min_value=0)),
+        'age_max_days': (age_at_most, serializers.IntegerField(min_value=0)),
+        'age_min_months': (lambda months: age_at_least(months * 30), serializers.IntegerField(min_value=0)),
+        'age_max_months': (lambda months: age_at_most(months * 30 + 29), serializers.IntegerField(min_value=0)),
+    }
+    search_vector_fields = SEARCH_VECTOR_FIELDS
+    ordering_fields = [
+        'created_at', 'updated_at', 'tag_number', 'animal_type', 'breed', 'birth_date', 'weight', 'status',
+    ]
+    ordering_aliases = {
+        'age_in_days': '-birth_date',
+        'age_in_months': '-birth_date',
+    }
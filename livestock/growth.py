@@ -0,0 +1,189 @@
+from datetime import timezone
+
+import numpy as np
+from django.db.models import FloatField
+from django.db.models.functions import Cast, Extract
+
+from .models import WeightMeasurement
+
+SECONDS_PER_DAY = 86400.0
+PERCENTILES = (10, 25, 50, 75, 90)
+GROUP_FIELDS = ('animal_type', 'breed')
+# Readings closer together than this cannot give a meaningful daily gain.
+MIN_SPAN_DAYS = 1.0
+# Modified z-score cut-off recommended by Iglewicz and Hoaglin.
+OUTLIER_THRESHOLD = 3.5
+
+
+def load_readings(livestock_queryset, since=None, until=None):
+    """
+    Fetches every reading of the herd as an (n, 3) float array of
+    (livestock_id, day, weight) sorted by animal and time. Timestamps and
+    decimals are converted in the database so no per-row Python work is done.
+    """
+    readings = WeightMeasurement.objects.filter(livestock__in=livestock_queryset.values('pk'))
+    if since is not None:
+        readings = readings.filter(measured_at__gte=since)
+    if until is not None:
+        readings = readings.filter(measured_at__lt=until)
+    rows = readings.order_by('livestock_id', 'measured_at', 'id').values_list(
+        'livestock_id',
+        Cast(Extract('measured_at', 'epoch', tzinfo=timezone.utc), FloatField()),
+        Cast('weight', FloatField()),
+    )
+    data = np.array(list(rows), dtype=np.float64).reshape(-1, 3)
+    data[:, 1] /= SECONDS_PER_DAY
+    return data
+
+
+def compute_daily_gain(readings):
+    """
+    Average daily gain per animal as the least-squares slope of weight over
+    time, computed for the whole herd with segmented sums instead of a loop.
+
+    Returns a dict of equally long arrays keyed by animal; animals whose
+    readings span less than MIN_SPAN_DAYS get a NaN gain.
+    """
+    if not len(readings):
+        empty = np.empty(0)
+        return {
+            'livestock_id': empty.astype(np.int64), 'readings': empty.astype(np.int64),
+            'days_tracked': empty, 'start_weight': empty, 'end_weight': empty, 'daily_gain': empty,
+        }
+
+    ids, days, weights = readings[:, 0].astype(np.int64), readings[:, 1], readings[:, 2]
+    animal_ids, starts, counts = np.unique(ids, return_index=True, return_counts=True)
+    ends = starts + counts - 1
+
+    # Centre each animal's timeline on its first reading to keep the sums well conditioned.
+    x = days - np.repeat(days[starts], counts)
+    n = counts.astype(np.float64)
+    sum_x = np.add.reduceat(x, starts)
+    sum_y = np.add.reduceat(weights, starts)
+    sum_xx = np.add.reduceat(x * x, starts)
+    sum_xy = np.add.reduceat(x * weights, starts)
+    span = days[ends] - days[starts]
+
+    denominator = n * sum_xx - sum_x * sum_x
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (n * sum_xy - sum_x * sum_y) / denominator
+    daily_gain = np.where(span >= MIN_SPAN_DAYS, slope, np.nan)
+
+    return {
+        'livestock_id': animal_ids,
+        'readings': counts,
+        'days_tracked': span,
+        'start_weight': weights[starts],
+        'end_weight': weights[ends],
+        'daily_gain': daily_gain,
+    }
+
+
+def grouped_percentiles(values, codes, group_count, percentiles=PERCENTILES):
+    """
+    Linearly interpolated percentiles of values per group code, matching
+    numpy.percentile, from a single sort of the whole array. NaNs are ignored
+    and groups without values get NaN. Returns a (group_count, len(percentiles)) array.
+    """
+    valid = ~np.isnan(values)
+    values, codes = values[valid], codes[valid]
+    order = np.lexsort((values, codes))
+    values = values[order]
+
+    counts = np.bincount(codes, minlength=group_count)
+    starts = np.cumsum(counts) - counts
+    fractions = np.asarray(percentiles, dtype=np.float64) / 100
+    positions = starts[:, None] + fractions[None, :] * (counts[:, None] - 1)
+
+    result = np.full(positions.shape, np.nan)
+    present = counts > 0
+    positions = positions[present]
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    result[present] = values[lower] + (values[upper] - values[lower]) * (positions - lower)
+    return result
+
+
+def grouped_mean(values, codes, group_count):
+    valid = ~np.isnan(values)
+    totals = np.bincount(codes[valid], weights=values[valid], minlength=group_count)
+    counts = np.bincount(codes[valid], minlength=group_count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return totals / counts, counts
+
+
+def outlier_scores(values, codes, group_count):
+    """
+    Modified z-scores (median and median absolute deviation) of values within
+    their group. Robust to the outliers being looked for; a group with no
+    spread scores every animal 0.
+    """
+    medians = grouped_percentiles(values, codes, group_count, (50,))[:, 0]
+    deviations = np.abs(values - medians[codes])
+    mad = grouped_percentiles(deviations, codes, group_count, (50,))[:, 0][codes]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(mad > 0, 0.6745 * (values - medians[codes]) / mad, 0.0)
+    return np.where(np.isnan(values), np.nan, scores)
+
+
+def encode_groups(labels):
+    groups, codes = np.unique(np.asarray(labels, dtype=object).astype(str), return_inverse=True)
+    return groups, codes.reshape(-1)
+
+
+def _number(value, digits):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def get_herd_growth(livestock_queryset, group_by='animal_type', since=None, until=None):
+    """
+    Daily gain and outlier flags for every animal in the queryset that has
+    readings in the window, scored against others of the same group_by value.
+    """
+    gain = compute_daily_gain(load_readings(livestock_queryset, since, until))
+    animals = {
+        row[0]: row[1:]
+        for row in livestock_queryset.order_by().values_list('pk', 'tag_number', 'animal_type', 'breed')
+    }
+    details = [animals[animal_id] for animal_id in gain['livestock_id'].tolist()]
+    column = 1 + GROUP_FIELDS.index(group_by)
+    groups, codes = encode_groups([detail[column] for detail in details])
+    scores = outlier_scores(gain['daily_gain'], codes, len(groups))
+
+    results = []
+    for i, (tag_number, animal_type, breed) in enumerate(details):
+        results.append({
+            'id': int(gain['livestock_id'][i]),
+            'tag_number': tag_number,
+            'animal_type': animal_type,
+            'breed': breed,
+            'readings': int(gain['readings'][i]),
+            'days_tracked': _number(gain['days_tracked'][i], 1),
+            'start_weight': _number(gain['start_weight'][i], 2),
+            'end_weight': _number(gain['end_weight'][i], 2),
+            'average_daily_gain': _number(gain['daily_gain'][i], 4),
+            'outlier_score': _number(scores[i], 2),
+            'is_outlier': bool(abs(scores[i]) > OUTLIER_THRESHOLD),
+        })
+    return results
+
+
+def get_growth_percentiles(livestock_queryset, group_by='animal_type', since=None, until=None):
+    """
+    Distribution of average daily gain per group_by value across the herd.
+    """
+    gain = compute_daily_gain(load_readings(livestock_queryset, since, until))
+    labels = dict(livestock_queryset.order_by().values_list('pk', group_by))
+    groups, codes = encode_groups([labels[animal_id] for animal_id in gain['livestock_id'].tolist()])
+    percentiles = grouped_percentiles(gain['daily_gain'], codes, len(groups))
+    means, counts = grouped_mean(gain['daily_gain'], codes, len(groups))
+
+    results = []
+    for i, group in enumerate(groups.tolist()):
+        row = {'group': group, 'animals': int(counts[i]), 'mean': _number(means[i], 4)}
+        row.update(
+            ('p%d' % percentile, _number(percentiles[i, j], 4))
+            for j, percentile in enumerate(PERCENTILES)
+        )
+        results.append(row)
+    return results
@@ -0,0 +1,252 @@
+"""
+Pedigree queries and inbreeding coefficients.
+
+Ancestors and descendants are walked with recursive CTEs over the sire and
+dam foreign keys, so a query only touches the animals in the pedigree, however
+large the herds are, and each of them once however many paths lead to it.
+Coancestry is computed on the loaded pedigree with Colleau's method: one pass
+up from one animal and one pass down to any number of others. That is linear
+in the pedigree size because each ancestor's own inbreeding coefficient is
+read from Livestock.inbreeding_coefficient, which update_inbreeding() keeps
+current whenever parents change.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from jobs.queue import enqueue
+from livestock_management.cache import bump_cache_version
+from .models import Livestock
+
+# Deepest pedigree listed by the lineage views.
+MAX_GENERATIONS = 20
+# Most descendants listed per request.
+MAX_LINEAGE_LIMIT = 10000
+
+ANCESTORS_SQL = """
+WITH RECURSIVE pedigree(id, sire_id, dam_id, inbreeding_coefficient) AS (
+    SELECT id, sire_id, dam_id, inbreeding_coefficient FROM {table} WHERE id = ANY(%s)
+    UNION
+    SELECT parent.id, parent.sire_id, parent.dam_id, parent.inbreeding_coefficient
+    FROM pedigree
+    JOIN {table} parent ON parent.id = pedigree.sire_id OR parent.id = pedigree.dam_id
+)
+SELECT id, sire_id, dam_id, inbreeding_coefficient FROM pedigree
+"""
+
+DESCENDANTS_SQL = """
+WITH RECURSIVE descendants(id, sire_id, dam_id) AS (
+    SELECT id, sire_id, dam_id FROM {table} WHERE id = ANY(%s)
+    UNION
+    SELECT child.id, child.sire_id, child.dam_id
+    FROM descendants
+    JOIN {table} child ON child.sire_id = descendants.id OR child.dam_id = descendants.id
+)
+SELECT id, sire_id, dam_id FROM descendants
+"""
+
+
+def get_generations(links, livestock_ids, generations=None):
+    """
+    Shortest distance in generations from livestock_ids to each animal
+    reachable through links (id -> related ids), up to generations if given.
+    """
+    distance = dict.fromkeys(livestock_ids, 0)
+    frontier, generation = list(distance), 0
+    while frontier and (generations is None or generation < generations):
+        generation += 1
+        reached = []
+        for pk in frontier:
+            for related in links.get(pk, ()):
+                if related is not None and related not in distance:
+                    distance[related] = generation
+                    reached.append(related)
+        frontier = reached
+    return distance
+
+
+def load_ancestors(livestock_ids):
+    """
+    (id, sire_id, dam_id, inbreeding_coefficient) of the animals and all
+    their ancestors.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(ANCESTORS_SQL.format(table=Livestock._meta.db_table), [list(livestock_ids)])
+        return cursor.fetchall()
+
+
+def load_descendants(livestock_ids, generations=None, limit=None):
+    """
+    (id, generation) of the animals' descendants, nearest first.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(DESCENDANTS_SQL.format(table=Livestock._meta.db_table), [list(livestock_ids)])
+        rows = cursor.fetchall()
+    children = {}
+    for pk, sire_id, dam_id in rows:
+        for parent in (sire_id, dam_id):
+            children.setdefault(parent, []).append(pk)
+    seeds = set(livestock_ids)
+    descendants = sorted(
+        ((pk, generation) for pk, generation in get_generations(children, seeds, generations).items() if pk not in seeds),
+        key=lambda item: (item[1], item[0]),
+    )
+    return descendants[:limit]
+
+
+class Pedigree:
+    """
+    Animals loaded by load_ancestors(), optionally cut off a number of
+    generations back from some of them. Parents that were not loaded are
+    treated as unknown.
+    """
+    def __init__(self, rows, livestock_ids=None, generations=None):
+        self.parents, self.inbreeding = {}, {}
+        for pk, sire_id, dam_id, inbreeding in rows:
+            self.parents[pk] = (sire_id, dam_id)
+            self.inbreeding[pk] = inbreeding
+        self.generation = {}
+        if livestock_ids is not None:
+            # Distance from the nearest of the animals; older ancestors are dropped.
+            seeds = [pk for pk in livestock_ids if pk in self.parents]
+            self.generation = get_generations(self.parents, seeds, generations)
+            self.parents = {pk: self.parents[pk] for pk in self.generation}
+        for pk, (sire_id, dam_id) in self.parents.items():
+            self.parents[pk] = (
+                sire_id if sire_id in self.parents else None,
+                dam_id if dam_id in self.parents else None,
+            )
+        self.depth = self.get_depths()
+
+    @classmethod
+    def load(cls, livestock_ids, generations=None):
+        return cls(load_ancestors(livestock_ids), livestock_ids, generations)
+
+    def get_depths(self):
+        """
+        Longest distance from each animal to a founder, so parents always
+        sort before their offspring. Links that would close a cycle are dropped.
+        """
+        depths, visiting = {}, set()
+        for start in self.parents:
+            stack = [start]
+            while stack:
+                pk = stack[-1]
+                if pk in depths:
+                    stack.pop()
+                    continue
+                visiting.add(pk)
+                parents = tuple(None if parent in visiting else parent for parent in self.parents[pk])
+                self.parents[pk] = parents
+                pending = [parent for parent in parents if parent is not None and parent not in depths]
+                if pending:
+                    stack.extend(pending)
+                    continue
+                depths[pk] = 1 + max((depths[parent] for parent in parents if parent is not None), default=-1)
+                visiting.discard(pk)
+                stack.pop()
+        return depths
+
+    def ancestors(self, *livestock_ids):
+        """
+        The loaded animals among livestock_ids and all their loaded ancestors.
+        """
+        seen = {pk for pk in livestock_ids if pk in self.parents}
+        stack = list(seen)
+        while stack:
+            for parent in self.parents[stack.pop()]:
+                if parent is not None and parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return seen
+
+    def within_family_variance(self, pk):
+        known = [parent for parent in self.parents[pk] if parent is not None]
+        return 1 - 0.25 * len(known) - 0.25 * sum(self.inbreeding[parent] for parent in known)
+
+    def coancestries(self, pk, others):
+        """
+        Coancestry of pk with each of others, which is the inbreeding
+        coefficient of their offspring. Computes one column of the
+        relationship matrix A = T D T': T' e_pk from pk up to its ancestors,
+        then scaled by D and pushed down through the others' ancestors.
+        """
+        if pk not in self.parents:
+            return dict.fromkeys(others, 0.0)
+        up = dict.fromkeys(self.ancestors(pk), 0.0)
+        up[pk] = 1.0
+        for node in sorted(up, key=self.depth.__getitem__, reverse=True):
+            if up[node]:
+                for parent in self.parents[node]:
+                    if parent is not None:
+                        up[parent] += 0.5 * up[node]
+
+        down = {}
+        for node in sorted(self.ancestors(*others), key=self.depth.__getitem__):
+            sire, dam = self.parents[node]
+            value = self.within_family_variance(node) * up[node] if node in up else 0.0
+            down[node] = value + 0.5 * (down.get(sire, 0.0) + down.get(dam, 0.0))
+        return {other: down.get(other, 0.0) / 2 for other in others}
+
+    def coancestry(self, first, second):
+        if first is None or second is None:
+            return 0.0
+        return self.coancestries(first, [second])[second]
+
+    def recompute(self, livestock_ids):
+        """
+        Recomputes the inbreeding coefficient of the given loaded animals,
+        parents before offspring so each sees its ancestors' new values. The
+        offspring of a sire at the same depth share one coancestries() pass.
+        Returns the ones that changed.
+        """
+        layers = {}
+        for pk in livestock_ids:
+            if pk in self.parents:
+                layers.setdefault(self.depth[pk], {}).setdefault(self.parents[pk][0], []).append(pk)
+        changed = {}
+        for depth in sorted(layers):
+            for sire, offspring in layers[depth].items():
+                dams = {self.parents[pk][1] for pk in offspring}
+                coancestries = self.coancestries(sire, dams) if sire is not None else {}
+                for pk in offspring:
+                    value = round(coancestries.get(self.parents[pk][1], 0.0), 6)
+                    if value != self.inbreeding[pk]:
+                        self.inbreeding[pk] = changed[pk] = value
+        return changed
+
+
+def expected_inbreeding(sire_id, dam_id):
+    """
+    Inbreeding coefficient of offspring of the pairing.
+    """
+    if sire_id is None or dam_id is None:
+        return 0.0
+    return round(Pedigree.load([sire_id, dam_id]).coancestry(sire_id, dam_id), 6)
+
+
+def save_inbreeding(values, batch_size=1000):
+    now = timezone.now()
+    Livestock.objects.bulk_update(
+        [Livestock(pk=pk, inbreeding_coefficient=value, updated_at=now) for pk, value in values.items()],
+        ['inbreeding_coefficient', 'updated_at'], batch_size=batch_size,
+    )
+
+
+def update_inbreeding(livestock_ids, max_descendants=None):
+    """
+    Recomputes the stored coefficients of the animals and their descendants,
+    e.g. after their parents changed, and returns the changed values. With
+    more than max_descendants descendants, only the animals are updated now
+    and the rest is queued for the livestock.update_inbreeding task.
+    """
+    livestock_ids = list(livestock_ids)
+    affected = {pk for pk, _ in load_descendants(livestock_ids)}
+    if max_descendants is not None and len(affected) > max_descendants:
+        transaction.on_commit(lambda: enqueue('livestock.update_inbreeding', {'livestock_ids': livestock_ids}))
+        affected = set()
+    affected.update(livestock_ids)
+    changed = Pedigree.load(affected).recompute(affected)
+    if changed:
+        save_inbreeding(changed)
+        bump_cache_version(*Livestock.objects.filter(pk__in=changed).values_list('owner_id', flat=True).distinct())
+    return changed
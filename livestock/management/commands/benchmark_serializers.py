@@ -0,0 +1,91 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from health_records.models import HealthRecord
+from health_records.serializers import DueAppointmentSerializer, HealthRecordCompactSerializer, HealthRecordSerializer
+from livestock.models import Livestock
+from livestock.serializers import LivestockCompactSerializer, LivestockSerializer
+from livestock_management.fastpath import get_row_plan
+from livestock_management.optimization import optimize_queryset
+from livestock_management.renderers import FastJSONRenderer
+
+
+def get_cases():
+    livestock = Livestock.objects.with_age().order_by('-created_at', '-id')
+    records = HealthRecord.objects.order_by('-date', '-id')
+    return [
+        ('livestock', LivestockSerializer, livestock),
+        ('livestock-compact', LivestockCompactSerializer, livestock),
+        ('health-records', HealthRecordSerializer, records),
+        ('health-records-compact', HealthRecordCompactSerializer, records),
+        ('due-appointments', DueAppointmentSerializer,
+         records.filter(next_appointment__isnull=False).with_days_until_appointment()),
+    ]
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        result = func()
+        timings.append(perf_counter() - start)
+    return min(timings), result
+
+
+class Command(BaseCommand):
+    help = ('Check that the fast list path renders the same bytes as the DRF serializers '
+            'and compare their speed on existing rows')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per case')
+        parser.add_argument('--page-size', type=int, default=100, help='Timings are reported per page of this size')
+        parser.add_argument('--repeat', type=int, default=5, help='Best of this many runs is reported')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        pages = rows / options['page_size']
+        mismatches = []
+
+        for name, serializer_class, queryset in get_cases():
+            plan = get_row_plan(serializer_class, queryset)
+            if plan is None:
+                mismatches.append(f'{name}: no fast plan for {serializer_class.__name__}')
+                continue
+
+            instances_query = optimize_queryset(queryset, serializer_class)[:rows]
+            fetch_instances, instances = best_of(repeat, lambda: list(instances_query.all()))
+            serialize_drf, drf_data = best_of(repeat, lambda: serializer_class(instances, many=True).data)
+            render_drf, drf_bytes = best_of(repeat, lambda: JSONRenderer().render(drf_data))
+
+            rows_query = plan.get_rows(queryset)[:rows]
+            fetch_rows, values = best_of(repeat, lambda: list(rows_query.all()))
+            if not values:
+                mismatches.append(f'{name}: no rows to compare; run generate_farm_data first')
+                continue
+            serialize_fast, fast_data = best_of(repeat, lambda: plan.serialize(values))
+            render_fast, fast_bytes = best_of(repeat, lambda: FastJSONRenderer().render(fast_data))
+
+            if fast_bytes != drf_bytes:
+                first = next(
+                    (index for index, (a, b) in enumerate(zip(fast_data, drf_data)) if a != b),
+                    min(len(fast_data), len(drf_data)),
+                )
+                mismatches.append(f'{name}: output differs from row {first}')
+            if FastJSONRenderer().render(drf_data) != drf_bytes:
+                mismatches.append(f'{name}: FastJSONRenderer output differs from JSONRenderer')
+
+            drf_total = fetch_instances + serialize_drf + render_drf
+            fast_total = fetch_rows + serialize_fast + render_fast
+            self.stdout.write(
+                f'{name:<24} {len(values):>6} rows  ms/page '
+                f'fetch {fetch_instances / pages * 1000:6.2f} -> {fetch_rows / pages * 1000:6.2f}  '
+                f'serialize {serialize_drf / pages * 1000:6.2f} -> {serialize_fast / pages * 1000:6.2f}  '
+                f'render {render_drf / pages * 1000:6.2f} -> {render_fast / pages * 1000:6.2f}  '
+                f'total x{drf_total / fast_total:.1f}'
+            )
+
+        if mismatches:
+            raise CommandError('\n'.join(mismatches))
+        self.stdout.write(self.style.SUCCESS('Fast path output is byte-identical for every case'))
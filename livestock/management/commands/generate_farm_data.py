@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from livestock_management.synthetic import DEFAULT_PASSWORD, DEFAULT_PREFIX, FarmDataGenerator
+
+
+class Command(BaseCommand):
+    help = 'Generate synthetic owners, livestock and health records for benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owners', type=int, default=10)
+        parser.add_argument('--animals', type=int, default=500, help='Animals per owner')
+        parser.add_argument('--records', type=int, default=5, help='Health records per animal')
+        parser.add_argument('--prefix', default=DEFAULT_PREFIX,
+                            help='Usernames are <prefix>_owner_0000, <prefix>_owner_0001, ...')
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help='Password of every generated owner')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--clear', action='store_true',
+                            help='Delete owners generated earlier with the same prefix first')
+
+    def handle(self, *args, **options):
+        generator = FarmDataGenerator(
+            owners=options['owners'],
+            animals_per_owner=options['animals'],
+            records_per_animal=options['records'],
+            prefix=options['prefix'],
+            password=options['password'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        if options['clear']:
+            self.stdout.write(f'Deleted {generator.clear()} previously generated owners')
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        totals = generator.run(log=log)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {totals['owners']} owners, {totals['livestock']} livestock and "
+            f"{totals['health_records']} health records; log in as {generator.username(0)}"
+        ))
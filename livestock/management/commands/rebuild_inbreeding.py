@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from livestock.lineage import Pedigree, save_inbreeding
+from livestock.models import Livestock
+from livestock_management.cache import bump_cache_version
+
+
+class Command(BaseCommand):
+    help = 'Recompute the stored inbreeding coefficient of every animal from the recorded pedigree'
+
+    def handle(self, *args, **options):
+        rows = Livestock.objects.values_list('id', 'sire_id', 'dam_id', 'inbreeding_coefficient')
+        pedigree = Pedigree(rows.iterator(chunk_size=10000))
+        changed = pedigree.recompute(pedigree.parents)
+        with transaction.atomic():
+            save_inbreeding(changed)
+        bump_cache_version(*Livestock.objects.filter(pk__in=changed).values_list('owner_id', flat=True).distinct())
+        self.stdout.write(self.style.SUCCESS(
+            f'Recomputed {len(pedigree.parents)} inbreeding coefficients, {len(changed)} changed'
+        ))
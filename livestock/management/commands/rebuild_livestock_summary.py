@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from livestock.models import LivestockSummary
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-owner livestock summary table from the livestock rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, action='append', dest='owners',
+                            help='Only rebuild the summary for this owner id (repeatable)')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            LivestockSummary.rebuild(owner_ids=options['owners'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {LivestockSummary.objects.count()} livestock summary rows'
+        ))
@@ -0,0 +1,56 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max, Min
+
+from health_records.models import HealthRecord, HealthRecordDailyRollup
+from livestock.models import HerdDailyChange
+
+
+class Command(BaseCommand):
+    help = ('Backfill or repair the daily rollups behind the report endpoints. '
+            'Health record rollups are recomputed for the date range; running it twice gives the same rows')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', type=int, action='append', dest='owners',
+                            help='Only rebuild rollups for this owner id (repeatable)')
+        parser.add_argument('--since', type=date.fromisoformat, help='First day to rebuild (default: first record)')
+        parser.add_argument('--until', type=date.fromisoformat, help='Last day to rebuild (default: last record)')
+        parser.add_argument('--chunk-days', type=int, default=31,
+                            help='Days rebuilt per transaction, to keep long backfills from holding locks')
+        parser.add_argument('--herd', choices=['reconcile', 'rebuild', 'skip'], default='reconcile',
+                            help='reconcile books any drift of the herd history on today; rebuild replaces '
+                                 'it with each current animal arriving on its creation date')
+
+    def handle(self, *args, **options):
+        owners = options['owners']
+        since, until = options['since'], options['until']
+        if since is None or until is None:
+            records = HealthRecord.objects.all()
+            if owners is not None:
+                records = records.filter(livestock__owner_id__in=owners)
+            bounds = records.aggregate(first=Min('date'), last=Max('date'))
+            since, until = since or bounds['first'], until or bounds['last']
+        if options['chunk_days'] < 1:
+            raise CommandError('--chunk-days must be at least 1')
+
+        rollups = 0
+        if since is not None and until is not None:
+            start = since
+            while start <= until:
+                end = min(start + timedelta(days=options['chunk_days'] - 1), until)
+                with transaction.atomic():
+                    rollups += HealthRecordDailyRollup.rebuild(owner_ids=owners, since=start, until=end)
+                start = end + timedelta(days=1)
+            self.stdout.write(f'Rebuilt {rollups} health record rollups from {since} to {until}')
+
+        if options['herd'] == 'reconcile':
+            with transaction.atomic():
+                adjusted = HerdDailyChange.reconcile(owner_ids=owners)
+            self.stdout.write(f'Booked {adjusted} herd corrections on today')
+        elif options['herd'] == 'rebuild':
+            with transaction.atomic():
+                HerdDailyChange.rebuild(owner_ids=owners)
+            self.stdout.write('Rebuilt the herd history from livestock creation dates')
+        self.stdout.write(self.style.SUCCESS('Rollups are up to date'))
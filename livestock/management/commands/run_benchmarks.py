@@ -0,0 +1,59 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from livestock_management.benchmark import compare_results, default_scenarios, run_suite
+from livestock_management.synthetic import DEFAULT_PASSWORD, DEFAULT_PREFIX
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the API endpoints in-process and write the results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', default=f'{DEFAULT_PREFIX}_owner_0000')
+        parser.add_argument('--password', default=DEFAULT_PASSWORD)
+        parser.add_argument('--iterations', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per scenario')
+        parser.add_argument('--cold-cache', action='store_true',
+                            help='Clear the response cache before every measured request')
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help='Only run this scenario (repeatable)')
+        parser.add_argument('--label', help='Free-form label stored with the result')
+        parser.add_argument('--output', help='Write the JSON result to this file instead of stdout')
+        parser.add_argument('--compare', help='Print the p95 change against an earlier JSON result')
+
+    def handle(self, *args, **options):
+        known = {scenario.name for scenario in default_scenarios('', '')}
+        unknown = set(options['scenarios'] or ()) - known
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}. Choose from {', '.join(sorted(known))}")
+
+        try:
+            result = run_suite(
+                options['username'], options['password'],
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                cold_cache=options['cold_cache'],
+                only=options['scenarios'],
+                label=options['label'],
+            )
+        except RuntimeError as exc:
+            raise CommandError(f'{exc}. Generate data first with: manage.py generate_farm_data')
+
+        output = json.dumps(result, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Wrote results to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if options['compare']:
+            with open(options['compare']) as handle:
+                baseline = json.load(handle)
+            for row in compare_results(baseline, result):
+                change = f"{row['change_pct']:+.1f}%" if row['change_pct'] is not None else 'n/a'
+                self.stdout.write(
+                    f"{row['scenario']:<26} p95 {row['before_ms']} -> {row['after_ms']} ms ({change}), "
+                    f"queries {row['queries_before']} -> {row['queries_after']}"
+                )
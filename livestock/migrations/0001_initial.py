@@ -0,0 +1,147 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:42
+
+from django.conf import settings
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Livestock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag_number', models.CharField(max_length=50, unique=True)),
+                ('animal_type', models.CharField(choices=[('cattle', 'Cattle'), ('sheep', 'Sheep'), ('goat', 'Goat'), ('pig', 'Pig'), ('chicken', 'Chicken'), ('other', 'Other')], max_length=20)),
+                ('breed', models.CharField(max_length=100)),
+                ('gender', models.CharField(choices=[('male', 'Male'), ('female', 'Female')], max_length=10)),
+                ('birth_date', models.DateField()),
+                ('weight', models.DecimalField(decimal_places=2, help_text='Weight in kg', max_digits=8)),
+                ('status', models.CharField(choices=[('healthy', 'Healthy'), ('sick', 'Sick'), ('pregnant', 'Pregnant'), ('sold', 'Sold'), ('deceased', 'Deceased')], default='healthy', max_length=20)),
+                ('purchase_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('purchase_date', models.DateField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('inbreeding_coefficient', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('change_txid', models.BigIntegerField(default=0, editable=False)),
+                ('dam', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='offspring_by_dam', to='livestock.livestock')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='livestock', to=settings.AUTH_USER_MODEL)),
+                ('sire', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='offspring_by_sire', to='livestock.livestock')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LivestockSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('animal_type', models.CharField(choices=[('cattle', 'Cattle'), ('sheep', 'Sheep'), ('goat', 'Goat'), ('pig', 'Pig'), ('chicken', 'Chicken'), ('other', 'Other')], max_length=20)),
+                ('status', models.CharField(choices=[('healthy', 'Healthy'), ('sick', 'Sick'), ('pregnant', 'Pregnant'), ('sold', 'Sold'), ('deceased', 'Deceased')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='livestock_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HerdDailyChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('animal_type', models.CharField(choices=[('cattle', 'Cattle'), ('sheep', 'Sheep'), ('goat', 'Goat'), ('pig', 'Pig'), ('chicken', 'Chicken'), ('other', 'Other')], max_length=20)),
+                ('status', models.CharField(choices=[('healthy', 'Healthy'), ('sick', 'Sick'), ('pregnant', 'Pregnant'), ('sold', 'Sold'), ('deceased', 'Deceased')], max_length=20)),
+                ('delta', models.IntegerField(default=0)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='herd_changes', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WeightMeasurement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.DecimalField(decimal_places=2, help_text='Weight in kg', max_digits=8)),
+                ('measured_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('source', models.CharField(choices=[('manual', 'Manual'), ('scale', 'Scale')], default='manual', max_length=10)),
+                ('scale_id', models.CharField(blank=True, max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('livestock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weight_measurements', to='livestock.livestock')),
+            ],
+            options={
+                'ordering': ['-measured_at'],
+                'indexes': [django.contrib.postgres.indexes.BrinIndex(fields=['measured_at'], name='weight_measured_brin_idx'), models.Index(fields=['livestock', '-measured_at', '-id'], name='weight_livestock_time_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='livestocksummary',
+            constraint=models.UniqueConstraint(fields=('owner', 'animal_type', 'status'), name='livestock_summary_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='livestock_owner_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['-created_at', '-id'], name='livestock_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['owner', 'change_txid', 'id'], name='livestock_owner_txid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['change_txid', 'id'], name='livestock_txid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['owner', 'animal_type', 'status'], name='livestock_owner_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['owner', 'status'], name='livestock_owner_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['owner', 'gender'], name='livestock_owner_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['owner', 'breed'], name='livestock_owner_breed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['owner', 'birth_date'], name='livestock_owner_birth_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['birth_date'], name='livestock_birth_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(fields=['owner', 'weight'], name='livestock_owner_weight_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=models.Index(condition=models.Q(('status', 'sick')), fields=['owner', '-updated_at'], name='livestock_owner_sick_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='livestock',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('tag_number', 'breed', 'notes', config='simple'), name='livestock_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='herddailychange',
+            index=models.Index(fields=['date'], name='herd_change_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='herddailychange',
+            constraint=models.UniqueConstraint(fields=('owner', 'date', 'animal_type', 'status'), name='herd_change_unique'),
+        ),
+    ]
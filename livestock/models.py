@@ -1,8 +1,60 @@
+from datetime import date, timedelta
+
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db.models.functions import TruncDate
+from django.utils import timezone
 
 User = get_user_model()
 
+# Columns covered by the full-text search GIN index.
+SEARCH_VECTOR_FIELDS = ('tag_number', 'breed', 'notes')
+
+def age_at_least(days, today=None):
+    """
+    Animals at least `days` old, expressed as a bound on birth_date so the
+    filter can use the birth_date index.
+    """
+    return models.Q(birth_date__lte=(today or date.today()) - timedelta(days=days))
+
+def age_at_most(days, today=None):
+    return models.Q(birth_date__gte=(today or date.today()) - timedelta(days=days))
+
+def age_in_days_expression(prefix='', today=None):
+    """
+    today - birth_date in SQL; prefix reaches a related animal's birth_date,
+    e.g. 'livestock__'.
+    """
+    today = models.Value(today or date.today(), output_field=models.DateField())
+    return models.Func(
+        today, models.F(prefix + 'birth_date'), template='(%(expressions)s)', arg_joiner=' - ',
+        output_field=models.IntegerField(),
+    )
+
+def age_in_months_expression(prefix='', today=None):
+    return age_in_days_expression(prefix, today) / 30
+
+class LivestockQuerySet(models.QuerySet):
+    def with_age(self, today=None):
+        """
+        Annotates age_in_days and age_in_months in SQL, with today bound once
+        per query. The Livestock properties return the annotated values.
+        """
+        return self.annotate(
+            age_in_days=age_in_days_expression(today=today),
+            age_in_months=models.F('age_in_days') / 30,
+        )
+
+    def age_range(self, min_days=None, max_days=None, today=None):
+        queryset = self
+        if min_days is not None:
+            queryset = queryset.filter(age_at_least(min_days, today))
+        if max_days is not None:
+            queryset = queryset.filter(age_at_most(max_days, today))
+        return queryset
+
 class Livestock(models.Model):
     ANIMAL_TYPES = [
         ('cattle', 'Cattle'),
@@ -26,6 +78,7 @@ class Livestock(models.Model):
         ('deceased', 'Deceased'),
     ]
 
+
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='livestock')
     tag_number = models.CharField(max_length=50, unique=True)
     animal_type = models.CharField(max_length=20, choices=ANIMAL_TYPES)
@@ -37,20 +90,243 @@ class Livestock(models.Model):
     purchase_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     purchase_date = models.DateField(null=True, blank=True)
     notes = models.TextField(blank=True)
+    sire = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='offspring_by_sire')
+    dam = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='offspring_by_dam')
+    # Kept current by livestock.signals from the recorded pedigree; see livestock.lineage.
+    inbreeding_coefficient = models.FloatField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Transaction that last wrote the row, set by a trigger; the sync change
+    # feed is ordered by it (see sync.feed).
+    change_txid = models.BigIntegerField(default=0, editable=False)
+
+    objects = LivestockQuerySet.as_manager()
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination seeks on (created_at, id), per owner and globally for admins.
+            models.Index(fields=['owner', '-created_at', '-id'], name='livestock_owner_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='livestock_created_idx'),
+            # The sync change feed seeks on (change_txid, id) the same way.
+            models.Index(fields=['owner', 'change_txid', 'id'], name='livestock_owner_txid_idx'),
+            models.Index(fields=['change_txid', 'id'], name='livestock_txid_idx'),
+            # Server-side list filters.
+            models.Index(fields=['owner', 'animal_type', 'status'], name='livestock_owner_type_idx'),
+            models.Index(fields=['owner', 'status'], name='livestock_owner_status_idx'),
+            models.Index(fields=['owner', 'gender'], name='livestock_owner_gender_idx'),
+            models.Index(fields=['owner', 'breed'], name='livestock_owner_breed_idx'),
+            models.Index(fields=['owner', 'birth_date'], name='livestock_owner_birth_idx'),
+            # Age filters and ordering for admins, who see every herd.
+            models.Index(fields=['birth_date'], name='livestock_birth_idx'),
+            models.Index(fields=['owner', 'weight'], name='livestock_owner_weight_idx'),
+            models.Index(
+                fields=['owner', '-updated_at'], name='livestock_owner_sick_idx',
+                condition=models.Q(status='sick'),
+            ),
+            GinIndex(SearchVector(*SEARCH_VECTOR_FIELDS, config='simple'), name='livestock_search_idx'),
+        ]
 
     def __str__(self):
         return f"{self.tag_number} - {self.animal_type} ({self.breed})"
 
+    def save(self, *args, **kwargs):
+        # birth_date may have changed; drop ages annotated when the row was loaded.
+        self.__dict__.pop('_age_in_days', None)
+        self.__dict__.pop('_age_in_months', None)
+        super().save(*args, **kwargs)
+
     @property
     def age_in_days(self):
-        from datetime import date
+        if '_age_in_days' in self.__dict__:
+            return self.__dict__['_age_in_days']
         return (date.today() - self.birth_date).days
 
+    @age_in_days.setter
+    def age_in_days(self, value):
+        self.__dict__['_age_in_days'] = value
+
     @property
     def age_in_months(self):
+        if '_age_in_months' in self.__dict__:
+            return self.__dict__['_age_in_months']
         return self.age_in_days // 30
+
+    @age_in_months.setter
+    def age_in_months(self, value):
+        self.__dict__['_age_in_months'] = value
+
+class LivestockSummary(models.Model):
+    """
+    Running head count per owner, animal type and status.
+
+    Kept current by the signal handlers in livestock.signals and rebuilt from
+    scratch with the rebuild_livestock_summary management command.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='livestock_summary')
+    animal_type = models.CharField(max_length=20, choices=Livestock.ANIMAL_TYPES)
+    status = models.CharField(max_length=20, choices=Livestock.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'animal_type', 'status'], name='livestock_summary_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner} - {self.animal_type}/{self.status}: {self.count}"
+
+    @classmethod
+    def adjust(cls, owner_id, animal_type, status, delta):
+        updated = cls.objects.filter(
+            owner_id=owner_id, animal_type=animal_type, status=status
+        ).update(count=models.F('count') + delta)
+        if not updated and delta > 0:
+            summary, created = cls.objects.get_or_create(
+                owner_id=owner_id, animal_type=animal_type, status=status,
+                defaults={'count': delta},
+            )
+            if not created:
+                cls.objects.filter(pk=summary.pk).update(count=models.F('count') + delta)
+
+    @classmethod
+    def rebuild(cls, owner_ids=None):
+        queryset = Livestock.objects.all()
+        summaries = cls.objects.all()
+        if owner_ids is not None:
+            queryset = queryset.filter(owner_id__in=owner_ids)
+            summaries = summaries.filter(owner_id__in=owner_ids)
+        rows = queryset.values('owner_id', 'animal_type', 'status').annotate(total=models.Count('id')).order_by()
+        summaries.delete()
+        cls.objects.bulk_create([
+            cls(owner_id=row['owner_id'], animal_type=row['animal_type'], status=row['status'], count=row['total'])
+            for row in rows
+        ])
+
+class HerdDailyChange(models.Model):
+    """
+    Net change in head count per owner, day, animal type and status.
+
+    The herd on any day is the sum of the changes up to that day, so herd
+    reports read one row per day on which something changed instead of
+    every animal. Kept current by livestock.signals; bulk writes book their
+    net effect with reconcile().
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='herd_changes')
+    date = models.DateField()
+    animal_type = models.CharField(max_length=20, choices=Livestock.ANIMAL_TYPES)
+    status = models.CharField(max_length=20, choices=Livestock.STATUS_CHOICES)
+    delta = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'date', 'animal_type', 'status'], name='herd_change_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='herd_change_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner} - {self.date} {self.animal_type}/{self.status}: {self.delta:+d}"
+
+    @classmethod
+    def adjust(cls, owner_id, animal_type, status, delta, day=None):
+        day = day or timezone.localdate()
+        key = {'owner_id': owner_id, 'date': day, 'animal_type': animal_type, 'status': status}
+        if not cls.objects.filter(**key).update(delta=models.F('delta') + delta):
+            change, created = cls.objects.get_or_create(**key, defaults={'delta': delta})
+            if not created:
+                cls.objects.filter(pk=change.pk).update(delta=models.F('delta') + delta)
+
+    @classmethod
+    def reconcile(cls, owner_ids=None, day=None):
+        """
+        Books the difference between LivestockSummary and the changes
+        recorded so far on day (today by default), e.g. after bulk writes
+        that bypass the signal handlers. Returns the number of adjustments.
+        """
+        summaries = LivestockSummary.objects.all()
+        changes = cls.objects.all()
+        if owner_ids is not None:
+            summaries = summaries.filter(owner_id__in=owner_ids)
+            changes = changes.filter(owner_id__in=owner_ids)
+        difference = {
+            row[:3]: row[3] for row in summaries.values_list('owner_id', 'animal_type', 'status', 'count')
+        }
+        for *key, booked in changes.values_list('owner_id', 'animal_type', 'status').annotate(
+            booked=models.Sum('delta'),
+        ).order_by():
+            key = tuple(key)
+            difference[key] = difference.get(key, 0) - booked
+        adjustments = [(key, delta) for key, delta in difference.items() if delta]
+        for key, delta in adjustments:
+            cls.adjust(*key, delta=delta, day=day)
+        return len(adjustments)
+
+    @classmethod
+    def rebuild(cls, owner_ids=None):
+        """
+        Replaces the recorded history with what the livestock rows still
+        tell: every current animal arriving on the day it was created, in
+        its current state. Status changes and deleted animals are lost, so
+        this is for backfilling owners whose history was never recorded.
+        """
+        queryset = Livestock.objects.all()
+        changes = cls.objects.all()
+        if owner_ids is not None:
+            queryset = queryset.filter(owner_id__in=owner_ids)
+            changes = changes.filter(owner_id__in=owner_ids)
+        rows = queryset.values('owner_id', 'animal_type', 'status', day=TruncDate('created_at')).annotate(
+            total=models.Count('id'),
+        ).order_by()
+        changes.delete()
+        cls.objects.bulk_create([
+            cls(owner_id=row['owner_id'], date=row['day'], animal_type=row['animal_type'],
+                status=row['status'], delta=row['total'])
+            for row in rows
+        ], batch_size=2000)
+
+class WeightMeasurement(models.Model):
+    """
+    Append-only weight history per animal; Livestock.weight mirrors the latest reading.
+
+    Readings arrive roughly in measured_at order, so a BRIN index keeps
+    time-window scans cheap at a fraction of the size of a B-tree.
+    """
+    SOURCE_CHOICES = [
+        ('manual', 'Manual'),
+        ('scale', 'Scale'),
+    ]
+
+    livestock = models.ForeignKey(Livestock, on_delete=models.CASCADE, related_name='weight_measurements')
+    weight = models.DecimalField(max_digits=8, decimal_places=2, help_text="Weight in kg")
+    measured_at = models.DateTimeField(default=timezone.now)
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default='manual')
+    scale_id = models.CharField(max_length=50, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-measured_at']
+        indexes = [
+            BrinIndex(fields=['measured_at'], name='weight_measured_brin_idx'),
+            models.Index(fields=['livestock', '-measured_at', '-id'], name='weight_livestock_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.livestock_id} - {self.weight} kg at {self.measured_at}"
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError('Weight measurements are append-only.')
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def sync_current_weight(cls, livestock_ids):
+        """
+        Copies the latest reading onto Livestock.weight for the given animals.
+        """
+        latest = cls.objects.filter(livestock=models.OuterRef('pk')).order_by('-measured_at', '-id')
+        return Livestock.objects.filter(pk__in=livestock_ids).update(
+            weight=models.Subquery(latest.values('weight')[:1]),
+            updated_at=timezone.now(),
+        )
@@ -1,5 +1,7 @@
+from django.db import models
 from rest_framework import serializers
-from .models import Livestock
+from .lineage import MAX_GENERATIONS, MAX_LINEAGE_LIMIT
+from .models import Livestock, WeightMeasurement, age_in_days_expression, age_in_months_expression
 
 class LivestockSerializer(serializers.ModelSerializer):
     age_in_days = serializers.ReadOnlyField()
@@ -11,18 +13,117 @@ class LivestockSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'tag_number', 'animal_type', 'breed', 'gender', 
             'birth_date', 'weight', 'status', 'purchase_price', 
-            'purchase_date', 'notes', 'owner', 'owner_name',
-            'age_in_days', 'age_in_months', 'created_at', 'updated_at'
+            'purchase_date', 'notes', 'sire', 'dam', 'inbreeding_coefficient',
+            'owner', 'owner_name', 'age_in_days', 'age_in_months', 'created_at', 'updated_at'
         ]
-        read_only_fields = ('id', 'created_at', 'updated_at', 'owner')
+        read_only_fields = ('id', 'inbreeding_coefficient', 'created_at', 'updated_at', 'owner')
+        field_dependencies = {
+            'age_in_days': ['birth_date'],
+            'age_in_months': ['birth_date'],
+        }
+        # SQL equivalents of the age properties for the fast list path.
+        field_expressions = {
+            'age_in_days': age_in_days_expression,
+            'age_in_months': age_in_months_expression,
+        }
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+        owner = self.instance.owner if self.instance else user
+        animal_type = attrs.get('animal_type', getattr(self.instance, 'animal_type', None))
+        birth_date = attrs.get('birth_date', getattr(self.instance, 'birth_date', None))
+        errors = {}
+        for field, gender in (('sire', 'male'), ('dam', 'female')):
+            parent = attrs.get(field)
+            if parent is None:
+                continue
+            if not user.is_admin and parent.owner_id != owner.pk:
+                errors[field] = self.fields[field].error_messages['does_not_exist'].format(pk_value=parent.pk)
+            elif self.instance and parent.pk == self.instance.pk:
+                errors[field] = 'An animal cannot be its own parent.'
+            elif parent.gender != gender:
+                errors[field] = f'The {field} must be {gender}.'
+            elif parent.animal_type != animal_type:
+                errors[field] = f'The {field} must be a {animal_type}.'
+            elif birth_date and parent.birth_date >= birth_date:
+                errors[field] = f'The {field} must be born before the animal.'
+        if self.instance and 'birth_date' in attrs:
+            offspring = Livestock.objects.filter(
+                models.Q(sire=self.instance) | models.Q(dam=self.instance), birth_date__lte=birth_date,
+            )
+            if offspring.exists():
+                errors['birth_date'] = 'The animal must be born before its offspring.'
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
 
     def create(self, validated_data):
         validated_data['owner'] = self.context['request'].user
         return super().create(validated_data)
 
+class LivestockCompactSerializer(LivestockSerializer):
+    """
+    Table-view representation served for ?compact=true; skips the owner join.
+    """
+    owner_name = None
+
+    class Meta(LivestockSerializer.Meta):
+        fields = [
+            'id', 'tag_number', 'animal_type', 'breed', 'gender',
+            'status', 'weight', 'age_in_months',
+        ]
+
 class LivestockStatsSerializer(serializers.Serializer):
     total_livestock = serializers.IntegerField()
     by_type = serializers.DictField()
     by_status = serializers.DictField()
     healthy_count = serializers.IntegerField()
     sick_count = serializers.IntegerField()
+
+class LivestockBulkSerializer(LivestockSerializer):
+    """
+    Validates rows for the bulk upsert endpoint. Uniqueness of tag_number is
+    resolved by the upsert itself instead of one lookup per row.
+    """
+    class Meta(LivestockSerializer.Meta):
+        # Parents are linked one animal at a time, where they are validated.
+        fields = [
+            field for field in LivestockSerializer.Meta.fields
+            if field not in ('sire', 'dam', 'inbreeding_coefficient')
+        ]
+        extra_kwargs = {'tag_number': {'validators': []}}
+
+    def validate(self, attrs):
+        return attrs
+
+class WeightMeasurementSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = WeightMeasurement
+        fields = ['id', 'livestock', 'weight', 'measured_at', 'source', 'scale_id', 'created_at']
+        read_only_fields = fields
+
+class WeightReadingSerializer(serializers.Serializer):
+    """
+    One scale reading for the ingestion endpoint. The animal is identified by
+    id or tag_number; both are resolved for the whole batch in one query.
+    """
+    livestock = serializers.IntegerField(required=False)
+    tag_number = serializers.CharField(max_length=50, required=False)
+    weight = serializers.DecimalField(max_digits=8, decimal_places=2, min_value=0)
+    measured_at = serializers.DateTimeField(required=False)
+    scale_id = serializers.CharField(max_length=50, required=False, allow_blank=True)
+
+    def validate(self, attrs):
+        if 'livestock' not in attrs and 'tag_number' not in attrs:
+            raise serializers.ValidationError('Provide livestock or tag_number.')
+        return attrs
+
+class GrowthQuerySerializer(serializers.Serializer):
+    group_by = serializers.ChoiceField(choices=['animal_type', 'breed'], default='animal_type')
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    outliers = serializers.BooleanField(default=False)
+
+class LineageQuerySerializer(serializers.Serializer):
+    generations = serializers.IntegerField(min_value=1, max_value=MAX_GENERATIONS, default=5)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_LINEAGE_LIMIT, default=1000)
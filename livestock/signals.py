@@ -0,0 +1,146 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q, QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from health_records.models import HealthRecord, HealthRecordDailyRollup
+from livestock_management.cache import bump_cache_version
+from livestock_management.events import publish_event
+from sync.models import Tombstone
+from .lineage import update_inbreeding
+from .models import HerdDailyChange, Livestock, LivestockSummary, WeightMeasurement
+
+
+def get_event_data(instance):
+    return {
+        'id': instance.pk, 'tag_number': instance.tag_number,
+        'animal_type': instance.animal_type, 'status': instance.status,
+    }
+
+
+@receiver(pre_save, sender=Livestock)
+def remember_previous_state(sender, instance, raw=False, **kwargs):
+    instance._previous_summary_key = instance._previous_weight = None
+    instance._previous_parents = (None, None)
+    if instance.pk and not raw:
+        previous = Livestock.objects.filter(pk=instance.pk).values_list(
+            'owner_id', 'animal_type', 'status', 'weight', 'sire_id', 'dam_id'
+        ).first()
+        if previous is not None:
+            instance._previous_summary_key, instance._previous_weight = previous[:3], previous[3]
+            instance._previous_parents = previous[4:]
+
+
+@receiver(post_save, sender=Livestock)
+def update_summary_and_history_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_summary_key', None)
+    current = (instance.owner_id, instance.animal_type, instance.status)
+    bump_cache_version(instance.owner_id, previous[0] if previous else None)
+    if previous != current:
+        if previous is not None:
+            LivestockSummary.adjust(*previous, delta=-1)
+            HerdDailyChange.adjust(*previous, delta=-1)
+        LivestockSummary.adjust(*current, delta=1)
+        HerdDailyChange.adjust(*current, delta=1)
+    if previous is not None and previous[0] != current[0]:
+        # The animal's health records now count towards the new owner.
+        HealthRecordDailyRollup.transfer(instance.pk, previous[0], current[0])
+        record_transfer(instance, previous[0])
+        publish_event(previous[0], 'livestock.deleted', {'id': instance.pk, 'transferred': True})
+    data = {**get_event_data(instance), 'previous_status': previous[2] if previous else None}
+    publish_event(instance.owner_id, 'livestock.created' if created else 'livestock.updated', data)
+    if instance.weight is not None and instance.weight != getattr(instance, '_previous_weight', None):
+        WeightMeasurement.objects.create(livestock=instance, weight=instance.weight)
+    if (instance.sire_id, instance.dam_id) != getattr(instance, '_previous_parents', (None, None)):
+        changed = update_inbreeding([instance.pk], max_descendants=settings.INBREEDING_INLINE_DESCENDANTS)
+        instance.inbreeding_coefficient = changed.get(instance.pk, instance.inbreeding_coefficient)
+
+
+def record_transfer(instance, previous_owner_id):
+    """
+    Moves the animal and its health records from the previous owner's
+    change feed to the new owner's; the records are touched so they reach
+    the new owner's clients too.
+    """
+    records = HealthRecord.objects.filter(livestock=instance)
+    record_ids = list(records.values_list('pk', flat=True))
+    records.update(owner_id=instance.owner_id, updated_at=timezone.now())
+    Tombstone.record_transfer(previous_owner_id, instance.owner_id, 'livestock', [instance.pk])
+    Tombstone.record_transfer(previous_owner_id, instance.owner_id, 'health_record', record_ids)
+
+
+def get_origin_model(origin):
+    """
+    Model whose deletion (of an instance or a queryset) started a delete.
+    """
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+def is_owner_deletion(origin):
+    """
+    Whether a delete cascades from users, whose summary and history rows
+    are going away with them.
+    """
+    return issubclass(get_origin_model(origin), get_user_model())
+
+
+@receiver(pre_delete, sender=Livestock)
+def remember_offspring(sender, instance, origin=None, **kwargs):
+    # Their parent links are cleared without signals before post_delete.
+    # A deleted owner's herd is handled once, by remember_herd_offspring.
+    if is_owner_deletion(origin):
+        return
+    instance._offspring_ids = list(Livestock.objects.filter(
+        Q(sire=instance) | Q(dam=instance)
+    ).values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Livestock)
+def remove_health_records(sender, instance, origin=None, **kwargs):
+    """
+    Accounts for the animal's cascading health records in bulk: one rollup
+    update now, while they still exist, and their tombstones after the
+    delete. health_records.signals skips them.
+    """
+    if is_owner_deletion(origin):
+        return
+    instance._health_record_ids = list(HealthRecord.objects.filter(livestock=instance).values_list('pk', flat=True))
+    if instance._health_record_ids:
+        HealthRecordDailyRollup.remove_livestock(instance.pk, instance.owner_id)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def remember_herd_offspring(sender, instance, **kwargs):
+    """
+    Other owners' animals bred from the deleted owner's herd, looked up in
+    one query instead of one per deleted animal.
+    """
+    herd = Livestock.objects.filter(owner=instance)
+    instance._offspring_ids = list(Livestock.objects.filter(
+        Q(sire__in=herd) | Q(dam__in=herd)
+    ).exclude(owner=instance).values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def update_herd_offspring(sender, instance, **kwargs):
+    if getattr(instance, '_offspring_ids', None):
+        update_inbreeding(instance._offspring_ids, max_descendants=settings.INBREEDING_INLINE_DESCENDANTS)
+
+
+@receiver(post_delete, sender=Livestock)
+def update_summary_on_delete(sender, instance, origin=None, **kwargs):
+    if not is_owner_deletion(origin):
+        # A deleted owner's summaries go with them; accounts.signals bumps
+        # their cache version once.
+        bump_cache_version(instance.owner_id)
+        LivestockSummary.adjust(instance.owner_id, instance.animal_type, instance.status, delta=-1)
+        HerdDailyChange.adjust(instance.owner_id, instance.animal_type, instance.status, delta=-1)
+        Tombstone.record(instance.owner_id, 'livestock', [instance.pk])
+        Tombstone.record(instance.owner_id, 'health_record', getattr(instance, '_health_record_ids', []))
+        publish_event(instance.owner_id, 'livestock.deleted', {'id': instance.pk, 'transferred': False})
+    if getattr(instance, '_offspring_ids', None):
+        update_inbreeding(instance._offspring_ids, max_descendants=settings.INBREEDING_INLINE_DESCENDANTS)
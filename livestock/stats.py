@@ -0,0 +1,40 @@
+from django.db.models import Q, Sum
+
+from .models import Livestock, LivestockSummary
+
+
+def get_summary_queryset(user):
+    summaries = LivestockSummary.objects.all()
+    if not user.is_admin:
+        summaries = summaries.filter(owner=user)
+    return summaries
+
+
+def get_stats_aggregates():
+    """
+    Conditional aggregates that reduce the summary rows to every stat in one query.
+    """
+    aggregates = {'total_livestock': Sum('count')}
+    for animal_type, _ in Livestock.ANIMAL_TYPES:
+        aggregates['type_' + animal_type] = Sum('count', filter=Q(animal_type=animal_type))
+    for status_value, _ in Livestock.STATUS_CHOICES:
+        aggregates['status_' + status_value] = Sum('count', filter=Q(status=status_value))
+    return aggregates
+
+
+def format_stats(totals):
+    by_type = {
+        animal_type: totals['type_' + animal_type]
+        for animal_type, _ in Livestock.ANIMAL_TYPES if totals['type_' + animal_type]
+    }
+    by_status = {
+        status_value: totals['status_' + status_value]
+        for status_value, _ in Livestock.STATUS_CHOICES if totals['status_' + status_value]
+    }
+    return {
+        'total_livestock': totals['total_livestock'] or 0,
+        'by_type': by_type,
+        'by_status': by_status,
+        'healthy_count': totals['status_healthy'] or 0,
+        'sick_count': totals['status_sick'] or 0,
+    }
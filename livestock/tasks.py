@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from jobs.registry import task
+from .bulk import LivestockBulkUpsert
+from .lineage import update_inbreeding
+from .models import LivestockSummary
+
+
+@task('livestock.bulk_upsert')
+def bulk_upsert(job, user_id, rows):
+    user = get_user_model().objects.get(pk=user_id)
+    total = len(rows)
+    return LivestockBulkUpsert(user).run(
+        rows, on_batch=lambda done: job.set_progress(done * 100 // total, f'{done} of {total} rows'),
+    )
+
+
+@task('livestock.rebuild_summary')
+def rebuild_summary(job, owner_ids=None):
+    with transaction.atomic():
+        LivestockSummary.rebuild(owner_ids=owner_ids)
+    return {'rows': LivestockSummary.objects.count()}
+
+
+@task('livestock.update_inbreeding')
+def recompute_inbreeding(job, livestock_ids):
+    with transaction.atomic():
+        changed = update_inbreeding(livestock_ids)
+    return {'changed': len(changed)}
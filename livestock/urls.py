@@ -1,9 +1,21 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('', views.LivestockListCreateView.as_view(), name='livestock-list-create'),
     path('<int:pk>/', views.LivestockDetailView.as_view(), name='livestock-detail'),
+    path('bulk/', views.LivestockBulkUpsertView.as_view(), name='livestock-bulk-upsert'),
+    path('export/<str:export_format>/', views.LivestockExportView.as_view(), name='livestock-export'),
+    path('weights/', views.WeightIngestView.as_view(), name='livestock-weight-ingest'),
+    path('<int:pk>/weights/', views.LivestockWeightHistoryView.as_view(), name='livestock-weight-history'),
+    path('<int:pk>/pedigree/', views.LivestockPedigreeView.as_view(), name='livestock-pedigree'),
+    path('<int:pk>/descendants/', views.LivestockDescendantsView.as_view(), name='livestock-descendants'),
+    path('growth/', views.LivestockGrowthView.as_view(), name='livestock-growth'),
+    path('growth/percentiles/', views.LivestockGrowthPercentilesView.as_view(), name='livestock-growth-percentiles'),
+    path('reports/herd/', views.HerdReportView.as_view(), name='livestock-herd-report'),
     path('stats/', views.livestock_stats, name='livestock-stats'),
+    path('async/', async_views.AsyncLivestockListView.as_view(), name='livestock-list-async'),
+    path('async/<int:pk>/', async_views.AsyncLivestockDetailView.as_view(), name='livestock-detail-async'),
+    path('async/stats/', async_views.AsyncLivestockStatsView.as_view(), name='livestock-stats-async'),
     path('health-check/', views.health_check, name='health-check'),
 ]
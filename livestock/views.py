@@ -1,23 +1,249 @@
-from rest_framework import generics, permissions, status
+from collections import Counter
+from itertools import islice
+from rest_framework import generics, permissions, serializers, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
-from django.db.models import Count
-from .models import Livestock
-from .serializers import LivestockSerializer, LivestockStatsSerializer
+from rest_framework.views import APIView
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.utils import timezone
+from .models import HerdDailyChange, Livestock, WeightMeasurement
+from .filters import LivestockFilterMixin
+from .bulk import LivestockBulkUpsert
+from .growth import get_growth_percentiles, get_herd_growth
+from .lineage import Pedigree, load_descendants
+from .stats import format_stats, get_stats_aggregates, get_summary_queryset
+from .serializers import (
+    LivestockSerializer, LivestockCompactSerializer, LivestockStatsSerializer,
+    WeightMeasurementSerializer, WeightReadingSerializer, GrowthQuerySerializer,
+    LineageQuerySerializer,
+)
+from jobs.queue import enqueue
+from jobs.views import job_accepted_response
+from livestock_management.cache import CachedListMixin, bump_cache_version, cache_response, serve_cached
+from livestock_management.events import publish_herd_changed
+from livestock_management.export import StreamingExportView
+from livestock_management.fastpath import FastListMixin
+from livestock_management.fieldsets import SparseFieldsetMixin
+from livestock_management.metrics import InstrumentedViewMixin
+from livestock_management.parsers import NDJSONParser, get_rows
+from livestock_management.optimization import OptimizedQuerysetMixin
+from livestock_management.pagination import KeysetPagination
+from livestock_management.reports import ReportView, period_starts, truncate
 
-class LivestockListCreateView(generics.ListCreateAPIView):
+class LivestockPagination(KeysetPagination):
+    key_field = 'created_at'
+
+class WeightMeasurementPagination(KeysetPagination):
+    key_field = 'measured_at'
+
+class LivestockListCreateView(InstrumentedViewMixin, SparseFieldsetMixin, CachedListMixin, FastListMixin,
+                              LivestockFilterMixin, OptimizedQuerysetMixin, generics.ListCreateAPIView):
+    cache_name = 'livestock-list'
+    serializer_class = LivestockSerializer
+    compact_serializer_class = LivestockCompactSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = LivestockPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return Livestock.objects.with_age()
+        return Livestock.objects.filter(owner=user).with_age()
+
+class LivestockDetailView(InstrumentedViewMixin, SparseFieldsetMixin, OptimizedQuerysetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = LivestockSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return Livestock.objects.with_age()
+        return Livestock.objects.filter(owner=user).with_age()
+
+class LivestockExportView(LivestockFilterMixin, StreamingExportView):
+    filename = 'livestock'
+    export_fields = (
+        'id', 'tag_number', 'animal_type', 'breed', 'gender', 'birth_date',
+        'weight', 'status', 'purchase_price', 'purchase_date', 'notes',
+        'owner_id', 'owner__username', 'created_at', 'updated_at',
+    )
+
     def get_queryset(self):
         user = self.request.user
         if user.is_admin:
             return Livestock.objects.all()
         return Livestock.objects.filter(owner=user)
 
-class LivestockDetailView(generics.RetrieveUpdateDestroyAPIView):
-    serializer_class = LivestockSerializer
+class LivestockBulkUpsertView(APIView):
+    """
+    Creates or updates many animals at once, keyed on tag_number.
+
+    Accepts a JSON array or an NDJSON stream of livestock payloads; see
+    LivestockBulkUpsert for how rows are written. With ?background=true the
+    rows are handed to the job queue and the response is 202 with the job.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser, NDJSONParser]
+    batch_size = 1000
+
+    def post(self, request):
+        rows = get_rows(request.data, 'livestock objects')
+
+        if request.query_params.get('background') in ('1', 'true'):
+            # Queued rows are stored in the job's payload.
+            limit = settings.BULK_JOB_MAX_ROWS
+            rows = list(islice(rows, limit + 1))
+            if len(rows) > limit:
+                raise ParseError(f'At most {limit} rows can be queued at once; split the upload')
+            job = enqueue('livestock.bulk_upsert', {'user_id': request.user.pk, 'rows': rows}, user=request.user)
+            return job_accepted_response(request, job)
+        return Response(LivestockBulkUpsert(request.user, self.batch_size).run(rows))
+
+class WeightIngestView(APIView):
+    """
+    Appends scale readings in bulk and moves each animal's current weight to
+    its latest reading.
+
+    Accepts a JSON array or an NDJSON stream of readings identifying the
+    animal by livestock id or tag_number. Readings are validated and inserted
+    in batches of batch_size; unknown animals and invalid rows are skipped and
+    reported by their position in the payload.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser, NDJSONParser]
+    batch_size = 1000
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return Livestock.objects.all()
+        return Livestock.objects.filter(owner=user)
+
+    def post(self, request):
+        rows = get_rows(request.data, 'weight readings')
+
+        result = {'created': 0, 'errors': []}
+        livestock_ids, owner_ids = set(), set()
+        rows = enumerate(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.ingest_batch(request, batch, livestock_ids, owner_ids, result)
+
+        if livestock_ids:
+            WeightMeasurement.sync_current_weight(livestock_ids)
+            bump_cache_version(*owner_ids)
+            publish_herd_changed(owner_ids, 'weights', len(livestock_ids))
+        return Response(result)
+
+    def ingest_batch(self, request, batch, livestock_ids, owner_ids, result):
+        valid = []
+        for index, row in batch:
+            serializer = WeightReadingSerializer(data=row)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                result['errors'].append({'row': index, 'errors': serializer.errors})
+
+        herd = self.get_queryset().filter(
+            Q(pk__in=[data['livestock'] for _, data in valid if 'livestock' in data])
+            | Q(tag_number__in=[data['tag_number'] for _, data in valid if 'tag_number' in data])
+        ).values_list('pk', 'tag_number', 'owner_id')
+        by_id, by_tag = {}, {}
+        for pk, tag_number, owner_id in herd:
+            by_id[pk] = by_tag[tag_number] = (pk, owner_id)
+
+        measured_at = timezone.now()
+        objects = []
+        for index, data in valid:
+            match = by_id.get(data['livestock']) if 'livestock' in data else by_tag.get(data['tag_number'])
+            if match is None or ('tag_number' in data and by_tag.get(data['tag_number']) != match):
+                result['errors'].append({'row': index, 'errors': {'livestock': ['Livestock not found.']}})
+                continue
+            livestock_ids.add(match[0])
+            owner_ids.add(match[1])
+            objects.append(WeightMeasurement(
+                livestock_id=match[0],
+                weight=data['weight'],
+                measured_at=data.get('measured_at', measured_at),
+                source='scale',
+                scale_id=data.get('scale_id', ''),
+            ))
+
+        WeightMeasurement.objects.bulk_create(objects)
+        result['created'] += len(objects)
+
+class LivestockWeightHistoryView(InstrumentedViewMixin, generics.ListAPIView):
+    serializer_class = WeightMeasurementSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = WeightMeasurementPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        livestock = Livestock.objects.filter(pk=self.kwargs['pk'])
+        if not user.is_admin:
+            livestock = livestock.filter(owner=user)
+        if not livestock.exists():
+            raise NotFound()
+        return WeightMeasurement.objects.filter(livestock_id=self.kwargs['pk'])
+
+class LivestockGrowthView(LivestockFilterMixin, generics.GenericAPIView):
+    """
+    Average daily gain per animal with outlier flags, computed from the
+    weight history of the whole (filtered) herd at once.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    cache_name = 'livestock-growth'
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return Livestock.objects.all()
+        return Livestock.objects.filter(owner=user)
+
+    def get(self, request):
+        return serve_cached(request, self.cache_name, self.analyse)
+
+    def get_options(self):
+        params = GrowthQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data
+
+    def analyse(self):
+        options = self.get_options()
+        results = get_herd_growth(
+            self.filter_queryset(self.get_queryset()),
+            options['group_by'], options.get('since'), options.get('until'),
+        )
+        if options['outliers']:
+            results = [row for row in results if row['is_outlier']]
+        return Response({'group_by': options['group_by'], 'results': results})
+
+class LivestockGrowthPercentilesView(LivestockGrowthView):
+    """
+    Distribution of average daily gain per breed or animal type.
+    """
+    cache_name = 'livestock-growth-percentiles'
+
+    def analyse(self):
+        options = self.get_options()
+        results = get_growth_percentiles(
+            self.filter_queryset(self.get_queryset()),
+            options['group_by'], options.get('since'), options.get('until'),
+        )
+        return Response({'group_by': options['group_by'], 'results': results})
+
+class LineageView(generics.GenericAPIView):
+    """
+    Base for the pedigree views. Relatives outside the user's herds, e.g.
+    ancestors that were sold, are listed by id only.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    detail_fields = ('tag_number', 'animal_type', 'breed', 'gender', 'birth_date', 'status')
 
     def get_queryset(self):
         user = self.request.user
@@ -25,31 +251,118 @@ class LivestockDetailView(generics.RetrieveUpdateDestroyAPIView):
             return Livestock.objects.all()
         return Livestock.objects.filter(owner=user)
 
+    def get(self, request, pk):
+        return serve_cached(request, self.cache_name, self.render)
+
+    def get_options(self):
+        params = LineageQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data
+
+    def get_details(self, livestock_ids):
+        user = self.request.user
+        rows = Livestock.objects.filter(pk__in=livestock_ids).values('id', 'owner_id', *self.detail_fields)
+        return {
+            row['id']: {field: row[field] for field in self.detail_fields}
+            for row in rows if user.is_admin or row['owner_id'] == user.pk
+        }
+
+class LivestockPedigreeView(LineageView):
+    """
+    Ancestors of an animal up to ?generations= back, nearest first, with
+    each one's parents and inbreeding coefficient.
+    """
+    cache_name = 'livestock-pedigree'
+
+    def render(self):
+        options = self.get_options()
+        animal = self.get_object()
+        pedigree = Pedigree.load([animal.pk], options['generations'])
+        details = self.get_details(pedigree.parents)
+        ancestors = sorted((pk for pk in pedigree.parents if pk != animal.pk), key=lambda pk: (pedigree.generation[pk], pk))
+        return Response({
+            'id': animal.pk,
+            'sire': animal.sire_id,
+            'dam': animal.dam_id,
+            'inbreeding_coefficient': animal.inbreeding_coefficient,
+            'generations': options['generations'],
+            'ancestors': [{
+                'id': pk, **details.get(pk, {}),
+                'sire': pedigree.parents[pk][0], 'dam': pedigree.parents[pk][1],
+                'generation': pedigree.generation[pk],
+                'inbreeding_coefficient': pedigree.inbreeding[pk],
+            } for pk in ancestors],
+        })
+
+class LivestockDescendantsView(LineageView):
+    """
+    Offspring of an animal down to ?generations=, nearest first, at most
+    ?limit= of them.
+    """
+    cache_name = 'livestock-descendants'
+
+    def render(self):
+        options = self.get_options()
+        animal = self.get_object()
+        rows = load_descendants([animal.pk], options['generations'], options['limit'] + 1)
+        has_more = len(rows) > options['limit']
+        rows = rows[:options['limit']]
+        details = self.get_details([pk for pk, _ in rows])
+        return Response({
+            'id': animal.pk,
+            'generations': options['generations'],
+            'has_more': has_more,
+            'descendants': [{'id': pk, **details.get(pk, {}), 'generation': generation} for pk, generation in rows],
+        })
+
+class HerdReportView(ReportView):
+    """
+    Head count by status and animal type at the end of each day, week,
+    month or year, from the running sum of the daily herd changes.
+    """
+    model = HerdDailyChange
+    cache_name = 'livestock-herd-report'
+    filter_params = {
+        'animal_type': ('animal_type__in', serializers.ChoiceField(choices=Livestock.ANIMAL_TYPES)),
+        'status': ('status__in', serializers.ChoiceField(choices=Livestock.STATUS_CHOICES)),
+    }
+
+    def report(self, changes, period, since, until):
+        herd = Counter({
+            (animal_type, status_value): total
+            for animal_type, status_value, total in changes.filter(date__lt=since).values_list(
+                'animal_type', 'status',
+            ).annotate(total=Sum('delta')).order_by()
+        })
+        rows = changes.filter(date__gte=since, date__lte=until).values_list(
+            truncate('date', period), 'animal_type', 'status',
+        ).annotate(total=Sum('delta')).order_by()
+        changes_by_period = {}
+        for start, animal_type, status_value, total in rows:
+            changes_by_period.setdefault(start, []).append(((animal_type, status_value), total))
+
+        results = []
+        for start in period_starts(since, until, period):
+            for key, total in changes_by_period.get(start, ()):
+                herd[key] += total
+            by_type, by_status = Counter(), Counter()
+            for (animal_type, status_value), count in herd.items():
+                by_type[animal_type] += count
+                by_status[status_value] += count
+            results.append({
+                'period': start,
+                'total_livestock': sum(by_type.values()),
+                'by_type': {key: count for key, count in sorted(by_type.items()) if count},
+                'by_status': {key: count for key, count in sorted(by_status.items()) if count},
+            })
+        return results
+
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
+@cache_response('livestock-stats')
 def livestock_stats(request):
-    user = request.user
-    
-    if user.is_admin:
-        queryset = Livestock.objects.all()
-    else:
-        queryset = Livestock.objects.filter(owner=user)
-    
-    total_livestock = queryset.count()
-    
-    by_type = dict(queryset.values_list('animal_type').annotate(count=Count('animal_type')))
-    by_status = dict(queryset.values_list('status').annotate(count=Count('status')))
-    
-    healthy_count = queryset.filter(status='healthy').count()
-    sick_count = queryset.filter(status='sick').count()
-    
-    stats = {
-        'total_livestock': total_livestock,
-        'by_type': by_type,
-        'by_status': by_status,
-        'healthy_count': healthy_count,
-        'sick_count': sick_count,
-    }
+    totals = get_summary_queryset(request.user).aggregate(**get_stats_aggregates())
+    stats = format_stats(totals)
     
     serializer = LivestockStatsSerializer(stats)
     return Response(serializer.data)
@@ -0,0 +1,110 @@
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.views import exception_handler
+
+from accounts.authentication import CachedJWTAuthentication
+from .fastpath import get_row_plan
+from .fieldsets import get_fieldset_serializer_class
+from .metrics import timed_serializer_class
+from .optimization import get_required_fields, optimize_queryset
+from .renderers import FastJSONRenderer
+
+
+class AsyncAPIView(View):
+    """
+    Read-only JSON view served natively under ASGI.
+
+    DRF views are synchronous, so this authenticates the JWT itself, runs
+    the same filter backends, pagination and serializers as the DRF views
+    and queries through the async ORM (acount(), aget(), async iteration).
+    Serializers only run on rows whose relations were select_related() by
+    optimize_queryset(), so they never touch the database.
+    """
+    http_method_names = ['get', 'head']
+    authentication_class = CachedJWTAuthentication
+    renderer_class = FastJSONRenderer
+    queryset = None
+    serializer_class = None
+    compact_serializer_class = None
+    filter_backends = ()
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request)
+        headers = {}
+        try:
+            if request.method not in ('GET', 'HEAD'):
+                raise exceptions.MethodNotAllowed(request.method)
+            authentication = self.authentication_class()
+            authenticated = await authentication.aauthenticate(request)
+            if authenticated is None:
+                raise exceptions.NotAuthenticated()
+            self.request.user, self.request.auth = authenticated
+            data = await self.get(self.request, *args, **kwargs)
+            status_code = status.HTTP_200_OK
+        except exceptions.APIException as exc:
+            response = exception_handler(exc, {'view': self, 'request': self.request})
+            data, status_code = response.data, response.status_code
+            if status_code == status.HTTP_401_UNAUTHORIZED:
+                headers['WWW-Authenticate'] = authentication.authenticate_header(request)
+        return HttpResponse(
+            self.renderer_class().render(data),
+            content_type='application/json',
+            status=status_code,
+            headers=headers,
+        )
+
+    def get_queryset(self):
+        """
+        A fresh copy of queryset, as GenericAPIView does; override to scope
+        it to the user.
+        """
+        assert self.queryset is not None, (
+            f"'{self.__class__.__name__}' should either include a `queryset` attribute, "
+            "or override the `get_queryset()` method."
+        )
+        return self.queryset.all()
+
+    def filter_queryset(self, queryset):
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def get_serializer_class(self):
+        return timed_serializer_class(
+            get_fieldset_serializer_class(self.request, self.serializer_class, self.compact_serializer_class)
+        )
+
+    def get_optimized_queryset(self):
+        return optimize_queryset(
+            self.filter_queryset(self.get_queryset()), self.get_serializer_class(),
+            get_required_fields(getattr(self, 'pagination_class', None)),
+        )
+
+
+class AsyncListView(AsyncAPIView):
+    pagination_class = None
+
+    async def get(self, request):
+        queryset = self.get_optimized_queryset()
+        paginator = self.pagination_class()
+        plan = get_row_plan(self.get_serializer_class(), queryset)
+        if plan is None:
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+            data = self.get_serializer_class()(page, many=True, context={'request': request}).data
+        else:
+            rows = plan.get_rows(queryset, get_required_fields(self.pagination_class))
+            page = await paginator.apaginate_queryset(rows, request, view=self)
+            data = plan.serialize(page)
+        return paginator.get_paginated_response(data).data
+
+
+class AsyncDetailView(AsyncAPIView):
+    async def get(self, request, pk):
+        queryset = optimize_queryset(self.get_queryset(), self.get_serializer_class())
+        try:
+            instance = await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            raise exceptions.NotFound()
+        return self.get_serializer_class()(instance, context={'request': request}).data
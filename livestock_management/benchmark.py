@@ -0,0 +1,203 @@
+"""
+In-process API benchmarks.
+
+Scenarios are driven through the full Django stack (middleware, DRF,
+serializers, database) with the test client, so no server is needed and
+results are comparable between commits on the same machine and data set.
+Each scenario reports latency percentiles, SQL queries per request and
+throughput. With cold_cache the response cache is cleared before every
+measured request, so cached list endpoints are timed end to end.
+run_suite() returns a JSON-serialisable result and compare_results()
+diffs two of them.
+"""
+import json
+import platform
+import statistics
+import time
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from .percentiles import percentile
+
+
+class Scenario:
+    """
+    One endpoint exercised repeatedly. Requests cycle through paths so list
+    endpoints are measured on more than a single cached page.
+    """
+    def __init__(self, name, paths, method='get', data=None, authenticated=True):
+        self.name = name
+        self.paths = paths
+        self.method = method
+        self.data = data
+        self.authenticated = authenticated
+
+
+def default_scenarios(username, password):
+    return [
+        Scenario('login', ['/api/auth/login/'], method='post',
+                 data={'username': username, 'password': password}, authenticated=False),
+        Scenario('livestock-list', [f'/api/livestock/?page={page}' for page in range(1, 6)]),
+        Scenario('livestock-list-filtered', [
+            '/api/livestock/?animal_type=cattle', '/api/livestock/?status=sick',
+            '/api/livestock/?ordering=-weight', '/api/livestock/?search=angus',
+        ]),
+        Scenario('livestock-stats', ['/api/livestock/stats/']),
+        Scenario('health-records-list', [f'/api/health/records/?page={page}' for page in range(1, 6)]),
+        Scenario('health-records-stats', ['/api/health/records/stats/']),
+    ]
+
+
+def _milliseconds(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+def get_host():
+    for host in settings.ALLOWED_HOSTS:
+        if host and '*' not in host and not host.startswith('.'):
+            return host
+    return 'testserver' if settings.ALLOWED_HOSTS else 'localhost'
+
+
+class BenchmarkRunner:
+    def __init__(self, username, password, iterations=200, warmup=20, cold_cache=False):
+        self.username = username
+        self.password = password
+        self.iterations = iterations
+        self.warmup = warmup
+        self.cold_cache = cold_cache
+        self.client = Client(HTTP_HOST=get_host())
+        self.queries = 0
+
+    def count_query(self, execute, sql, params, many, context):
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def login(self):
+        response = self.client.post('/api/auth/login/', {'username': self.username, 'password': self.password},
+                                    content_type='application/json')
+        if response.status_code != 200:
+            raise RuntimeError(f'Login as {self.username!r} failed ({response.status_code}): {response.content[:200]!r}')
+        return response.json()['access']
+
+    def request(self, scenario, number, headers):
+        path = scenario.paths[number % len(scenario.paths)]
+        send = getattr(self.client, scenario.method)
+        if scenario.data is not None:
+            return send(path, json.dumps(scenario.data), content_type='application/json', headers=headers)
+        return send(path, headers=headers)
+
+    def run_scenario(self, scenario, token):
+        headers = {'Authorization': f'Bearer {token}'} if scenario.authenticated else {}
+        for number in range(self.warmup):
+            self.request(scenario, number, headers)
+
+        latencies, queries, sizes, errors = [], [], [], []
+        elapsed = 0.0
+        with connection.execute_wrapper(self.count_query):
+            for number in range(self.iterations):
+                if self.cold_cache:
+                    cache.clear()
+                self.queries = 0
+                request_started = time.perf_counter()
+                response = self.request(scenario, number, headers)
+                latency = time.perf_counter() - request_started
+                elapsed += latency
+                latencies.append(latency)
+                queries.append(self.queries)
+                sizes.append(len(response.content))
+                if response.status_code >= 400:
+                    errors.append(response.status_code)
+
+        latencies.sort()
+        return {
+            'paths': scenario.paths,
+            'method': scenario.method.upper(),
+            'requests': len(latencies),
+            'errors': len(errors),
+            'error_samples': errors[:10],
+            'elapsed_s': round(elapsed, 3),
+            'requests_per_s': round(len(latencies) / elapsed, 1) if elapsed else None,
+            'latency_ms': {
+                'mean': _milliseconds(statistics.fmean(latencies)) if latencies else None,
+                'p50': _milliseconds(percentile(latencies, 0.50)),
+                'p95': _milliseconds(percentile(latencies, 0.95)),
+                'p99': _milliseconds(percentile(latencies, 0.99)),
+                'max': _milliseconds(latencies[-1]) if latencies else None,
+            },
+            'queries_per_request': {
+                'mean': round(statistics.fmean(queries), 2) if queries else None,
+                'max': max(queries, default=None),
+            },
+            'response_bytes_mean': round(statistics.fmean(sizes)) if sizes else None,
+        }
+
+    def run(self, scenarios):
+        from accounts.throttles import login_throttles_disabled
+
+        with login_throttles_disabled():
+            token = self.login()
+            return {scenario.name: self.run_scenario(scenario, token) for scenario in scenarios}
+
+
+def get_environment():
+    from accounts.models import User
+    from health_records.models import HealthRecord
+    from livestock.models import Livestock
+
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'database_version': getattr(connection, 'pg_version', None),
+        'rows': {
+            'users': User.objects.count(),
+            'livestock': Livestock.objects.count(),
+            'health_records': HealthRecord.objects.count(),
+        },
+    }
+
+
+def run_suite(username, password, iterations=200, warmup=20, cold_cache=False, only=None, label=None):
+    scenarios = default_scenarios(username, password)
+    if only:
+        scenarios = [scenario for scenario in scenarios if scenario.name in only]
+    runner = BenchmarkRunner(username, password, iterations=iterations, warmup=warmup, cold_cache=cold_cache)
+    return {
+        'label': label,
+        'started_at': timezone.now().isoformat(),
+        'iterations': iterations,
+        'warmup': warmup,
+        'cold_cache': cold_cache,
+        'user': username,
+        'environment': get_environment(),
+        'scenarios': runner.run(scenarios),
+    }
+
+
+def compare_results(baseline, current, metric='p95'):
+    """
+    Returns one row per scenario present in both results with the change in
+    the given latency metric and in queries per request. A positive change
+    means slower.
+    """
+    rows = []
+    for name, result in current['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if previous is None:
+            continue
+        before, after = previous['latency_ms'][metric], result['latency_ms'][metric]
+        rows.append({
+            'scenario': name,
+            'before_ms': before,
+            'after_ms': after,
+            'change_pct': round((after - before) / before * 100, 1) if before else None,
+            'queries_before': previous['queries_per_request']['mean'],
+            'queries_after': result['queries_per_request']['mean'],
+        })
+    return rows
@@ -0,0 +1,109 @@
+import hashlib
+import uuid
+from datetime import date
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'response-version:%s'
+ALL_OWNERS = 'all'
+
+
+def get_version_key(user):
+    """
+    Key of the response version for what the user can see: their own herd,
+    or every herd for admins.
+    """
+    return VERSION_KEY % (ALL_OWNERS if user.is_admin else user.pk)
+
+
+def get_cache_version(user):
+    """
+    Current response version for the user. Versions are random tokens rather
+    than counters so an evicted version can never collide with an older
+    cached response.
+    """
+    key = get_version_key(user)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(*owner_ids):
+    """
+    Invalidates cached responses for the given owners and for admins.
+    """
+    scopes = {ALL_OWNERS} | {owner_id for owner_id in owner_ids if owner_id is not None}
+    cache.set_many({VERSION_KEY % scope: uuid.uuid4().hex for scope in scopes}, None)
+
+
+def serve_cached(request, name, render, timeout=None):
+    """
+    Returns the cached data for this user and URL or renders and stores it.
+
+    The version and the stored (version, data) pair are read in one
+    get_many, and the data is only used while the versions match. The ETag
+    is derived from the version, so a matching If-None-Match is answered
+    with 304 without a query. Today's date is part of the key because
+    responses include ages.
+    """
+    user = request.user
+    url = request.build_absolute_uri()
+    digest = hashlib.md5(f'{url}:{date.today().isoformat()}'.encode()).hexdigest()
+    key = f'response:{name}:{user.pk}:{digest}'
+    version_key = get_version_key(user)
+    cached = cache.get_many([version_key, key])
+    version = cached.get(version_key) or get_cache_version(user)
+    etag = '"%s"' % hashlib.md5(f'{key}:{version}'.encode()).hexdigest()
+
+    if etag in request.headers.get('If-None-Match', ''):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        entry = cached.get(key)
+        if entry is None or entry[0] != version:
+            response = render()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            if timeout is None:
+                timeout = settings.RESPONSE_CACHE_TIMEOUT
+            cache.set(key, (version, response.data), timeout)
+        else:
+            response = Response(entry[1])
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def cache_response(name, timeout=None):
+    """
+    Caches a function-based GET view per user; apply below @api_view.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            return serve_cached(request, name, lambda: view(request, *args, **kwargs), timeout)
+        return wrapper
+    return decorator
+
+
+class CachedListMixin:
+    """
+    Caches a generic view's list responses per user under cache_name.
+    """
+    cache_name = None
+    cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        return serve_cached(
+            request, self.cache_name,
+            lambda: super(CachedListMixin, self).list(request, *args, **kwargs),
+            self.cache_timeout,
+        )
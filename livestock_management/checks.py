@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+from django.utils.module_loading import import_string
+
+
+@register()
+def check_event_backend(app_configs, **kwargs):
+    """LocalBackend only reaches streams served by the publishing process."""
+    from .events import LocalBackend
+
+    if settings.WEB_CONCURRENCY <= 1 or not issubclass(import_string(settings.EVENT_BACKEND), LocalBackend):
+        return []
+    return [Warning(
+        f'Live events use LocalBackend with WEB_CONCURRENCY={settings.WEB_CONCURRENCY}; '
+        'changes reach only the streams of the process that made them, and '
+        'changes made by the job worker reach none.',
+        hint='Set REDIS_URL (needs the redis package) to relay events between processes.',
+        id='livestock_management.W001',
+    )]
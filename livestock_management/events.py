@@ -0,0 +1,295 @@
+"""
+Live herd change events.
+
+Model signals publish small events per owner once their transaction
+commits, and /api/events/ pushes them to the owner's open connections as
+server-sent events (admins receive every owner's), so dashboards no longer
+need to poll the list and stats endpoints.
+
+Inside a process, EventBroker fans events out to the connected streams.
+EVENT_BACKEND carries them between processes: LocalBackend only delivers
+in-process, which is enough for a single server and for development;
+RedisBackend (REDIS_URL, needs the redis package) relays them through
+Redis pub/sub so every worker sees every change. Events are encoded once,
+as the text/event-stream frame each connection writes.
+
+Under WSGI a stream would hold a worker thread for its whole life, so there
+/api/events/ answers at once instead, and EventSource polls it.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.authentication import CachedJWTAuthentication, StreamTicketAuthentication
+from .cache import get_cache_version
+from .renderers import EventStreamRenderer, FastJSONRenderer
+
+logger = logging.getLogger('livestock_management.events')
+
+# Subscribers under this key receive every owner's events.
+ALL_OWNERS = None
+RETRY_MILLISECONDS = 3000
+HEARTBEAT = ': keepalive\n\n'
+
+
+def format_event(event_type, data):
+    return f'event: {event_type}\ndata: {json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))}\n\n'
+
+
+class Subscription(ABC):
+    """
+    Bounded buffer of event frames for one connection. put() may be called
+    from any thread; a subscriber that falls behind is marked overflowed and
+    told to resync.
+    """
+    def __init__(self, owner_id, max_size=None):
+        self.owner_id = owner_id
+        self.max_size = max_size or settings.EVENT_QUEUE_SIZE
+        self.overflowed = False
+
+    @abstractmethod
+    def put(self, frame):
+        """
+        Queues frame without blocking, or marks the subscription overflowed.
+        """
+
+
+class AsyncSubscription(Subscription):
+    """
+    Subscription read from an event loop; must be created on that loop.
+    """
+    def __init__(self, owner_id, max_size=None):
+        super().__init__(owner_id, max_size)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.max_size)
+
+    def put(self, frame):
+        try:
+            self.loop.call_soon_threadsafe(self._put, frame)
+        except RuntimeError:
+            # The loop has shut down; the stream is gone.
+            pass
+
+    def _put(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """
+    In-process pub/sub between the backend and the open streams.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = {}
+
+    def subscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.setdefault(subscription.owner_id, set()).add(subscription)
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.owner_id, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self.subscriptions.pop(subscription.owner_id, None)
+
+    def deliver(self, owner_id, frame):
+        with self.lock:
+            targets = [*self.subscriptions.get(owner_id, ()), *self.subscriptions.get(ALL_OWNERS, ())]
+        for subscription in targets:
+            subscription.put(frame)
+
+
+broker = EventBroker()
+
+
+class LocalBackend:
+    """
+    Delivers events to streams in the publishing process only.
+    """
+    def __init__(self, broker):
+        self.broker = broker
+
+    def publish(self, owner_id, frame):
+        self.broker.deliver(owner_id, frame)
+
+    def start(self):
+        pass
+
+
+class RedisBackend:
+    """
+    Publishes events to a Redis channel per owner. Each process that serves
+    streams runs one listener thread, started with its first stream, which
+    hands every event to the local broker; events published while it
+    reconnects are lost, and clients resync on reconnect.
+    """
+    channel_prefix = 'livestock-events:'
+    reconnect_delay = 1
+
+    def __init__(self, broker):
+        import redis
+
+        self.broker = broker
+        self.client = redis.Redis.from_url(settings.REDIS_URL)
+        self.lock = threading.Lock()
+        self.listener = None
+
+    def publish(self, owner_id, frame):
+        self.client.publish(f'{self.channel_prefix}{owner_id}', frame)
+
+    def start(self):
+        with self.lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(target=self.listen, name='event-listener', daemon=True)
+                self.listener.start()
+
+    def listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f'{self.channel_prefix}*')
+                for message in pubsub.listen():
+                    owner_id = int(message['channel'][len(self.channel_prefix):])
+                    self.broker.deliver(owner_id, message['data'].decode())
+            except Exception:
+                logger.exception('Event listener lost its Redis connection; reconnecting')
+                time.sleep(self.reconnect_delay)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = import_string(settings.EVENT_BACKEND)(broker)
+    return _backend
+
+
+def _publish(owner_id, frame):
+    try:
+        get_backend().publish(owner_id, frame)
+    except Exception:
+        logger.exception('Could not publish event for owner %s', owner_id)
+
+
+def publish_event(owner_id, event_type, data):
+    """
+    Publishes an event to the owner's streams once the current transaction
+    commits. Publishing never fails the write that triggered it.
+    """
+    if owner_id is None:
+        return
+    frame = format_event(event_type, data)
+    transaction.on_commit(lambda: _publish(owner_id, frame))
+
+
+def publish_herd_changed(owner_ids, source, count):
+    """
+    One event per owner for bulk writes, which skip the per-row signals;
+    clients refetch what they show.
+    """
+    for owner_id in set(owner_ids):
+        publish_event(owner_id, 'herd.changed', {'source': source, 'count': count})
+
+
+class EventTicketView(APIView):
+    """
+    Issues a ticket for /api/events/?ticket=, so that EventSource clients
+    never put their access token in a URL.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return Response({
+            'ticket': StreamTicketAuthentication.issue_ticket(request.user),
+            'expires_in': settings.EVENT_TICKET_SECONDS,
+        })
+
+
+class EventStreamView(APIView):
+    """
+    text/event-stream of the user's herd changes. EventSource cannot set
+    headers, so it passes a ticket from EventTicketView as ?ticket=.
+
+    Under ASGI each connection is a coroutine that streams events until
+    EVENT_STREAM_MAX_SECONDS, which also bounds streams whose client left
+    unnoticed; EventSource reconnects on its own. A 'resync' event means
+    events were dropped for a slow client, which should refetch its data.
+
+    Under WSGI, poll() answers at once rather than holding a worker thread.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    authentication_classes = [CachedJWTAuthentication, StreamTicketAuthentication]
+    renderer_classes = [EventStreamRenderer, FastJSONRenderer]
+
+    def get(self, request):
+        if not isinstance(request._request, ASGIRequest):
+            return self.poll(request)
+        owner_id = ALL_OWNERS if request.user.is_admin else request.user.pk
+        get_backend().start()
+        response = StreamingHttpResponse(self.stream_async(owner_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stops nginx from buffering the stream.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def poll(self, request):
+        """
+        Sends the user's response cache version as the event id and asks
+        EventSource to reconnect after EVENT_POLL_SECONDS. The version
+        changes with every write to the herd, so when it differs from the
+        Last-Event-ID sent on reconnect, a 'resync' event tells the client
+        to refetch.
+        """
+        version = get_cache_version(request.user)
+        frame = f'retry: {settings.EVENT_POLL_SECONDS * 1000}\nid: {version}\n'
+        last_event_id = request.headers.get('Last-Event-ID')
+        if last_event_id and last_event_id != version:
+            frame += format_event('resync', {})
+        else:
+            frame += '\n'
+        response = HttpResponse(frame, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    async def stream_async(self, owner_id):
+        subscription = AsyncSubscription(owner_id)
+        broker.subscribe(subscription)
+        try:
+            yield f'retry: {RETRY_MILLISECONDS}\n\n'
+            deadline = time.monotonic() + settings.EVENT_STREAM_MAX_SECONDS
+            while (remaining := deadline - time.monotonic()) > 0:
+                frame = await subscription.get(min(remaining, settings.EVENT_STREAM_HEARTBEAT))
+                if subscription.overflowed:
+                    yield format_event('resync', {})
+                    return
+                yield frame or HEARTBEAT
+        finally:
+            broker.unsubscribe(subscription)
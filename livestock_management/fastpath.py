@@ -0,0 +1,265 @@
+"""
+Fast read path for list endpoints.
+
+Instead of loading model instances and running DRF field by field,
+get_row_plan() compiles a serializer into a single function that builds
+each output dict straight from a values_list() row, with one precompiled
+converter per field. Nested serializers on required foreign keys are
+flattened into joins. The converters reproduce the DRF fields they stand in
+for, so the rendered bytes are identical; serializers the plan cannot
+reproduce (many=True nesting, method fields, custom to_representation or
+get_attribute, nullable relations in a source path) return no plan and the
+view serializes normally. Covered by livestock_management.tests.test_fastpath.
+"""
+import datetime
+import decimal
+from functools import lru_cache
+from itertools import count
+from time import perf_counter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from rest_framework import fields, relations, serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .metrics import add_timing
+from .optimization import get_required_fields
+
+
+class Ineligible(Exception):
+    pass
+
+
+def _decimal_converter(field):
+    if not getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING) or field.localize:
+        return field.to_representation
+    if field.decimal_places is None:
+        return lambda value: '{:f}'.format(value) if isinstance(value, decimal.Decimal) else field.to_representation(value)
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            return field.to_representation(value)
+        return '{:f}'.format(value.quantize(exponent, rounding=rounding, context=context))
+    return convert
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not isinstance(value, datetime.datetime) or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        if type(value) is not datetime.date:
+            return field.to_representation(value)
+        return value.isoformat()
+    return convert
+
+
+def _choice_converter(field):
+    choices = field.choice_strings_to_values
+
+    def convert(value):
+        if value == '':
+            return value
+        return choices.get(str(value), value)
+    return convert
+
+
+# Converters keyed by the to_representation() a field class ends up using;
+# None means the value is passed through unchanged.
+CONVERTERS = {
+    fields.ReadOnlyField.to_representation: lambda field: None,
+    fields.CharField.to_representation: lambda field: str,
+    fields.IntegerField.to_representation: lambda field: int,
+    fields.FloatField.to_representation: lambda field: float,
+    fields.DecimalField.to_representation: _decimal_converter,
+    fields.DateTimeField.to_representation: _datetime_converter,
+    fields.DateField.to_representation: _date_converter,
+    fields.ChoiceField.to_representation: _choice_converter,
+}
+
+
+def get_converter(field):
+    factory = CONVERTERS.get(type(field).to_representation)
+    if factory is not None:
+        return factory(field)
+    return field.to_representation
+
+
+def _unwrap(serializer_class):
+    # Instrumented subclasses (see metrics.timed_serializer_class) point at the serializer they time.
+    return vars(serializer_class).get('__wrapped__', serializer_class)
+
+
+def _forward_relation(model, attr, allow_null=False):
+    # Joins need a required key; a nullable key can still be read as its id column.
+    model_field = model._meta.get_field(attr)
+    if not (model_field.many_to_one or model_field.one_to_one) or not model_field.concrete:
+        raise Ineligible(f'{model.__name__}.{attr} is not a foreign key')
+    if model_field.null and not allow_null:
+        raise Ineligible(f'{model.__name__}.{attr} is not a required foreign key')
+    return model_field
+
+
+class RowPlan:
+    """
+    A compiled serializer: columns to select, expressions to annotate them
+    from and the function turning one row into the serializer's output.
+    """
+    def __init__(self, columns, expressions, build_row):
+        self.columns = columns
+        self.expressions = expressions
+        self.build_row = build_row
+
+    def get_rows(self, queryset, extra_columns=()):
+        if self.expressions:
+            queryset = queryset.annotate(**{alias: make() for alias, make in self.expressions.items()})
+        columns = list(self.columns)
+        columns.extend(column for column in ('pk', *extra_columns) if column not in columns)
+        return queryset.values_list(*columns, named=True)
+
+    def serialize(self, rows):
+        build_row = self.build_row
+        start = perf_counter()
+        data = [build_row(row) for row in rows]
+        add_timing('serializer', perf_counter() - start)
+        return data
+
+
+class PlanCompiler:
+    def __init__(self, annotations):
+        self.annotations = annotations
+        self.columns = {}
+        self.expressions = {}
+        self.namespace = {}
+        self.names = count()
+
+    def column(self, path):
+        if path not in self.columns:
+            self.columns[path] = len(self.columns)
+        return f'r[{self.columns[path]}]'
+
+    def constant(self, value):
+        name = f'c{next(self.names)}'
+        self.namespace[name] = value
+        return name
+
+    def compile_serializer(self, serializer, model, prefix):
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            raise Ineligible(f'{type(serializer).__name__} overrides to_representation()')
+        meta = getattr(serializer, 'Meta', None)
+        field_expressions = getattr(meta, 'field_expressions', {})
+        items = [
+            f'{field.field_name!r}: {self.compile_field(field, model, prefix, field_expressions)}'
+            for field in serializer._readable_fields
+        ]
+        return '{' + ', '.join(items) + '}'
+
+    def compile_field(self, field, model, prefix, field_expressions):
+        if isinstance(field, (serializers.ListSerializer, relations.ManyRelatedField)) or field.source == '*':
+            raise Ineligible(f'{field.field_name} is not a single value')
+
+        path, current = prefix, model
+        for attr in field.source_attrs[:-1]:
+            current = _forward_relation(current, attr).related_model
+            path += attr + '__'
+        attr = field.source_attrs[-1]
+
+        if isinstance(field, serializers.Serializer):
+            related = _forward_relation(current, attr).related_model
+            return self.compile_serializer(field, related, path + attr + '__')
+
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            if field.pk_field is not None or type(field).get_attribute is not relations.RelatedField.get_attribute:
+                raise Ineligible(f'{field.field_name} customises its primary key')
+            model_field = _forward_relation(current, attr, allow_null=True)
+            return self.value(self.column(path + attr), None, model_field.null)
+        if type(field).get_attribute is not fields.Field.get_attribute:
+            raise Ineligible(f'{field.field_name} overrides get_attribute()')
+
+        try:
+            model_field = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            if not path and attr in self.annotations:
+                return self.value(self.column(attr), get_converter(field), True)
+            if attr in field_expressions:
+                alias = f"fast_{path.replace('__', '_')}{attr}"
+                self.expressions[alias] = lambda make=field_expressions[attr], prefix=path: make(prefix)
+                return self.value(self.column(alias), get_converter(field), True)
+            raise Ineligible(f'{field.field_name} reads {attr}, which is not a column')
+        if model_field.is_relation or not model_field.concrete:
+            raise Ineligible(f'{field.field_name} reads a relation')
+        return self.value(self.column(path + attr), get_converter(field), model_field.null)
+
+    def value(self, column, converter, nullable):
+        if converter is None:
+            return column
+        call = f'{self.constant(converter)}({column})'
+        return f'(None if {column} is None else {call})' if nullable else call
+
+    def compile(self, serializer, model):
+        code = f'def build_row(r):\n    return {self.compile_serializer(serializer, model, "")}\n'
+        exec(code, self.namespace)
+        return RowPlan(tuple(self.columns), self.expressions, self.namespace['build_row'])
+
+
+@lru_cache(maxsize=256)
+def _compile(serializer_class, model, annotations, current_timezone):
+    try:
+        return PlanCompiler(annotations).compile(serializer_class(), model)
+    except (Ineligible, FieldDoesNotExist):
+        return None
+
+
+def get_row_plan(serializer_class, queryset):
+    """
+    Returns the compiled RowPlan for serializing queryset rows with
+    serializer_class, or None when the serializer needs model instances.
+    """
+    annotations = frozenset(queryset.query.annotation_select)
+    return _compile(_unwrap(serializer_class), queryset.model, annotations, timezone.get_current_timezone())
+
+
+class FastListMixin:
+    """
+    Serves list responses from values_list() rows through a compiled
+    RowPlan when the view's serializer allows it. Pagination and filtering
+    are unchanged; keyset cursors read pk and the key field off the rows.
+    """
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = get_row_plan(self.get_serializer_class(), queryset)
+        if plan is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+
+        rows = plan.get_rows(queryset, get_required_fields(self.pagination_class))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.serialize(page))
+        return Response(plan.serialize(rows))
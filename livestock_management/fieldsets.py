@@ -0,0 +1,78 @@
+from functools import lru_cache
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+TRUE_VALUES = ('1', 'true')
+
+
+@lru_cache(maxsize=256)
+def get_field_names(serializer_class):
+    return tuple(serializer_class().fields)
+
+
+@lru_cache(maxsize=256)
+def sparse_serializer_class(serializer_class, field_names):
+    """
+    Subclass of serializer_class that only builds and outputs field_names.
+
+    Being a class of its own, it gets its own select_related()/only() hints
+    from optimize_queryset(), so the SQL column list shrinks with the output.
+    Clients choose the field sets, so only the most recent ones are kept.
+    """
+    def get_fields(self):
+        fields = super(sparse, self).get_fields()
+        return {name: field for name, field in fields.items() if name in field_names}
+
+    sparse = type(serializer_class.__name__, (serializer_class,), {
+        'get_fields': get_fields,
+        '__module__': serializer_class.__module__,
+    })
+    return sparse
+
+
+def _split(value):
+    return [name for name in (part.strip() for part in value.split(',')) if name]
+
+
+def get_fieldset_serializer_class(request, serializer_class, compact_serializer_class=None):
+    """
+    Applies ?compact=true, ?fields=a,b and ?omit=c to a read request's
+    serializer class. Unknown field names are rejected with a 400.
+    """
+    params = request.query_params
+    if compact_serializer_class is not None and params.get('compact') in TRUE_VALUES:
+        serializer_class = compact_serializer_class
+    requested, omitted = _split(params.get('fields', '')), _split(params.get('omit', ''))
+    if not requested and not omitted:
+        return serializer_class
+
+    available = get_field_names(serializer_class)
+    errors = {}
+    for param, names in (('fields', requested), ('omit', omitted)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = [f"Unknown field: {name}. Choose from {', '.join(available)}." for name in unknown]
+    if errors:
+        raise ValidationError(errors)
+
+    selected = [name for name in available if (not requested or name in requested) and name not in omitted]
+    if len(selected) == len(available):
+        return serializer_class
+    return sparse_serializer_class(serializer_class, tuple(selected))
+
+
+class SparseFieldsetMixin:
+    """
+    Lets clients narrow GET responses with ?fields= and ?omit= and, when the
+    view sets compact_serializer_class, switch to it with ?compact=true.
+    Writes always use the full serializer.
+    """
+    compact_serializer_class = None
+
+    def get_serializer_class(self):
+        serializer_class = super().get_serializer_class()
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return serializer_class
+        return get_fieldset_serializer_class(request, serializer_class, self.compact_serializer_class)
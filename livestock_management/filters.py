@@ -0,0 +1,90 @@
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class QueryParamFilterBackend(BaseFilterBackend):
+    """
+    Filters on the view's filter_params, a mapping of query parameter to
+    (ORM lookup, DRF field used to parse the value). Lookups ending in __in
+    accept comma-separated values. A lookup may also be a callable that turns
+    the parsed value into a Q object, for filters that are not a single lookup.
+    """
+    def filter_queryset(self, request, queryset, view):
+        filters, conditions, errors = {}, [], {}
+        for param, (lookup, field) in getattr(view, 'filter_params', {}).items():
+            raw = request.query_params.get(param)
+            if raw in (None, ''):
+                continue
+            try:
+                if callable(lookup):
+                    conditions.append(lookup(field.run_validation(raw)))
+                elif lookup.endswith('__in'):
+                    filters[lookup] = [field.run_validation(value) for value in raw.split(',')]
+                else:
+                    filters[lookup] = field.run_validation(raw)
+            except ValidationError as exc:
+                errors[param] = exc.detail
+        if errors:
+            raise ValidationError(errors)
+        return queryset.filter(*conditions, **filters)
+
+
+class AliasOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that also accepts the view's ordering_aliases, a mapping of
+    a public ordering name to the indexed column that sorts the same way
+    (prefixed with '-' when the order is reversed).
+    """
+    def get_valid_fields(self, queryset, view, context={}):
+        valid_fields = super().get_valid_fields(queryset, view, context)
+        return valid_fields + [(alias, alias) for alias in getattr(view, 'ordering_aliases', {})]
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        aliases = getattr(view, 'ordering_aliases', {})
+        if not ordering or not aliases:
+            return ordering
+        return [self.resolve_alias(term, aliases) for term in ordering]
+
+    def resolve_alias(self, term, aliases):
+        descending = term.startswith('-')
+        target = aliases.get(term.lstrip('-'))
+        if target is None:
+            return term
+        if descending:
+            return target[1:] if target.startswith('-') else '-' + target
+        return target
+
+
+def prefix_tsquery(term):
+    """
+    to_tsquery() source matching words that start with every word of term,
+    e.g. "A-1 holst" -> 'A-1':* & 'holst':*. Each word is quoted, so
+    tsquery operators in user input are taken literally.
+    """
+    words = term.replace('\\', '\\\\').replace("'", "''").split()
+    return ' & '.join(f"'{word}':*" for word in words)
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Prefix search over the view's search_vector_fields using the same
+    SearchVector expression as the GIN index declared on the model, so the
+    planner can use that index.
+
+    Every word of the term must start a word of the row, so ?search=A-1
+    finds tag A-10 and ?search=Holst finds Holstein, as the icontains
+    search used to; matches inside a word (stein) are not found.
+    """
+    search_param = 'search'
+    search_config = 'simple'
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        fields = getattr(view, 'search_vector_fields', None)
+        if not term or not fields:
+            return queryset
+        vector = SearchVector(*fields, config=self.search_config)
+        query = SearchQuery(prefix_tsquery(term), config=self.search_config, search_type='raw')
+        return queryset.annotate(search=vector).filter(search=query)
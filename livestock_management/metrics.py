@@ -0,0 +1,312 @@
+"""
+Per-request instrumentation and a Prometheus text endpoint.
+
+RequestMetricsMiddleware times every request and counts its SQL through an
+execute wrapper installed on each database connection; InstrumentedViewMixin
+adds serializer time for DRF generic views and CachedJWTAuthentication reports
+authentication time. Everything is aggregated into in-process histograms.
+With METRICS_DIR set, each process also writes its histograms to a file there
+every METRICS_FLUSH_SECONDS and /metrics serves the sum over all of them, so
+any worker answers for the whole server; otherwise it serves its own.
+"""
+import heapq
+import json
+import logging
+import os
+import socket
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import lru_cache
+from pathlib import Path
+from time import monotonic, perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger('livestock_management.slow_requests')
+
+_current = ContextVar('request_metrics', default=None)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+SLOWEST_QUERIES_KEPT = 5
+
+
+class Histogram:
+    """
+    Thread-safe Prometheus histogram with a fixed label set.
+    """
+    def __init__(self, name, documentation, buckets, labelnames=('view', 'method')):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = labelnames
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def snapshot(self):
+        with self.lock:
+            return [(labels, list(counts), total) for labels, (counts, total) in sorted(self.series.items())]
+
+    def expose(self, snapshot=None):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        for labels, counts, total in self.snapshot() if snapshot is None else snapshot:
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label_text}}} {total}')
+            lines.append(f'{self.name}_count{{{label_text}}} {cumulative}')
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Wall time per request.', LATENCY_BUCKETS,
+    labelnames=('view', 'method', 'status'),
+)
+DB_QUERIES = Histogram('http_request_db_queries', 'SQL queries executed per request.', QUERY_COUNT_BUCKETS)
+DB_DURATION = Histogram('http_request_db_duration_seconds', 'Time spent in SQL per request.', LATENCY_BUCKETS)
+SERIALIZER_DURATION = Histogram(
+    'http_request_serializer_duration_seconds', 'Time spent serializing response data.', LATENCY_BUCKETS,
+)
+AUTH_DURATION = Histogram('http_request_auth_duration_seconds', 'Time spent authenticating.', LATENCY_BUCKETS)
+RESPONSE_SIZE = Histogram('http_response_size_bytes', 'Response body size.', SIZE_BUCKETS)
+
+HISTOGRAMS = (REQUEST_DURATION, DB_QUERIES, DB_DURATION, SERIALIZER_DURATION, AUTH_DURATION, RESPONSE_SIZE)
+
+_last_flush = None
+_flush_lock = threading.Lock()
+
+
+def flush_metrics(force=False):
+    """
+    Writes this process's histograms to METRICS_DIR, at most once every
+    METRICS_FLUSH_SECONDS unless forced.
+    """
+    global _last_flush
+    directory = settings.METRICS_DIR
+    if not directory:
+        return
+    now = monotonic()
+    with _flush_lock:
+        if not force and _last_flush is not None and now - _last_flush < settings.METRICS_FLUSH_SECONDS:
+            return
+        _last_flush = now
+    data = {histogram.name: histogram.snapshot() for histogram in HISTOGRAMS}
+    path = Path(directory) / f'{socket.gethostname()}-{os.getpid()}.json'
+    temporary = path.with_suffix(f'.{threading.get_ident()}.tmp')
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def load_metrics(directory):
+    """
+    Sums the histograms written by every process, including exited ones, so
+    counters never go backwards until the directory is cleared.
+    """
+    merged = {histogram.name: {} for histogram in HISTOGRAMS}
+    for path in Path(directory).glob('*.json'):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        for name, snapshot in data.items():
+            series = merged.get(name)
+            if series is None:
+                continue
+            for labels, counts, total in snapshot:
+                current = series.setdefault(tuple(labels), [[0] * len(counts), 0.0])
+                current[0] = [a + b for a, b in zip(current[0], counts)]
+                current[1] += total
+    return {
+        name: [(labels, counts, total) for labels, (counts, total) in sorted(series.items())]
+        for name, series in merged.items()
+    }
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'auth_time', 'slowest')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = None
+        self.auth_time = None
+        self.slowest = []
+
+    def add_query(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        entry = (duration, self.queries, sql)
+        if len(self.slowest) < SLOWEST_QUERIES_KEPT:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+
+def add_timing(kind, duration):
+    """
+    Adds to the current request's serializer or auth time; no-op outside a request.
+    """
+    stats = _current.get()
+    if stats is not None:
+        attribute = kind + '_time'
+        setattr(stats, attribute, (getattr(stats, attribute) or 0.0) + duration)
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.add_query(sql, perf_counter() - start)
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # Installed once per connection rather than per request so queries run by
+    # the async ORM in sync_to_async threads are counted too; the context
+    # variable decides which request they belong to.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records wall time, SQL count and time, and response size for every
+    request, and logs requests slower than SLOW_REQUEST_THRESHOLD_MS together
+    with their slowest statements. Place it first in MIDDLEWARE.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(None, connection)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats, start = RequestStats(), perf_counter()
+        token = _current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, stats, perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        stats, start = RequestStats(), perf_counter()
+        token = _current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, stats, perf_counter() - start)
+        return response
+
+    def finish(self, request, response, stats, duration):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        if view == 'metrics':
+            return
+        labels = (view, request.method)
+        REQUEST_DURATION.observe(labels + (str(response.status_code),), duration)
+        DB_QUERIES.observe(labels, stats.queries)
+        DB_DURATION.observe(labels, stats.db_time)
+        if stats.serializer_time is not None:
+            SERIALIZER_DURATION.observe(labels, stats.serializer_time)
+        if stats.auth_time is not None:
+            AUTH_DURATION.observe(labels, stats.auth_time)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(labels, len(response.content))
+        flush_metrics()
+
+        if duration * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            slowest = sorted(stats.slowest, reverse=True)
+            logger.warning(
+                'Slow request %s %s (%s): %.0f ms, %d queries in %.0f ms, serializer %.0f ms\n%s',
+                request.method, request.get_full_path(), view, duration * 1000,
+                stats.queries, stats.db_time * 1000, (stats.serializer_time or 0) * 1000,
+                '\n'.join(f'  {query_time * 1000:.1f} ms: {sql}' for query_time, _, sql in slowest),
+            )
+
+
+@lru_cache(maxsize=256)
+def timed_serializer_class(serializer_class):
+    """
+    Subclass of serializer_class whose to_representation() time is added to
+    the current request; for many=True it is summed over the rows.
+    """
+    def to_representation(self, instance):
+        start = perf_counter()
+        try:
+            return super(timed, self).to_representation(instance)
+        finally:
+            add_timing('serializer', perf_counter() - start)
+
+    timed = type(serializer_class.__name__, (serializer_class,), {
+        'to_representation': to_representation,
+        '__module__': serializer_class.__module__,
+        '__wrapped__': serializer_class,
+    })
+    return timed
+
+
+class InstrumentedViewMixin:
+    """
+    Reports the time a generic view spends serializing its response data.
+    """
+    def get_serializer_class(self):
+        return timed_serializer_class(super().get_serializer_class())
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the histograms. Requires
+    'Authorization: Bearer <METRICS_TOKEN>'; without a token it is only
+    served with DEBUG on.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseForbidden()
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    snapshots = {}
+    if settings.METRICS_DIR:
+        flush_metrics(force=True)
+        snapshots = load_metrics(settings.METRICS_DIR)
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.expose(snapshots.get(histogram.name)))
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
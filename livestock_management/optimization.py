@@ -0,0 +1,91 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+@lru_cache(maxsize=256)
+def get_queryset_hints(serializer_class, model):
+    """
+    Work out the select_related() paths and only() columns a serializer needs.
+
+    Sources that are not model fields (properties, methods) are looked up in
+    the serializer's Meta.field_dependencies; if one is missing there, only()
+    is skipped for the whole queryset rather than risking a deferred load per row.
+    """
+    select_related, only, complete = [], [], [True]
+    _collect(serializer_class(), model, '', select_related, only, complete)
+    return tuple(select_related), tuple(only) if complete[0] else None
+
+
+def optimize_queryset(queryset, serializer_class, required_fields=()):
+    """
+    Applies the serializer's hints; required_fields are loaded as well for
+    code that reads rows outside the serializer, such as pagination cursors.
+    """
+    select_related, only = get_queryset_hints(serializer_class, queryset.model)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if only is not None:
+        queryset = queryset.only(*only, *required_fields)
+    return queryset
+
+
+def get_required_fields(pagination_class):
+    key_field = getattr(pagination_class, 'key_field', None)
+    return (key_field,) if key_field else ()
+
+
+def _collect(serializer, model, prefix, select_related, only, complete):
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    dependencies = getattr(getattr(serializer, 'Meta', None), 'field_dependencies', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field.source == '*':
+            complete[0] = False
+            continue
+
+        current_model, path = model, prefix
+        attrs = field.source.split('.')
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                if current_model is model and name in dependencies:
+                    only.extend(prefix + dependency for dependency in dependencies[name])
+                else:
+                    complete[0] = False
+                break
+
+            if not model_field.is_relation:
+                only.append(path + attr)
+                break
+            if model_field.many_to_many or model_field.one_to_many:
+                complete[0] = False
+                break
+
+            is_last = index == len(attrs) - 1
+            if is_last and not isinstance(field, serializers.BaseSerializer):
+                # A primary key relation only needs the local foreign key column.
+                only.append(path + attr)
+                break
+
+            select_related.append(path + attr)
+            current_model, path = model_field.related_model, path + attr + '__'
+            if is_last:
+                _collect(field, current_model, path, select_related, only, complete)
+
+
+class OptimizedQuerysetMixin:
+    """
+    Applies the select_related()/only() hints derived from the view's
+    serializer to every queryset the view reads from.
+    """
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return optimize_queryset(
+            queryset, self.get_serializer_class(), get_required_fields(self.pagination_class),
+        )
@@ -0,0 +1,167 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a descending (key_field, id) pair.
+
+    Each page is fetched with a WHERE clause on the last row seen instead of
+    an OFFSET, so page N costs the same as page 1. Clients opt in per request
+    with ?pagination=cursor (or by sending a cursor); everything else falls
+    back to the regular page-number pagination. The total count is skipped
+    unless ?count=true is passed. Cursor pages are always in key_field order,
+    so ?ordering= is rejected with a 400 rather than ignored.
+    """
+    key_field = 'created_at'
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    mode_value = 'cursor'
+    count_query_param = 'count'
+    fallback_class = PageNumberPagination
+    invalid_cursor_message = 'Invalid cursor'
+    ordering_query_param = api_settings.ORDERING_PARAM
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == self.mode_value
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if not self.use_keyset(request):
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+        self.fallback = None
+
+        self.count = queryset.count() if self.wants_count(request) else None
+        page_queryset = self.get_page_queryset(queryset, request)
+        return self.finish_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of paginate_queryset() for the async views, using
+        acount() and async iteration for both modes.
+        """
+        self.request = request
+        if not self.use_keyset(request):
+            self.fallback = self.fallback_class()
+            return await apaginate_page_number(self.fallback, queryset, request)
+        self.fallback = None
+
+        self.count = await queryset.acount() if self.wants_count(request) else None
+        page_queryset = self.get_page_queryset(queryset, request)
+        return self.finish_page([obj async for obj in page_queryset])
+
+    def wants_count(self, request):
+        return request.query_params.get(self.count_query_param) in ('1', 'true')
+
+    def get_page_queryset(self, queryset, request):
+        if self.ordering_query_param in request.query_params:
+            raise ValidationError({self.ordering_query_param: [
+                f'Cursor pagination is ordered by {self.key_field}; use page numbers to choose the order.'
+            ]})
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request, queryset.model)
+        key = self.key_field
+        if self.cursor is None:
+            queryset = queryset.order_by('-' + key, '-pk')
+        else:
+            value, pk, reverse = self.cursor
+            if reverse:
+                queryset = queryset.filter(
+                    Q(**{key + '__gt': value}) | Q(**{key: value, 'pk__gt': pk})
+                ).order_by(key, 'pk')
+            else:
+                queryset = queryset.filter(
+                    Q(**{key + '__lt': value}) | Q(**{key: value, 'pk__lt': pk})
+                ).order_by('-' + key, '-pk')
+        return queryset[:self.page_size + 1]
+
+    def finish_page(self, results):
+        reverse = self.cursor is not None and self.cursor[2]
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        self.first = results[0] if results else None
+        self.last = results[-1] if results else None
+        return results
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self.build_link(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first is None:
+            return None
+        return self.build_link(self.first, reverse=True)
+
+    def build_link(self, row, reverse):
+        url = remove_query_param(self.base_url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, reverse))
+
+    def encode_cursor(self, row, reverse):
+        value = getattr(row, self.key_field)
+        payload = [value.isoformat(), row.pk, 1 if reverse else 0]
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk, reverse = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            value = model._meta.get_field(self.key_field).to_python(value)
+            return value, int(pk), bool(reverse)
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+async def apaginate_page_number(paginator, queryset, request):
+    """
+    Runs a PageNumberPagination instance against a queryset with the async
+    ORM, leaving it ready for get_paginated_response().
+    """
+    page_size = paginator.get_page_size(request)
+    django_paginator = paginator.django_paginator_class(queryset, page_size)
+    # Prime the cached count so the paginator never calls the sync count().
+    django_paginator.count = await queryset.acount()
+    page_number = paginator.get_page_number(request, django_paginator)
+    try:
+        page = django_paginator.page(page_number)
+    except InvalidPage as exc:
+        raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+    page.object_list = [obj async for obj in page.object_list]
+    paginator.page = page
+    paginator.request = request
+    return page.object_list
@@ -0,0 +1,44 @@
+import codecs
+import json
+from collections.abc import Iterator
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON into a lazy iterator of objects.
+
+    Lines are decoded as the view consumes them, so large uploads are never
+    held in memory all at once. Blank lines are skipped.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if stream is None:
+            return iter(())
+        return self.iter_objects(codecs.getreader(encoding)(stream))
+
+    def iter_objects(self, lines):
+        for line_number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as exc:
+                raise ParseError('NDJSON parse error on line %d - %s' % (line_number, exc))
+
+
+def get_rows(data, description):
+    """
+    The rows of a JSON array or NDJSON body. Any other JSON value (an
+    object, number, string or null) is rejected instead of iterated.
+    """
+    if isinstance(data, (list, Iterator)):
+        return data
+    raise ParseError(f'Expected a list of {description}')
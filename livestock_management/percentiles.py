@@ -0,0 +1,15 @@
+"""
+Latency percentiles shared by the in-process benchmarks and
+scripts/loadtest.py. Standard library only, so the load generator can
+import it without Django installed.
+"""
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an ascending list; None when it is empty.
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
@@ -0,0 +1,69 @@
+import math
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def has_unportable_floats(data):
+    """
+    Whether data holds floats that orjson would not write like json: ones
+    json writes with an exponent (orjson gives 0.0000153 for 1.53e-05 and
+    1e16 for 1e+16) and NaN/Infinity, which orjson turns into null.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if type(value) is float:
+            if not math.isfinite(value) or 'e' in repr(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    The output is byte-for-byte what JSONRenderer produces: compact
+    separators, UTF-8, \\u2028/\\u2029 escaped, and datetimes, Decimals and
+    other non-JSON types converted by DRF's encoder. Anything orjson cannot
+    encode identically (indented output, non-string keys, integers beyond 64
+    bits, and floats that orjson formats differently) is rendered by
+    JSONRenderer.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or not self.compact or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+            or has_unportable_floats(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default,
+                               option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets event-stream views pass content negotiation for EventSource
+    clients; errors raised before the stream starts are sent as a single
+    'error' event.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b'event: error\ndata: ' + FastJSONRenderer().render(data) + b'\n\n'
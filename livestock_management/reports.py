@@ -0,0 +1,105 @@
+"""
+Time-range reports over the daily rollup tables.
+
+Reports group rollup rows (HealthRecordDailyRollup, HerdDailyChange) into
+day, week, month or year periods in SQL, so their cost follows the number of
+days in the range rather than the number of records or animals behind them.
+"""
+from abc import ABC, abstractmethod
+from datetime import date, timedelta
+
+from django.db.models import DateField
+from django.db.models.functions import Trunc
+from rest_framework import generics, permissions, serializers
+from rest_framework.response import Response
+
+from .cache import serve_cached
+from .filters import QueryParamFilterBackend
+
+PERIODS = ('day', 'week', 'month', 'year')
+DEFAULT_RANGE_DAYS = 365
+
+
+class ReportQuerySerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=PERIODS, default='month')
+    since = serializers.DateField(required=False)
+    until = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        attrs['until'] = attrs.get('until') or date.today()
+        attrs['since'] = attrs.get('since') or attrs['until'] - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+        if attrs['since'] > attrs['until']:
+            raise serializers.ValidationError({'since': 'Must not be after until.'})
+        return attrs
+
+
+def truncate(field, period):
+    """
+    First day of the period containing field, matching period_start().
+    Weeks start on Monday.
+    """
+    return Trunc(field, period, output_field=DateField())
+
+
+def period_start(day, period):
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    if period == 'month':
+        return day.replace(day=1)
+    if period == 'year':
+        return day.replace(month=1, day=1)
+    return day
+
+
+def period_starts(since, until, period):
+    """
+    Start of every period overlapping since..until, so empty periods appear
+    in reports too.
+    """
+    starts, start = [], period_start(since, period)
+    while start <= until:
+        starts.append(start)
+        if period == 'day':
+            start += timedelta(days=1)
+        elif period == 'week':
+            start += timedelta(days=7)
+        elif period == 'month':
+            start = (start + timedelta(days=31)).replace(day=1)
+        else:
+            start = start.replace(year=start.year + 1)
+    return starts
+
+
+class ReportView(generics.GenericAPIView, ABC):
+    """
+    Base for the rollup reports: validates period/since/until, scopes the
+    rollup model to the user's herd, applies the view's filter_params and
+    caches the result per user. Subclasses implement report().
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [QueryParamFilterBackend]
+    filter_params = {}
+    model = None
+    cache_name = None
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_admin:
+            return self.model.objects.all()
+        return self.model.objects.filter(owner=user)
+
+    def get(self, request):
+        return serve_cached(request, self.cache_name, self.render)
+
+    def render(self):
+        params = ReportQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        options = params.validated_data
+        results = self.report(self.filter_queryset(self.get_queryset()), **options)
+        return Response({**options, 'results': results})
+
+    @abstractmethod
+    def report(self, queryset, period, since, until):
+        """
+        The results for the filtered rollup queryset, one entry per period.
+        """
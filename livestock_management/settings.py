@@ -1,6 +1,10 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
+
+import django
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -21,15 +25,20 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
     'accounts',
     'livestock',
     'health_records',
+    'jobs',
+    'sync',
+    'breeding',
 ]
 
 MIDDLEWARE = [
+    'livestock_management.metrics.RequestMetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -69,8 +78,163 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default='password'),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
+        # Keep connections open between requests instead of reconnecting every
+        # time; 0 restores per-request connections, None keeps them forever.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=lambda v: None if v == 'None' else int(v)),
+        # Ping persistent connections before reuse so a restarted server or a
+        # dropped socket does not surface as a failed request.
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        # Behind PgBouncer in transaction pooling mode, server-side cursors
+        # (used by the streaming exports) must be turned off.
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_POOLER', default='') == 'pgbouncer',
+        'OPTIONS': {
+            'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+        },
+    }
+}
+
+# Native psycopg 3 connection pool. Needs Django 5.1+ with psycopg[pool]
+# installed instead of psycopg2; it replaces the persistent connections above.
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=0, cast=int)
+if DB_POOL_MAX_SIZE:
+    # Older Django and psycopg2 pass 'pool' to the driver, which rejects
+    # every connection; fail at startup instead.
+    if django.VERSION < (5, 1) or not all(find_spec(name) for name in ('psycopg', 'psycopg_pool')):
+        raise ImproperlyConfigured('DB_POOL_MAX_SIZE needs Django 5.1+ and psycopg[pool]; unset it or upgrade.')
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': DB_POOL_MAX_SIZE,
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+    }
+
+# Cache
+# Responses and their invalidation versions live in the default cache:
+# Redis when REDIS_URL is set (any Redis-protocol server, needs the redis
+# package), otherwise memory local to each process. With several web
+# processes and no Redis, a change only invalidates the cached responses of
+# the process that made it; the others may serve the old data for up to
+# RESPONSE_CACHE_TIMEOUT seconds. The login limits must be shared by every
+# process, so without Redis they use a database table instead (created by
+# the accounts migrations).
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'throttle': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'throttle',
+        },
     }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'livestock',
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        },
+        'throttle': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'livestock_cache',
+        },
+    }
+
+# Seconds a cached GET response is kept; entries are also invalidated by model signals.
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Web server processes (scripts/serve.sh exports it); checked against the
+# event backend below.
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+
+# Live events (/api/events/): delivered in-process by default, through Redis
+# pub/sub when REDIS_URL is set so every worker process receives them.
+# manage.py check warns when LocalBackend is used with WEB_CONCURRENCY > 1.
+# Streams send a heartbeat every EVENT_STREAM_HEARTBEAT seconds and are
+# closed after EVENT_STREAM_MAX_SECONDS; clients reconnect automatically.
+# Under WSGI, where a stream would hold a worker thread, /api/events/ answers
+# at once and clients poll it every EVENT_POLL_SECONDS instead. EventSource
+# clients authenticate with tickets from /api/events/ticket/, valid for
+# EVENT_TICKET_SECONDS.
+EVENT_BACKEND = config(
+    'EVENT_BACKEND',
+    default='livestock_management.events.RedisBackend' if REDIS_URL else 'livestock_management.events.LocalBackend',
+)
+EVENT_STREAM_HEARTBEAT = config('EVENT_STREAM_HEARTBEAT', default=15, cast=int)
+EVENT_STREAM_MAX_SECONDS = config('EVENT_STREAM_MAX_SECONDS', default=300, cast=int)
+EVENT_QUEUE_SIZE = config('EVENT_QUEUE_SIZE', default=1000, cast=int)
+EVENT_POLL_SECONDS = config('EVENT_POLL_SECONDS', default=15, cast=int)
+EVENT_TICKET_SECONDS = config('EVENT_TICKET_SECONDS', default=60, cast=int)
+
+# Background jobs: a failed attempt is retried after JOB_RETRY_BASE_DELAY
+# seconds, doubling per attempt up to JOB_RETRY_MAX_DELAY.
+JOB_RETRY_BASE_DELAY = config('JOB_RETRY_BASE_DELAY', default=10, cast=int)
+JOB_RETRY_MAX_DELAY = config('JOB_RETRY_MAX_DELAY', default=3600, cast=int)
+# Largest bulk upload accepted with ?background=true; its rows are stored in
+# the job's payload until the worker runs it.
+BULK_JOB_MAX_ROWS = config('BULK_JOB_MAX_ROWS', default=50000, cast=int)
+# Largest number of animals one batch health record request may cover; it
+# is written in a single transaction.
+HEALTH_RECORD_BATCH_MAX_SIZE = config('HEALTH_RECORD_BATCH_MAX_SIZE', default=5000, cast=int)
+
+# The job worker logs started and finished jobs and lost database
+# connections to the console.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'jobs': {'handlers': ['console'], 'level': config('JOB_LOG_LEVEL', default='INFO')},
+    },
+}
+
+# Change feed: tombstones are pruned after SYNC_TOMBSTONE_DAYS; older
+# cursors get a full resync.
+SYNC_PAGE_SIZE = config('SYNC_PAGE_SIZE', default=500, cast=int)
+SYNC_TOMBSTONE_DAYS = config('SYNC_TOMBSTONE_DAYS', default=90, cast=int)
+
+# Pairings whose offspring would be more inbred than BREEDING_MAX_INBREEDING
+# (0.0625, a first-cousin mating, by default) are flagged as unacceptable.
+BREEDING_MAX_INBREEDING = config('BREEDING_MAX_INBREEDING', default=0.0625, cast=float)
+# When an animal's parents change, up to INBREEDING_INLINE_DESCENDANTS of its
+# descendants are updated in the request; larger families in a background job.
+INBREEDING_INLINE_DESCENDANTS = config('INBREEDING_INLINE_DESCENDANTS', default=500, cast=int)
+
+# Request metrics: requests slower than SLOW_REQUEST_THRESHOLD_MS are logged
+# with their slowest SQL. /metrics requires METRICS_TOKEN as a bearer token,
+# and without one is only served in DEBUG. Histograms are per process; set
+# METRICS_DIR to a directory shared by the server's processes to serve their
+# sum (scripts/serve.sh clears it on start).
+SLOW_REQUEST_THRESHOLD_MS = config('SLOW_REQUEST_THRESHOLD_MS', default=500, cast=int)
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_DIR = config('METRICS_DIR', default='')
+METRICS_FLUSH_SECONDS = config('METRICS_FLUSH_SECONDS', default=5, cast=int)
+
+# Password hashing. PASSWORD_HASHER_PROFILE picks the hasher for new and
+# re-encoded hashes; the others stay listed so existing hashes still verify
+# and are upgraded on the next login. argon2 needs the argon2-cffi package.
+PASSWORD_HASHER_PROFILE = config('PASSWORD_HASHER_PROFILE', default='pbkdf2')
+PASSWORD_HASHER_PROFILES = {
+    'pbkdf2': 'accounts.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'accounts.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'accounts.hashers.TunedScryptPasswordHasher',
 }
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]] + [
+    hasher for profile, hasher in PASSWORD_HASHER_PROFILES.items() if profile != PASSWORD_HASHER_PROFILE
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+PBKDF2_ITERATIONS = config('PBKDF2_ITERATIONS', default=600000, cast=int)
+# Argon2id defaults follow the OWASP minimum: 19 MiB, 2 passes, 1 lane.
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19456, cast=int)
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+SCRYPT_WORK_FACTOR = config('SCRYPT_WORK_FACTOR', default=2 ** 14, cast=int)
+SCRYPT_BLOCK_SIZE = config('SCRYPT_BLOCK_SIZE', default=8, cast=int)
+SCRYPT_PARALLELISM = config('SCRYPT_PARALLELISM', default=1, cast=int)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -110,13 +274,28 @@ AUTH_USER_MODEL = 'accounts.User'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'livestock_management.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
+    'PAGE_SIZE': 20,
+    # Proxies in front of the server. Client addresses for the login limits
+    # are read from X-Forwarded-For only past that many proxies; with 0 the
+    # header, which clients can set to anything, is ignored.
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
+    # Login/registration limits; see accounts.throttles.
+    'DEFAULT_THROTTLE_RATES': {
+        'login': config('LOGIN_RATE_LIMIT', default='20/min'),
+        # Failed logins per username and address.
+        'login_username': config('LOGIN_USERNAME_RATE_LIMIT', default='10/min'),
+        'register': config('REGISTER_RATE_LIMIT', default='10/hour'),
+    },
 }
 
 # JWT Configuration
@@ -127,6 +306,12 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# Seconds an authenticated user is kept in the per-process cache; 0 disables it.
+# Saving a user invalidates it at once in every process when REDIS_URL is set,
+# otherwise in the other processes within this many seconds. Ignored when the
+# default cache is a database table.
+AUTH_USER_CACHE_TTL = config('AUTH_USER_CACHE_TTL', default=30, cast=int)
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -0,0 +1,173 @@
+"""
+Synthetic farm data for benchmarks and local load testing.
+
+generate_farm_data() creates owners, their animals and health records with
+bulk inserts in fixed-size batches, so memory stays flat however many rows
+are requested. The same seed always produces the same rows.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models import User
+from health_records.models import HealthRecord, HealthRecordDailyRollup
+from livestock.models import HerdDailyChange, Livestock, LivestockSummary
+from .cache import bump_cache_version
+
+DEFAULT_PREFIX = 'bench'
+DEFAULT_PASSWORD = 'benchmark-password'
+
+BREEDS = {
+    'cattle': ['Holstein', 'Angus', 'Hereford', 'Sahiwal', 'Jersey'],
+    'sheep': ['Merino', 'Suffolk', 'Dorper', 'Kajli'],
+    'goat': ['Boer', 'Beetal', 'Nubian', 'Saanen'],
+    'pig': ['Yorkshire', 'Duroc', 'Landrace'],
+    'chicken': ['Leghorn', 'Rhode Island Red', 'Aseel'],
+    'other': ['Mixed'],
+}
+# (weight share, min kg, max kg, max age in days)
+ANIMAL_PROFILES = {
+    'cattle': (30, 150, 750, 3650),
+    'sheep': (20, 20, 90, 2555),
+    'goat': (25, 15, 80, 2555),
+    'pig': (10, 30, 250, 1460),
+    'chicken': (12, 1, 4, 1095),
+    'other': (3, 5, 300, 3650),
+}
+STATUS_WEIGHTS = {'healthy': 80, 'sick': 8, 'pregnant': 7, 'sold': 3, 'deceased': 2}
+RECORD_PROFILES = {
+    'vaccination': (35, ['None'], ['Scheduled vaccination']),
+    'checkup': (30, ['No findings', 'Underweight', 'Good condition'], ['None required']),
+    'treatment': (12, ['Mastitis', 'Foot rot', 'Worm burden'], ['Antibiotics', 'Hoof trimming', 'Deworming']),
+    'illness': (12, ['Respiratory infection', 'Diarrhoea', 'Fever'], ['Antibiotics', 'Fluids', 'Rest']),
+    'injury': (8, ['Laceration', 'Lameness'], ['Wound dressing', 'Anti-inflammatory']),
+    'other': (3, ['Observation'], ['None required']),
+}
+VETERINARIANS = ['Dr. Khan', 'Dr. Ahmed', 'Dr. Malik', 'Dr. Hussain', '']
+MEDICATIONS = ['', 'Oxytetracycline', 'Ivermectin', 'Meloxicam', 'Penicillin']
+
+
+def _weighted(rng, table):
+    choices = list(table)
+    weights = [value[0] if isinstance(value, tuple) else value for value in table.values()]
+    return lambda: rng.choices(choices, weights)[0]
+
+
+class FarmDataGenerator:
+    """
+    Bulk-creates owners with animals and health records.
+
+    Rows bypass model signals, so the summary and rollup tables and the
+    response cache versions of the new owners are refreshed once at the end.
+    """
+    def __init__(self, owners, animals_per_owner, records_per_animal, prefix=DEFAULT_PREFIX,
+                 password=DEFAULT_PASSWORD, seed=0, batch_size=2000, today=None):
+        self.owners = owners
+        self.animals_per_owner = animals_per_owner
+        self.records_per_animal = records_per_animal
+        self.prefix = prefix
+        self.password = password
+        self.batch_size = batch_size
+        self.today = today or date.today()
+        self.rng = random.Random(seed)
+        self.animal_type = _weighted(self.rng, ANIMAL_PROFILES)
+        self.status = _weighted(self.rng, STATUS_WEIGHTS)
+        self.record_type = _weighted(self.rng, RECORD_PROFILES)
+
+    def username(self, index):
+        return f'{self.prefix}_owner_{index:04d}'
+
+    def clear(self):
+        """
+        Deletes the owners created by an earlier run with the same prefix;
+        their animals and records go with them.
+        """
+        owners = User.objects.filter(username__startswith=f'{self.prefix}_owner_')
+        owner_ids = list(owners.values_list('id', flat=True))
+        owners.delete()
+        bump_cache_version(*owner_ids)
+        return len(owner_ids)
+
+    def run(self, log=None):
+        # Hashing once keeps generation fast; every owner logs in with the same password.
+        password = make_password(self.password)
+        users = User.objects.bulk_create([
+            User(username=self.username(index), password=password, role='standard',
+                 farm_name=f'{self.prefix.title()} Farm {index}')
+            for index in range(self.owners)
+        ])
+        totals = {'owners': len(users), 'livestock': 0, 'health_records': 0}
+        for user in users:
+            for start in range(0, self.animals_per_owner, self.batch_size):
+                size = min(self.batch_size, self.animals_per_owner - start)
+                with transaction.atomic():
+                    animals = Livestock.objects.bulk_create(
+                        [self.make_animal(user, start + offset) for offset in range(size)]
+                    )
+                    records = [
+                        self.make_record(animal, user)
+                        for animal in animals for _ in range(self.records_per_animal)
+                    ]
+                    HealthRecord.objects.bulk_create(records, batch_size=self.batch_size)
+                totals['livestock'] += len(animals)
+                totals['health_records'] += len(records)
+                if log:
+                    log(f'{user.username}: {start + size}/{self.animals_per_owner} animals')
+
+        owner_ids = [user.pk for user in users]
+        with transaction.atomic():
+            LivestockSummary.rebuild(owner_ids=owner_ids)
+            HerdDailyChange.reconcile(owner_ids=owner_ids)
+            HealthRecordDailyRollup.rebuild(owner_ids=owner_ids)
+        bump_cache_version(*owner_ids)
+        return totals
+
+    def make_animal(self, user, index):
+        rng = self.rng
+        animal_type = self.animal_type()
+        _, min_weight, max_weight, max_age = ANIMAL_PROFILES[animal_type]
+        age = rng.randint(30, max_age)
+        grown = min(1.0, age / (max_age / 3))
+        weight = min_weight + (max_weight - min_weight) * grown * rng.uniform(0.7, 1.0)
+        purchased = rng.random() < 0.3
+        purchase_date = self.today - timedelta(days=rng.randint(0, age)) if purchased else None
+        return Livestock(
+            owner=user,
+            tag_number=f'{self.prefix.upper()}-{user.pk}-{index:06d}',
+            animal_type=animal_type,
+            breed=rng.choice(BREEDS[animal_type]),
+            gender=rng.choice(('male', 'female')),
+            birth_date=self.today - timedelta(days=age),
+            weight=Decimal(f'{weight:.2f}'),
+            status=self.status(),
+            purchase_price=Decimal(f'{weight * rng.uniform(2, 6):.2f}') if purchased else None,
+            purchase_date=purchase_date,
+            notes=rng.choice(('', '', '', 'Calm temperament', 'Needs monitoring')),
+        )
+
+    def make_record(self, animal, user):
+        rng = self.rng
+        record_type = self.record_type()
+        _, diagnoses, treatments = RECORD_PROFILES[record_type]
+        age = (self.today - animal.birth_date).days
+        record_date = self.today - timedelta(days=rng.randint(0, min(age, 730)))
+        next_appointment = None
+        if record_type in ('vaccination', 'treatment', 'illness') and rng.random() < 0.5:
+            next_appointment = record_date + timedelta(days=rng.choice((7, 14, 30, 90, 180)))
+        return HealthRecord(
+            livestock=animal,
+            owner=user,
+            record_type=record_type,
+            date=record_date,
+            veterinarian=rng.choice(VETERINARIANS),
+            diagnosis=rng.choice(diagnoses),
+            treatment=rng.choice(treatments),
+            medication=rng.choice(MEDICATIONS),
+            cost=Decimal(f'{rng.uniform(5, 250):.2f}') if rng.random() < 0.7 else None,
+            notes='',
+            next_appointment=next_appointment,
+            created_by=user,
+        )
@@ -0,0 +1,67 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from livestock.models import Livestock
+
+User = get_user_model()
+AGES = (10, 100, 200, 400)
+
+
+@override_settings(AUTH_USER_CACHE_TTL=0)
+class AgeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        today = date.today()
+        for days in AGES:
+            Livestock.objects.create(
+                owner=cls.user, tag_number=f'D-{days}', animal_type='goat', breed='Boer', gender='female',
+                birth_date=today - timedelta(days=days), weight=Decimal('40'),
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def list(self, **params):
+        response = self.client.get('/api/livestock/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def tags(self, **params):
+        return sorted(row['tag_number'] for row in self.list(**params))
+
+    def test_annotated_ages_match_the_properties(self):
+        annotated = {animal.pk: animal for animal in Livestock.objects.with_age()}
+        for animal in Livestock.objects.all():
+            self.assertEqual(annotated[animal.pk].age_in_days, animal.age_in_days)
+            self.assertEqual(annotated[animal.pk].age_in_months, animal.age_in_months)
+
+    def test_with_age_binds_the_given_day(self):
+        later = date.today() + timedelta(days=30)
+        ages = sorted(Livestock.objects.with_age(today=later).values_list('age_in_days', flat=True))
+        self.assertEqual(ages, [days + 30 for days in AGES])
+
+    def test_serialized_ages(self):
+        ages = {row['tag_number']: (row['age_in_days'], row['age_in_months']) for row in self.list()}
+        self.assertEqual(ages, {f'D-{days}': (days, days // 30) for days in AGES})
+
+    def test_age_range_filters(self):
+        self.assertEqual(self.tags(age_min_months=3, age_max_months=6), ['D-100', 'D-200'])
+        self.assertEqual(self.tags(age_max_days=100), ['D-10', 'D-100'])
+        self.assertEqual(self.tags(age_min_days=201), ['D-400'])
+        self.assertEqual(
+            sorted(Livestock.objects.age_range(min_days=100, max_days=200).values_list('tag_number', flat=True)),
+            ['D-100', 'D-200'],
+        )
+        self.assertEqual(self.client.get('/api/livestock/', {'age_min_days': -1}).status_code, 400)
+
+    def test_ordering_by_age(self):
+        youngest_first = [row['tag_number'] for row in self.list(ordering='age_in_days')]
+        self.assertEqual(youngest_first, [f'D-{days}' for days in AGES])
+        oldest_first = [row['tag_number'] for row in self.list(ordering='-age_in_months')]
+        self.assertEqual(oldest_first, [f'D-{days}' for days in reversed(AGES)])
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from health_records.models import AppointmentReminder, HealthRecord
+from livestock.models import Livestock
+
+User = get_user_model()
+
+
+@override_settings(AUTH_USER_CACHE_TTL=0)
+class DueAppointmentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        cls.other = User.objects.create_user('other', password='pw', role='standard')
+        today = date.today()
+        cls.records = {}
+        for owner, tag_number, offset in [
+            (cls.user, 'SOON', 3), (cls.user, 'MISSED', -5), (cls.user, 'LATER', 20),
+            (cls.user, 'LAPSED', -40), (cls.user, 'NONE', None), (cls.user, 'DONE', -2),
+            (cls.other, 'OTHER', 1),
+        ]:
+            animal = Livestock.objects.create(
+                owner=owner, tag_number=tag_number, animal_type='cattle', breed='Angus', gender='female',
+                birth_date=date(2020, 1, 1), weight=Decimal('400'),
+            )
+            cls.records[tag_number] = cls.create_record(
+                animal, today - timedelta(days=60), None if offset is None else today + timedelta(days=offset),
+            )
+        # The follow-up for DONE happened, which closes its appointment.
+        cls.create_record(cls.records['DONE'].livestock, today - timedelta(days=1), None)
+
+    @classmethod
+    def create_record(cls, animal, record_date, next_appointment):
+        return HealthRecord.objects.create(
+            livestock=animal, record_type='vaccination', date=record_date, diagnosis='-', treatment='-',
+            next_appointment=next_appointment, created_by=animal.owner,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_due(self, **params):
+        response = self.client.get('/api/health/records/due/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['tag_number'], row['days_until']) for row in response.json()['results']]
+
+    def test_due_lists_open_appointments_soonest_first(self):
+        self.assertEqual(self.get_due(), [('MISSED', -5), ('SOON', 3)])
+        self.assertEqual(
+            self.get_due(days=30, overdue_days=60), [('LAPSED', -40), ('MISSED', -5), ('SOON', 3), ('LATER', 20)],
+        )
+        self.assertEqual(self.get_due(days=0, overdue_days=0), [])
+
+    def test_reminders_are_queued_once_for_every_owner(self):
+        call_command('queue_appointment_reminders', stdout=StringIO())
+        call_command('queue_appointment_reminders', stdout=StringIO())
+        reminders = sorted(AppointmentReminder.objects.values_list(
+            'health_record__livestock__tag_number', 'recipient__username', 'kind', 'status'))
+        self.assertEqual(reminders, [
+            ('MISSED', 'owner', 'overdue', 'pending'),
+            ('OTHER', 'other', 'upcoming', 'pending'),
+            ('SOON', 'owner', 'upcoming', 'pending'),
+        ])
+
+        response = self.client.get('/api/health/reminders/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(row['health_record'] for row in response.json()['results']),
+            sorted([self.records['MISSED'].pk, self.records['SOON'].pk]),
+        )
@@ -0,0 +1,63 @@
+from datetime import date
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from livestock.models import Livestock
+from livestock.serializers import LivestockSerializer
+from livestock_management.async_views import AsyncDetailView
+
+User = get_user_model()
+
+
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        cls.other = User.objects.create_user('other', password='pw', role='standard')
+        for index, owner in enumerate([cls.user, cls.user, cls.other]):
+            Livestock.objects.create(
+                owner=owner, tag_number=f'A-{index}', animal_type='sheep', breed='Merino', gender='female',
+                birth_date=date(2021, 1, 1), weight=Decimal('60.5'),
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    async def get_async(self, url):
+        return await self.async_client.get(url, headers=self.headers)
+
+    def test_same_payloads_as_the_drf_views(self):
+        animal = Livestock.objects.filter(owner=self.user).first()
+        for sync_url, async_url in [
+            ('/api/livestock/', '/api/livestock/async/'),
+            ('/api/livestock/?pagination=cursor', '/api/livestock/async/?pagination=cursor'),
+            (f'/api/livestock/{animal.pk}/', f'/api/livestock/async/{animal.pk}/'),
+            ('/api/livestock/stats/', '/api/livestock/async/stats/'),
+            ('/api/health/records/stats/', '/api/health/records/async/stats/'),
+        ]:
+            with self.subTest(url=async_url):
+                expected = self.client.get(sync_url, headers=self.headers)
+                response = async_to_sync(self.get_async)(async_url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected.json())
+
+    def test_other_herds_are_not_found(self):
+        animal = Livestock.objects.get(owner=self.other)
+        response = async_to_sync(self.get_async)(f'/api/livestock/async/{animal.pk}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_requires_a_token(self):
+        self.headers = {}
+        response = async_to_sync(self.get_async)('/api/livestock/async/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response)
+
+    def test_queryset_attribute_is_the_default(self):
+        view = AsyncDetailView(queryset=Livestock.objects.filter(owner=self.other), serializer_class=LivestockSerializer)
+        self.assertEqual(list(view.get_queryset()), list(Livestock.objects.filter(owner=self.other)))
@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import authentication
+
+User = get_user_model()
+
+
+@override_settings(AUTH_USER_CACHE_TTL=30)
+class CachedUserTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw', role='standard')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.addCleanup(authentication._user_cache.clear)
+
+    def test_cached_user_skips_the_lookup(self):
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+
+    def test_deactivation_reaches_other_processes(self):
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+        # Another process still holds the entry cached before the change.
+        stale = authentication._user_cache[self.user.pk]
+        self.user.is_active = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        authentication._user_cache[self.user.pk] = stale
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 401)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'livestock_cache',
+    }})
+    def test_database_cache_disables_the_user_cache(self):
+        authentication.user_cache_enabled.warned = False
+        with self.assertLogs('accounts.authentication', 'WARNING'):
+            self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+        with self.assertNumQueries(1):
+            # The user itself, not a cache table read on top of it.
+            self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+        self.assertNotIn(self.user.pk, authentication._user_cache)
+
+    def test_async_views_use_the_cache(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get('/api/livestock/async/').status_code, 200)
+        self.assertIn(self.user.pk, authentication._user_cache)
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from jobs.models import Job
+
+User = get_user_model()
+
+
+class BulkBodyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_non_list_bodies_are_rejected(self):
+        for url in ['/api/livestock/bulk/', '/api/livestock/weights/']:
+            for body in ['5', 'null', '"tag"', '{"tag_number": "A"}', 'true']:
+                with self.subTest(url=url, body=body):
+                    response = self.client.post(url, body, content_type='application/json')
+                    self.assertEqual(response.status_code, 400)
+
+    @override_settings(BULK_JOB_MAX_ROWS=2)
+    def test_background_uploads_are_capped(self):
+        rows = [{'tag_number': f'T-{n}'} for n in range(3)]
+        response = self.client.post('/api/livestock/bulk/?background=true', rows, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+        response = self.client.post('/api/livestock/bulk/?background=true', rows[:2], format='json')
+        self.assertEqual(response.status_code, 202)
@@ -0,0 +1,73 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from livestock.bulk import LivestockBulkUpsert
+from livestock.models import Livestock, LivestockSummary, WeightMeasurement
+
+User = get_user_model()
+
+
+def row(tag_number, weight='400.00', **extra):
+    return {
+        'tag_number': tag_number, 'animal_type': 'cattle', 'breed': 'Angus', 'gender': 'female',
+        'birth_date': '2021-03-01', 'weight': weight, **extra,
+    }
+
+
+class BulkUpsertTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        cls.other = User.objects.create_user('other', password='pw', role='standard')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, rows):
+        response = self.client.post('/api/livestock/bulk/', rows, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_creates_then_updates_by_tag_number(self):
+        result = self.upload([row('B-1'), row('B-2'), row('B-1')])
+        self.assertEqual((result['created'], result['updated'], len(result['errors'])), (2, 0, 1))
+        result = self.upload([row('B-1', weight='420.00', status='sick'), row('B-3')])
+        self.assertEqual((result['created'], result['updated'], result['errors']), (1, 1, []))
+
+        animal = Livestock.objects.get(tag_number='B-1')
+        self.assertEqual((animal.status, animal.weight), ('sick', Decimal('420.00')))
+        self.assertEqual(
+            list(WeightMeasurement.objects.filter(livestock=animal).order_by('pk').values_list('weight', flat=True)),
+            [Decimal('400.00'), Decimal('420.00')],
+        )
+        summary = LivestockSummary.objects.filter(owner=self.user)
+        self.assertEqual(sum(summary.values_list('count', flat=True)), 3)
+
+    def test_other_owners_tags_are_not_overwritten(self):
+        self.client.force_authenticate(self.other)
+        self.upload([row('B-1', notes='theirs')])
+        self.client.force_authenticate(self.user)
+        result = self.upload([row('B-1', notes='mine'), row('B-2')])
+        self.assertEqual((result['created'], result['updated']), (1, 0))
+        self.assertEqual(result['errors'][0]['row'], 0)
+        self.assertEqual(Livestock.objects.get(tag_number='B-1').notes, 'theirs')
+
+    def test_tag_inserted_after_the_ownership_lookup_is_not_taken_over(self):
+        theirs = Livestock.objects.create(
+            owner=self.other, tag_number='B-1', animal_type='cattle', breed='Angus', gender='female',
+            birth_date=date(2021, 3, 1), weight=Decimal('400'), notes='theirs',
+        )
+        upsert = LivestockBulkUpsert(self.user)
+        # The lookup runs before the other owner's insert commits.
+        with mock.patch('livestock.bulk.Livestock.objects.filter', return_value=Livestock.objects.none()):
+            upsert.upsert_batch([(0, row('B-1', notes='mine')), (1, row('B-2'))])
+        self.assertEqual((upsert.result['created'], upsert.result['updated']), (1, 0))
+        self.assertEqual(upsert.result['errors'][0]['row'], 0)
+        theirs.refresh_from_db()
+        self.assertEqual((theirs.owner, theirs.notes), (self.other, 'theirs'))
@@ -0,0 +1,75 @@
+from datetime import date
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from livestock.models import Livestock
+from livestock_management.events import format_event, get_backend
+
+User = get_user_model()
+
+
+@override_settings(EVENT_STREAM_HEARTBEAT=1)
+class EventStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+
+    def setUp(self):
+        cache.clear()
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def get_ticket(self):
+        response = self.client.post('/api/events/ticket/', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['ticket']
+
+    def test_access_tokens_are_not_accepted_in_the_url(self):
+        response = self.client.get(f'/api/events/?token={AccessToken.for_user(self.user)}')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.client.get('/api/events/?ticket=forged').status_code, 401)
+
+    def test_expired_tickets_are_rejected(self):
+        ticket = self.get_ticket()
+        with override_settings(EVENT_TICKET_SECONDS=-1):
+            self.assertEqual(self.client.get(f'/api/events/?ticket={ticket}').status_code, 401)
+
+    def test_wsgi_polls_answer_at_once_and_resync_after_changes(self):
+        url = f'/api/events/?ticket={self.get_ticket()}'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+        body = response.content.decode()
+        self.assertIn('retry: 15000\n', body)
+        last_event_id = body.split('id: ')[1].split('\n')[0]
+
+        unchanged = self.client.get(url, HTTP_LAST_EVENT_ID=last_event_id).content.decode()
+        self.assertNotIn('event: resync', unchanged)
+        Livestock.objects.create(
+            owner=self.user, tag_number='E-1', animal_type='cattle', breed='Angus', gender='male',
+            birth_date=date(2022, 1, 1), weight=Decimal('300'),
+        )
+        changed = self.client.get(url, HTTP_LAST_EVENT_ID=last_event_id).content.decode()
+        self.assertIn('event: resync', changed)
+
+    def test_asgi_streams_deliver_published_events(self):
+        ticket = self.get_ticket()
+        frames = async_to_sync(self.read_stream)(f'/api/events/?ticket={ticket}')
+        self.assertEqual(frames[0], 'retry: 3000\n\n')
+        self.assertEqual(frames[1], format_event('livestock.created', {'id': 1}))
+
+    async def read_stream(self, url):
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = aiter(response.streaming_content)
+        frames = [(await anext(chunks)).decode()]
+        # The stream is subscribed once its first frame is out.
+        get_backend().publish(self.user.pk, format_event('livestock.created', {'id': 1}))
+        frames.append((await anext(chunks)).decode())
+        await chunks.aclose()
+        return frames
@@ -0,0 +1,51 @@
+from datetime import date
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from livestock.models import Livestock
+from livestock_management.export import StreamingExportView
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        for index in range(5):
+            Livestock.objects.create(
+                owner=cls.user, tag_number=f'E-{index}', animal_type='goat', breed='Boer', gender='male',
+                birth_date=date(2020, 1, 1), weight=Decimal('55.5'),
+            )
+
+    def setUp(self):
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def test_asgi_exports_stream_the_same_rows(self):
+        for export_format in ('csv', 'ndjson'):
+            url = f'/api/livestock/export/{export_format}/'
+            response = self.client.get(url, headers=self.headers)
+            self.assertFalse(response.is_async)
+            expected = b''.join(response.streaming_content)
+            self.assertEqual(async_to_sync(self.read_async)(url), expected)
+            self.assertEqual(expected.count(b'E-'), 5)
+
+    async def read_async(self, url):
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        return b''.join([chunk async for chunk in response.streaming_content])
+
+    def test_queryset_attribute_is_the_default(self):
+        view = StreamingExportView.as_view(
+            queryset=Livestock.objects.filter(tag_number__lt='E-2').order_by('tag_number'), export_fields=('tag_number',),
+        )
+        request = APIRequestFactory().get('/export/csv/')
+        force_authenticate(request, self.user)
+        response = view(request, export_format='csv')
+        self.assertEqual(b''.join(response.streaming_content), b'tag_number\r\nE-0\r\nE-1\r\n')
@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from health_records.models import HealthRecord
+from health_records.serializers import (
+    DueAppointmentSerializer, HealthRecordCompactSerializer, HealthRecordSerializer, HealthRecordSyncSerializer,
+)
+from livestock.models import Livestock
+from livestock.serializers import LivestockCompactSerializer, LivestockSerializer
+from livestock_management.fastpath import get_row_plan
+from livestock_management.fieldsets import sparse_serializer_class
+from livestock_management.optimization import optimize_queryset
+from livestock_management.renderers import FastJSONRenderer
+
+User = get_user_model()
+
+
+class FastPathOutputTests(TestCase):
+    """
+    The compiled row plans and FastJSONRenderer must produce the same bytes
+    as DRF serializers rendered by JSONRenderer.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user('owner', password='pw', role='standard')
+        founder = Livestock.objects.create(
+            owner=owner, tag_number='F-1', animal_type='cattle', breed='Holstein', gender='male',
+            birth_date=date(2015, 3, 1), weight=Decimal('612.50'),
+        )
+        dam = Livestock.objects.create(
+            owner=owner, tag_number='F-2', animal_type='cattle', breed='Sahiwal – ساہیوال', gender='female',
+            birth_date=date(2016, 4, 2), weight=Decimal('480'), purchase_price=Decimal('1999.99'),
+            purchase_date=date(2017, 1, 5), notes='line separator paragraph "quoted" \\ ünïcødé 🐄',
+        )
+        calf = Livestock.objects.create(
+            owner=owner, tag_number='F-3', animal_type='cattle', breed='Cross', gender='female',
+            birth_date=date(2020, 5, 6), weight=Decimal('0.01'), status='sick', sire=founder, dam=dam,
+        )
+        # Coefficients json writes with an exponent, in fixed notation, and zero.
+        Livestock.objects.filter(pk=founder.pk).update(inbreeding_coefficient=1.53e-05)
+        Livestock.objects.filter(pk=dam.pk).update(inbreeding_coefficient=0.0625)
+        Livestock.objects.filter(pk=calf.pk).update(inbreeding_coefficient=1e16)
+
+        today = date.today()
+        HealthRecord.objects.create(
+            livestock=dam, record_type='vaccination', date=today, veterinarian='Dr. Øyvind',
+            diagnosis='None at all', treatment='Vaccine', cost=Decimal('12.3'),
+            next_appointment=today + timedelta(days=3), created_by=owner,
+        )
+        HealthRecord.objects.create(
+            livestock=calf, record_type='illness', date=today - timedelta(days=2), diagnosis='Fever',
+            treatment='Rest', cost=None, next_appointment=None, created_by=owner,
+        )
+
+    def get_cases(self):
+        livestock = Livestock.objects.with_age().order_by('-created_at', '-id')
+        records = HealthRecord.objects.order_by('-date', '-id')
+        return [
+            (LivestockSerializer, livestock),
+            (LivestockCompactSerializer, livestock),
+            (sparse_serializer_class(LivestockSerializer, frozenset(['id', 'sire', 'inbreeding_coefficient'])),
+             livestock),
+            (HealthRecordSerializer, records),
+            (HealthRecordCompactSerializer, records),
+            (HealthRecordSyncSerializer, records),
+            (DueAppointmentSerializer, records.filter(next_appointment__isnull=False).with_days_until_appointment()),
+        ]
+
+    def test_row_plans_match_serializers(self):
+        for serializer_class, queryset in self.get_cases():
+            with self.subTest(serializer=serializer_class.__name__):
+                plan = get_row_plan(serializer_class, queryset)
+                self.assertIsNotNone(plan)
+                expected = JSONRenderer().render(
+                    serializer_class(optimize_queryset(queryset, serializer_class), many=True).data
+                )
+                rows = plan.serialize(list(plan.get_rows(queryset)))
+                self.assertEqual(JSONRenderer().render(rows), expected)
+                self.assertEqual(FastJSONRenderer().render(rows), expected)
+
+    def test_renderer_matches_json_renderer(self):
+        for value in [
+            1.53e-05, 1e16, 1e-4, 0.1, 1.0, -0.0, 123456789012345.6,
+            'line separator ', 'ünïcødé 🐄', Decimal('1.10'), date(2020, 1, 2),
+            {'nested': [{'value': 2.5e-07}, None, True]},
+        ]:
+            with self.subTest(value=value):
+                data = {'results': [value]}
+                self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renderer_rejects_non_finite_floats_like_json_renderer(self):
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({'value': float('nan')})
+        with self.assertRaises(ValueError):
+            FastJSONRenderer().render({'value': float('nan')})
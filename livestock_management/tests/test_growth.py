@@ -0,0 +1,99 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from livestock.growth import grouped_percentiles
+from livestock.models import Livestock, WeightMeasurement
+
+User = get_user_model()
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class GroupedPercentileTests(SimpleTestCase):
+    def test_matches_numpy_per_group(self):
+        rng = np.random.default_rng(7)
+        values = rng.normal(size=200)
+        values[::17] = np.nan
+        codes = rng.integers(0, 3, size=200)
+        result = grouped_percentiles(values, codes, 4, (10, 50, 90))
+        for code in range(3):
+            group = values[(codes == code) & ~np.isnan(values)]
+            np.testing.assert_allclose(result[code], np.percentile(group, (10, 50, 90)))
+        self.assertTrue(np.isnan(result[3]).all())
+
+
+@override_settings(AUTH_USER_CACHE_TTL=0)
+class GrowthTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        cls.other = User.objects.create_user('other', password='pw', role='standard')
+        # Eight steers gaining about 1 kg a day and one gaining 4.
+        cls.animals = [cls.create_animal(cls.user, f'G-{n}') for n in range(9)]
+        cls.foreign = cls.create_animal(cls.other, 'F-0')
+        # Drop the readings booked on creation so each animal has only the series below.
+        WeightMeasurement.objects.all().delete()
+        for n, animal in enumerate(cls.animals):
+            gain = 4 if n == 8 else 1 + n / 100
+            WeightMeasurement.objects.bulk_create([
+                WeightMeasurement(
+                    livestock=animal, weight=Decimal(200 + gain * day), measured_at=START + timedelta(days=day),
+                )
+                for day in (0, 10, 20)
+            ])
+
+    @classmethod
+    def create_animal(cls, owner, tag_number):
+        return Livestock.objects.create(
+            owner=owner, tag_number=tag_number, animal_type='cattle', breed='Angus', gender='male',
+            birth_date=date(2023, 6, 1), weight=Decimal('200'),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_ingest_appends_readings_and_moves_the_current_weight(self):
+        animal, foreign = self.animals[0], self.foreign
+        response = self.client.post('/api/livestock/weights/', [
+            {'livestock': animal.pk, 'weight': '260.50', 'measured_at': (START + timedelta(days=30)).isoformat()},
+            {'tag_number': animal.tag_number, 'weight': '230', 'measured_at': (START + timedelta(days=25)).isoformat()},
+            {'livestock': foreign.pk, 'weight': '100'},
+            {'tag_number': 'G-0', 'weight': '-1'},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual(sorted(error['row'] for error in response.json()['errors']), [2, 3])
+
+        animal.refresh_from_db()
+        self.assertEqual(animal.weight, Decimal('260.50'))
+        self.assertEqual(animal.weight_measurements.count(), 5)
+        self.assertFalse(foreign.weight_measurements.exists())
+
+    def test_growth_reports_daily_gain_and_flags_the_outlier(self):
+        response = self.client.get('/api/livestock/growth/')
+        self.assertEqual(response.status_code, 200)
+        results = {row['tag_number']: row for row in response.json()['results']}
+        self.assertEqual(len(results), 9)
+        self.assertEqual(results['G-0']['average_daily_gain'], 1.0)
+        self.assertEqual(results['G-0']['readings'], 3)
+        self.assertEqual(results['G-0']['days_tracked'], 20.0)
+        self.assertEqual(results['G-8']['average_daily_gain'], 4.0)
+        self.assertEqual([tag for tag, row in results.items() if row['is_outlier']], ['G-8'])
+
+        outliers = self.client.get('/api/livestock/growth/', {'outliers': 'true'}).json()['results']
+        self.assertEqual([row['tag_number'] for row in outliers], ['G-8'])
+
+    def test_percentiles_per_group(self):
+        response = self.client.get('/api/livestock/growth/percentiles/', {'group_by': 'breed'})
+        self.assertEqual(response.status_code, 200)
+        (row,) = response.json()['results']
+        gains = [1 + n / 100 for n in range(8)] + [4]
+        self.assertEqual(row['group'], 'Angus')
+        self.assertEqual(row['animals'], 9)
+        self.assertAlmostEqual(row['p50'], float(np.percentile(gains, 50)), places=4)
+        self.assertAlmostEqual(row['mean'], float(np.mean(gains)), places=4)
@@ -0,0 +1,99 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from health_records.models import HealthRecord
+from livestock.models import Livestock
+
+User = get_user_model()
+PERIOD = {'since': '2024-06-01', 'until': '2024-06-30'}
+
+
+@override_settings(AUTH_USER_CACHE_TTL=0)
+class HealthAnalyticsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        cls.other = User.objects.create_user('other', password='pw', role='standard')
+        cattle = [cls.create_animal(cls.user, f'C-{n}', 'cattle') for n in range(10)]
+        goats = [cls.create_animal(cls.user, f'G-{n}', 'goat') for n in range(5)]
+        foreign = [cls.create_animal(cls.other, f'F-{n}', 'cattle') for n in range(6)]
+
+        # Six cattle fall ill over three days at the end of June; the other
+        # owner's identical cluster must not leak into the owner's numbers.
+        for animals in (cattle, foreign):
+            for n, animal in enumerate(animals[:6]):
+                cls.create_record(animal, 'illness', date(2024, 6, 27 + n // 2), '10')
+        cls.create_record(goats[0], 'illness', date(2024, 6, 10), '50')
+        cls.create_record(cattle[0], 'checkup', date(2024, 5, 15), '20')
+
+    @classmethod
+    def create_animal(cls, owner, tag_number, animal_type):
+        return Livestock.objects.create(
+            owner=owner, tag_number=tag_number, animal_type=animal_type, breed='Mixed', gender='female',
+            birth_date=date(2020, 1, 1), weight=Decimal('100'),
+        )
+
+    @classmethod
+    def create_record(cls, animal, record_type, record_date, cost):
+        return HealthRecord.objects.create(
+            livestock=animal, record_type=record_type, date=record_date, diagnosis='-', treatment='-',
+            cost=Decimal(cost), created_by=animal.owner,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, path, **params):
+        response = self.client.get(f'/api/health/analytics/{path}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_rolling_incidence_per_animal_type(self):
+        data = self.get('incidence', window=30, step=29, **PERIOD)
+        results = {row['group']: row for row in data['results']}
+        self.assertEqual((results['cattle']['animals'], results['cattle']['cases']), (10, 6))
+        self.assertEqual(
+            [(point['date'], point['cases'], point['incidence']) for point in results['cattle']['series']],
+            [('2024-06-01', 0, 0.0), ('2024-06-30', 6, 60.0)],
+        )
+        self.assertEqual(results['cattle']['peak_incidence'], 60.0)
+        self.assertEqual((results['goat']['cases'], results['goat']['series'][-1]['incidence']), (1, 20.0))
+
+    def test_outbreak_detection_flags_the_cluster(self):
+        (outbreak,) = self.get('outbreaks', window=7, **PERIOD)['results']
+        self.assertEqual(outbreak['group'], 'cattle')
+        self.assertEqual((outbreak['start'], outbreak['end']), ('2024-06-23', '2024-06-30'))
+        self.assertEqual((outbreak['days_flagged'], outbreak['peak_cases']), (2, 6))
+        self.assertEqual(self.get('outbreaks', window=7, min_cases=7, **PERIOD)['results'], [])
+
+    def test_monthly_costs(self):
+        data = self.get('costs/monthly', since='2024-05-01', until='2024-06-30')
+        self.assertEqual(data['animals'], 15)
+        self.assertEqual(data['total_cost'], 130.0)
+        self.assertEqual(
+            [(row['month'][:7], row['records'], row['total_cost'], row['cumulative_cost']) for row in data['months']],
+            [('2024-05', 1, 20.0, 20.0), ('2024-06', 7, 110.0, 130.0)],
+        )
+        self.assertEqual(data['months'][1]['cost_per_animal'], 7.33)
+
+    def test_cost_per_animal(self):
+        data = self.get('costs/animals', since='2024-05-01', until='2024-06-30', limit=2)
+        groups = {row['group']: row for row in data['groups']}
+        self.assertEqual((groups['cattle']['animals'], groups['cattle']['total_cost']), (6, 80.0))
+        self.assertEqual(groups['cattle']['mean_cost'], 13.33)
+        self.assertEqual(
+            [(row['tag_number'], row['total_cost']) for row in data['top_animals']],
+            [('G-0', 50.0), ('C-0', 30.0)],
+        )
+        self.assertEqual(data['top_animals'][1]['percentile'], 100.0)
+
+    def test_invalid_range_is_rejected(self):
+        response = self.client.get('/api/health/analytics/incidence/', {'since': '2024-07-01', 'until': '2024-06-01'})
+        self.assertEqual(response.status_code, 400)
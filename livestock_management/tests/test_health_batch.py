@@ -0,0 +1,57 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from health_records.models import HealthRecord, HealthRecordDailyRollup
+from livestock.models import Livestock
+
+User = get_user_model()
+
+RECORD = {
+    'record_type': 'vaccination', 'date': '2024-05-01', 'diagnosis': 'Routine',
+    'treatment': 'Clostridial vaccine', 'cost': '2.50',
+}
+
+
+class HealthRecordBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        cls.other = User.objects.create_user('other', password='pw', role='standard')
+        cls.animals = [
+            Livestock.objects.create(
+                owner=owner, tag_number=f'H-{n}', animal_type='sheep', breed='Merino', gender='female',
+                birth_date=date(2021, 1, 1), weight=Decimal('60'),
+            )
+            for n, owner in enumerate([cls.user, cls.user, cls.user, cls.other])
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, **targets):
+        return self.client.post('/api/health/records/batch/', {'record': RECORD, **targets}, format='json')
+
+    def test_one_record_per_animal_and_one_rollup_row(self):
+        response = self.post(livestock=[self.animals[0].pk], tag_numbers=['H-1', 'H-2'])
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['created'], 3)
+        self.assertEqual(HealthRecord.objects.filter(created_by=self.user).count(), 3)
+        rollup = HealthRecordDailyRollup.objects.get(owner=self.user)
+        self.assertEqual((rollup.records, rollup.cost), (3, Decimal('7.50')))
+
+    def test_foreign_animals_reject_the_whole_batch(self):
+        response = self.post(tag_numbers=['H-0', 'H-3'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['tag_numbers'], ['H-3'])
+        self.assertFalse(HealthRecord.objects.exists())
+
+    @override_settings(HEALTH_RECORD_BATCH_MAX_SIZE=2)
+    def test_batches_are_capped(self):
+        self.assertEqual(self.post(livestock=[self.animals[0].pk], tag_numbers=['H-1', 'H-2']).status_code, 400)
+        self.assertFalse(HealthRecord.objects.exists())
+        self.assertEqual(self.post(tag_numbers=['H-1', 'H-2']).status_code, 201)
@@ -0,0 +1,69 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import claim_jobs, enqueue, fail_job, requeue_stale_jobs, run_job
+from jobs.worker import Worker
+
+User = get_user_model()
+
+
+# Closing connections would end the test transaction.
+@mock.patch('jobs.queue.close_old_connections', lambda: None)
+class JobTransitionTests(TestCase):
+    """
+    A worker that lost its job to the stale check must not change it
+    afterwards.
+    """
+    def setUp(self):
+        user = User.objects.create_user('owner', password='pw', role='standard')
+        self.job = enqueue('livestock.rebuild_summary', user=user)
+        claim_jobs('old', 1)
+        Job.objects.filter(pk=self.job.pk).update(updated_at=timezone.now() - timedelta(minutes=10))
+        self.assertEqual(requeue_stale_jobs(300), 1)
+        Job.objects.filter(pk=self.job.pk).update(run_after=timezone.now())
+        claim_jobs('new', 1)
+
+    def assert_running_on_new_worker(self):
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertEqual((job.status, job.worker, job.attempts), ('running', 'new', 2))
+
+    def test_stale_worker_cannot_fail_or_finish_the_job(self):
+        self.assertFalse(fail_job(self.job.pk, 'old', 'late failure'))
+        run_job(self.job.pk, 'old')
+        self.assert_running_on_new_worker()
+
+    def test_stale_check_skips_jobs_with_a_fresh_heartbeat(self):
+        self.assertEqual(requeue_stale_jobs(300), 0)
+        self.assert_running_on_new_worker()
+
+    def test_current_worker_finishes_the_job(self):
+        run_job(self.job.pk, 'new')
+        self.assertEqual(Job.objects.get(pk=self.job.pk).status, 'succeeded')
+
+    def test_stale_worker_cannot_report_progress(self):
+        job = Job.objects.get(pk=self.job.pk)
+        job.worker = 'old'
+        self.assertFalse(job.set_progress(50))
+        job = Job.objects.get(pk=self.job.pk)
+        self.assertTrue(job.set_progress(50, 'half way'))
+        self.assertEqual(Job.objects.get(pk=self.job.pk).progress, 50)
+
+
+class WorkerTests(TestCase):
+    def test_keeps_polling_after_losing_the_database(self):
+        worker = Worker(concurrency=1, poll_interval=0, burst=True)
+        worker.make_pool = mock.Mock()
+        claims = [OperationalError('server closed the connection unexpectedly'), []]
+        with mock.patch('jobs.worker.claim_jobs', side_effect=claims), \
+                mock.patch('jobs.worker.connection') as connection, \
+                mock.patch('jobs.worker.close_old_connections'), \
+                mock.patch('jobs.worker.signal.signal'), \
+                self.assertLogs('jobs.worker', 'ERROR'):
+            worker.run()
+        connection.close.assert_called_once_with()
@@ -0,0 +1,75 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from livestock.models import Livestock, LivestockSummary
+
+User = get_user_model()
+
+
+@override_settings(AUTH_USER_CACHE_TTL=0)
+class LivestockSummaryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        cls.other = User.objects.create_user('other', password='pw', role='standard')
+        for n, (animal_type, status) in enumerate([
+            ('cattle', 'healthy'), ('cattle', 'healthy'), ('goat', 'sick'), ('sheep', 'healthy'),
+        ]):
+            cls.create_animal(cls.user, f'S-{n}', animal_type, status)
+        cls.create_animal(cls.other, 'O-0', 'pig', 'healthy')
+
+    @classmethod
+    def create_animal(cls, owner, tag_number, animal_type='cattle', status='healthy'):
+        return Livestock.objects.create(
+            owner=owner, tag_number=tag_number, animal_type=animal_type, breed='Mixed', gender='female',
+            birth_date=date(2020, 1, 1), weight=Decimal('100'), status=status,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_stats(self):
+        response = self.client.get('/api/livestock/stats/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def get_summary(self):
+        return sorted(LivestockSummary.objects.filter(count__gt=0).values_list(
+            'owner_id', 'animal_type', 'status', 'count'))
+
+    def test_stats_count_only_the_owners_herd(self):
+        stats = self.get_stats()
+        self.assertEqual(stats['total_livestock'], 4)
+        self.assertEqual(stats['by_type'], {'cattle': 2, 'goat': 1, 'sheep': 1})
+        self.assertEqual(stats['by_status'], {'healthy': 3, 'sick': 1})
+        self.assertEqual((stats['healthy_count'], stats['sick_count']), (3, 1))
+
+    def test_status_changes_and_deletes_keep_the_summary_current(self):
+        animal = Livestock.objects.get(tag_number='S-0')
+        animal.status = 'sick'
+        animal.save()
+        Livestock.objects.get(tag_number='S-2').delete()
+        self.create_animal(self.user, 'S-9', 'goat', 'pregnant')
+
+        stats = self.get_stats()
+        self.assertEqual(stats['total_livestock'], 4)
+        self.assertEqual(stats['by_type'], {'cattle': 2, 'goat': 1, 'sheep': 1})
+        self.assertEqual(stats['by_status'], {'healthy': 2, 'sick': 1, 'pregnant': 1})
+
+    def test_incremental_summary_matches_a_rebuild(self):
+        animal = Livestock.objects.get(tag_number='S-3')
+        animal.animal_type = 'goat'
+        animal.owner = self.other
+        animal.save()
+        Livestock.objects.get(tag_number='S-1').delete()
+        incremental = self.get_summary()
+
+        call_command('rebuild_livestock_summary', stdout=StringIO())
+        self.assertEqual(self.get_summary(), incremental)
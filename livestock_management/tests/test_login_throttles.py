@@ -0,0 +1,42 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+
+from accounts.models import User
+
+RATES = {'login': '100/min', 'login_username': '3/min', 'register': None}
+
+
+@mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, RATES)
+class LoginThrottleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='farmer', password='correct-horse')
+
+    def setUp(self):
+        caches['throttle'].clear()
+        self.client = APIClient()
+
+    def login(self, password, address='10.0.0.1', **extra):
+        return self.client.post(
+            '/api/auth/login/', {'username': 'farmer', 'password': password},
+            format='json', REMOTE_ADDR=address, **extra,
+        )
+
+    def test_successful_logins_do_not_count(self):
+        for _ in range(5):
+            self.assertEqual(self.login('correct-horse').status_code, 200)
+
+    def test_failures_lock_out_only_the_failing_address(self):
+        for _ in range(3):
+            self.assertEqual(self.login('wrong').status_code, 400)
+        self.assertEqual(self.login('correct-horse').status_code, 429)
+        self.assertEqual(self.login('correct-horse', address='10.0.0.2').status_code, 200)
+
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        for n in range(3):
+            self.login('wrong', HTTP_X_FORWARDED_FOR=f'192.0.2.{n}')
+        self.assertEqual(self.login('correct-horse', HTTP_X_FORWARDED_FOR='192.0.2.99').status_code, 429)
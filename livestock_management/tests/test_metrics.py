@@ -0,0 +1,36 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from livestock_management.metrics import HISTOGRAMS, REQUEST_DURATION
+
+
+class MetricsTokenTests(SimpleTestCase):
+    @override_settings(DEBUG=False, METRICS_TOKEN='')
+    def test_denied_without_a_token_outside_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    @override_settings(DEBUG=True, METRICS_TOKEN='')
+    def test_served_without_a_token_in_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='secret')
+    def test_requires_the_token(self):
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').status_code, 200)
+
+
+@override_settings(METRICS_TOKEN='secret')
+class MetricsAggregationTests(SimpleTestCase):
+    def test_sums_the_histograms_of_every_process(self):
+        labels = ['other-view', 'GET', '200']
+        counts = [1] + [0] * len(REQUEST_DURATION.buckets)
+        other = {histogram.name: [] for histogram in HISTOGRAMS}
+        other[REQUEST_DURATION.name] = [[labels, counts, 0.001]]
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_DIR=directory):
+            for process in ('host-1', 'host-2'):
+                (Path(directory) / f'{process}.json').write_text(json.dumps(other))
+            body = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="other-view",method="GET",status="200"} 2', body)
@@ -0,0 +1,50 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from health_records.models import HealthRecord
+from livestock.models import Livestock
+
+User = get_user_model()
+
+
+class OwnerDeletionTests(TestCase):
+    def create_animal(self, owner, tag_number, **kwargs):
+        return Livestock.objects.create(
+            owner=owner, tag_number=tag_number, animal_type='cattle', breed='Holstein', gender='female',
+            birth_date=date(2019, 1, 1), weight=Decimal('400'), **kwargs,
+        )
+
+    def delete_owner_with_herd(self, size):
+        owner = User.objects.create_user(f'owner-{size}', password='pw', role='standard')
+        for n in range(size):
+            animal = self.create_animal(owner, f'{size}-{n}')
+            HealthRecord.objects.create(
+                livestock=animal, record_type='checkup', date=date.today(), diagnosis='-', treatment='-',
+                created_by=owner,
+            )
+        with CaptureQueriesContext(connection) as queries:
+            owner.delete()
+        return len(queries)
+
+    def test_queries_do_not_grow_with_the_herd(self):
+        self.assertEqual(self.delete_owner_with_herd(2), self.delete_owner_with_herd(8))
+
+    def test_other_owners_offspring_are_recomputed(self):
+        seller = User.objects.create_user('seller', password='pw', role='standard')
+        buyer = User.objects.create_user('buyer', password='pw', role='standard')
+        sire = self.create_animal(seller, 'S')
+        dam = self.create_animal(seller, 'D', sire=sire)
+        calf = self.create_animal(seller, 'C', sire=sire, dam=dam)
+        calf.owner = buyer
+        calf.save()
+        calf.refresh_from_db()
+        self.assertEqual(calf.inbreeding_coefficient, 0.25)
+
+        seller.delete()
+        calf.refresh_from_db()
+        self.assertEqual((calf.sire_id, calf.dam_id, calf.inbreeding_coefficient), (None, None, 0))
@@ -0,0 +1,19 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        user = User.objects.create_user('owner', password='pw', role='standard')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def test_cursor_mode_rejects_ordering(self):
+        for url in ['/api/livestock/', '/api/livestock/async/', '/api/health/records/', '/api/breeding/']:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url, {'pagination': 'cursor', 'ordering': 'created_at'}).status_code, 400)
+                self.assertEqual(self.client.get(url, {'ordering': 'created_at'}).status_code, 200)
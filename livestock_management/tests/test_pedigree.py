@@ -0,0 +1,94 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from livestock.models import Livestock
+
+User = get_user_model()
+
+
+@override_settings(AUTH_USER_CACHE_TTL=0, BREEDING_MAX_INBREEDING=0.0625)
+class PedigreeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        cls.founder_sire = cls.create_animal('S', 'male')
+        cls.founder_dam = cls.create_animal('D', 'female')
+        # A full brother and sister, an unrelated bull and the brother-sister calf.
+        cls.son = cls.create_animal('A', 'male', sire=cls.founder_sire, dam=cls.founder_dam)
+        cls.daughter = cls.create_animal('B', 'female', sire=cls.founder_sire, dam=cls.founder_dam)
+        cls.outsider = cls.create_animal('U', 'male')
+        cls.calf = cls.create_animal('C', 'female', sire=cls.son, dam=cls.daughter)
+
+    @classmethod
+    def create_animal(cls, tag_number, gender, **parents):
+        return Livestock.objects.create(
+            owner=cls.user, tag_number=tag_number, animal_type='cattle', breed='Angus', gender=gender,
+            birth_date=date(2020, 1, 1), weight=Decimal('400'), **parents,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, path, params=None):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_inbreeding_of_a_full_sibling_mating(self):
+        self.calf.refresh_from_db()
+        self.assertEqual(self.calf.inbreeding_coefficient, 0.25)
+        self.son.refresh_from_db()
+        self.assertEqual(self.son.inbreeding_coefficient, 0)
+
+    def test_pedigree_and_descendants(self):
+        data = self.get(f'/api/livestock/{self.calf.pk}/pedigree/', {'generations': 2})
+        self.assertEqual(
+            [(row['tag_number'], row['generation']) for row in data['ancestors']],
+            [('A', 1), ('B', 1), ('S', 2), ('D', 2)],
+        )
+        data = self.get(f'/api/livestock/{self.calf.pk}/pedigree/', {'generations': 1})
+        self.assertEqual(sorted(row['tag_number'] for row in data['ancestors']), ['A', 'B'])
+
+        data = self.get(f'/api/livestock/{self.founder_sire.pk}/descendants/')
+        self.assertEqual(
+            sorted((row['tag_number'], row['generation']) for row in data['descendants']),
+            [('A', 1), ('B', 1), ('C', 2)],
+        )
+
+    def test_reparenting_updates_descendants(self):
+        self.daughter.sire = self.outsider
+        self.daughter.save()
+        # The calf's parents are now half siblings through the dam.
+        self.calf.refresh_from_db()
+        self.assertEqual(self.calf.inbreeding_coefficient, 0.125)
+
+    def test_pairings_rank_unrelated_sires_first(self):
+        data = self.get('/api/breeding/pairings/', {'dam': self.daughter.pk})
+        # Her father and her full brother give the same coefficient; ties go by id.
+        self.assertEqual(data['candidates'], 3)
+        results = [(row['tag_number'], row['inbreeding_coefficient'], row['acceptable']) for row in data['results']]
+        self.assertEqual(results, [('U', 0.0, True), ('S', 0.25, False), ('A', 0.25, False)])
+        self.assertEqual(data['results'][0]['common_ancestors'], [])
+        self.assertEqual(
+            sorted(data['results'][2]['common_ancestors']), sorted([self.founder_sire.pk, self.founder_dam.pk]),
+        )
+
+    def test_breeding_event_records_expected_inbreeding(self):
+        response = self.client.post('/api/breeding/', {
+            'dam': self.daughter.pk, 'sire': self.son.pk, 'date': '2024-03-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['inbreeding_coefficient'], 0.25)
+
+        response = self.client.post('/api/breeding/', {
+            'dam': self.daughter.pk, 'sire': self.calf.pk, 'date': '2024-03-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('sire', response.json())
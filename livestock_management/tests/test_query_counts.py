@@ -0,0 +1,133 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+from rest_framework_simplejwt.tokens import AccessToken
+
+from breeding.models import BreedingEvent
+from health_records.models import HealthRecord
+from health_records.reminders import queue_reminders
+from jobs.models import Job
+from livestock.models import Livestock, WeightMeasurement
+from livestock_management.pagination import KeysetPagination
+
+User = get_user_model()
+
+SMALL_PAGE, LARGE_PAGE = 2, 20
+
+
+# Users are loaded on every request.
+@override_settings(AUTH_USER_CACHE_TTL=0)
+class QueryCountTests(TestCase):
+    """
+    Every list endpoint runs the same number of queries whatever the page
+    size, and every detail endpoint the same whatever the object's relations,
+    i.e. nothing is loaded per row.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        today = date.today()
+        sire = Livestock.objects.create(
+            owner=cls.user, tag_number='S-0', animal_type='cattle', breed='Holstein', gender='male',
+            birth_date=date(2012, 1, 1), weight=Decimal('700'),
+        )
+        cls.animals = [sire]
+        for index in range(LARGE_PAGE + 5):
+            dam = Livestock.objects.create(
+                owner=cls.user, tag_number=f'D-{index}', animal_type='cattle', breed='Holstein', gender='female',
+                birth_date=date(2014, 1, 1), weight=Decimal('500') + index,
+            )
+            calf = Livestock.objects.create(
+                owner=cls.user, tag_number=f'C-{index}', animal_type='cattle', breed='Holstein',
+                gender='female', birth_date=date(2018, 1, 1), weight=Decimal('200'), sire=sire, dam=dam,
+            )
+            cls.animals += [dam, calf]
+            HealthRecord.objects.create(
+                livestock=calf, record_type='checkup', date=today, diagnosis='Fine', treatment='None',
+                next_appointment=today + timedelta(days=2), created_by=cls.user,
+            )
+            BreedingEvent.objects.create(dam=dam, sire=sire, date=today, created_by=cls.user)
+            Job.objects.create(name='livestock.rebuild_summary', created_by=cls.user)
+        queue_reminders(today=today)
+        cls.calf = Livestock.objects.filter(sire__isnull=False).first()
+        WeightMeasurement.objects.bulk_create([
+            WeightMeasurement(livestock=cls.calf, weight=Decimal('200') + index) for index in range(LARGE_PAGE)
+        ])
+        cls.record = HealthRecord.objects.first()
+        cls.event = BreedingEvent.objects.first()
+
+    def setUp(self):
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(self.user)}'
+
+    def get(self, url, page_size=LARGE_PAGE):
+        # Cached responses and users would hide the queries being counted.
+        cache.clear()
+        with mock.patch.object(PageNumberPagination, 'page_size', page_size), \
+                mock.patch.object(KeysetPagination, 'page_size', page_size):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def count_queries(self, url, page_size=LARGE_PAGE):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(url, page_size)
+        return len(queries), response
+
+    def assert_constant_for_page_sizes(self, url, results_key='results'):
+        expected, small = self.count_queries(url, SMALL_PAGE)
+        with self.assertNumQueries(expected):
+            large = self.get(url, LARGE_PAGE)
+        self.assertLess(len(small.json()[results_key]), len(large.json()[results_key]))
+
+    def assert_constant_for_objects(self, url_template, *pks):
+        expected, _ = self.count_queries(url_template.format(pks[0]))
+        for pk in pks[1:]:
+            with self.assertNumQueries(expected):
+                self.get(url_template.format(pk))
+
+    def test_list_endpoints(self):
+        for url in [
+            '/api/livestock/',
+            '/api/livestock/?compact=true',
+            '/api/livestock/?pagination=cursor',
+            '/api/livestock/?fields=id,tag_number,owner_name,sire',
+            '/api/livestock/?search=Holstein&ordering=-weight',
+            f'/api/livestock/{self.calf.pk}/weights/',
+            '/api/livestock/async/',
+            '/api/livestock/async/?pagination=cursor',
+            '/api/health/records/',
+            '/api/health/records/?compact=true',
+            '/api/health/records/?pagination=cursor',
+            '/api/health/records/due/',
+            '/api/health/records/async/',
+            '/api/health/reminders/',
+            '/api/breeding/',
+            '/api/breeding/?pagination=cursor',
+            '/api/jobs/',
+        ]:
+            with self.subTest(url=url):
+                self.assert_constant_for_page_sizes(url)
+
+    def test_detail_endpoints(self):
+        # A founder without parents or records and an animal with both.
+        founder, calf = self.animals[0].pk, self.calf.pk
+        record_ids = list(HealthRecord.objects.values_list('pk', flat=True)[:2])
+        event_ids = list(BreedingEvent.objects.values_list('pk', flat=True)[:2])
+        job_ids = list(Job.objects.values_list('pk', flat=True)[:2])
+        for url_template, pks in [
+            ('/api/livestock/{}/', (founder, calf)),
+            ('/api/livestock/async/{}/', (founder, calf)),
+            ('/api/health/records/{}/', record_ids),
+            ('/api/health/records/async/{}/', record_ids),
+            ('/api/breeding/{}/', event_ids),
+            ('/api/jobs/{}/', job_ids),
+        ]:
+            with self.subTest(url=url_template):
+                self.assert_constant_for_objects(url_template, *pks)
@@ -0,0 +1,53 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from livestock.models import Livestock
+
+User = get_user_model()
+
+
+@override_settings(AUTH_USER_CACHE_TTL=30)
+class ResponseCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def add_animal(self, tag_number):
+        Livestock.objects.create(
+            owner=self.user, tag_number=tag_number, animal_type='cattle', breed='Holstein',
+            gender='female', birth_date=date(2020, 1, 1), weight=Decimal('500'),
+        )
+
+    def test_hits_run_no_queries(self):
+        self.add_animal('A-1')
+        for url in ['/api/livestock/stats/', '/api/livestock/']:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.client.get(url)
+                self.assertEqual(second.json(), first.json())
+
+    def test_changes_invalidate_cached_responses(self):
+        self.add_animal('A-1')
+        self.assertEqual(self.client.get('/api/livestock/stats/').json()['total_livestock'], 1)
+        self.add_animal('A-2')
+        self.assertEqual(self.client.get('/api/livestock/stats/').json()['total_livestock'], 2)
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.client.get('/api/livestock/stats/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/livestock/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.add_animal('A-1')
+        self.assertEqual(self.client.get('/api/livestock/stats/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from health_records.models import HealthRecord, HealthRecordDailyRollup
+from livestock.models import Livestock
+from sync.models import Tombstone
+
+User = get_user_model()
+
+
+class RollupTransferTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = User.objects.create_user('seller', password='pw', role='standard')
+        cls.buyer = User.objects.create_user('buyer', password='pw', role='standard')
+        today = date.today()
+        cls.animals = []
+        for n, owner in enumerate([cls.seller, cls.seller, cls.buyer]):
+            animal = Livestock.objects.create(
+                owner=owner, tag_number=f'R-{n}', animal_type='cattle', breed='Holstein', gender='female',
+                birth_date=date(2019, 1, 1), weight=Decimal('400'),
+            )
+            cls.animals.append(animal)
+            for days, cost in [(0, Decimal('10.50')), (0, None), (3, Decimal('4'))]:
+                HealthRecord.objects.create(
+                    livestock=animal, record_type='checkup', date=today - timedelta(days=days),
+                    diagnosis='-', treatment='-', cost=cost, created_by=owner,
+                )
+
+    def get_rollups(self):
+        return sorted(HealthRecordDailyRollup.objects.values_list('owner_id', 'date', 'record_type', 'records', 'cost'))
+
+    def test_transfer_moves_only_the_animals_records(self):
+        animal = self.animals[0]
+        animal.owner = self.buyer
+        animal.save()
+        kept = self.get_rollups()
+        HealthRecordDailyRollup.rebuild()
+        self.assertEqual(kept, self.get_rollups())
+        seller_days = HealthRecordDailyRollup.objects.filter(owner=self.seller).values_list('records', flat=True)
+        self.assertEqual(sorted(seller_days), [1, 2])
+
+    def test_transfer_of_the_last_animal_empties_the_previous_owners_rollups(self):
+        for animal in self.animals[:2]:
+            animal.owner = self.buyer
+            animal.save()
+        self.assertFalse(HealthRecordDailyRollup.objects.filter(owner=self.seller).exists())
+
+    def test_deleting_an_animal_removes_its_records_in_bulk(self):
+        animal = self.animals[0]
+        record_ids = set(HealthRecord.objects.filter(livestock=animal).values_list('pk', flat=True))
+        animal.delete()
+        kept = self.get_rollups()
+        HealthRecordDailyRollup.rebuild()
+        self.assertEqual(kept, self.get_rollups())
+        self.assertEqual(
+            set(Tombstone.objects.filter(owner=self.seller, kind='health_record').values_list('object_id', flat=True)),
+            record_ids,
+        )
+
+    def test_animal_deletes_run_the_same_queries_for_any_number_of_records(self):
+        few, many = self.animals[1], self.animals[2]
+        for _ in range(10):
+            HealthRecord.objects.create(
+                livestock=many, record_type='vaccination', date=date.today(), diagnosis='-', treatment='-',
+                cost=Decimal('2'), created_by=self.buyer,
+            )
+        with CaptureQueriesContext(connection) as queries:
+            few.delete()
+        with self.assertNumQueries(len(queries)):
+            many.delete()
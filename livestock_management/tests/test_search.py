@@ -0,0 +1,48 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from livestock.models import Livestock
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('owner', password='pw', role='standard')
+        for tag_number, breed, notes in [
+            ('A-10', 'Holstein', ''),
+            ('A-2', 'Angus', "Bought from O'Brien"),
+            ('B-17', 'Jersey', 'Limps on the left hind leg'),
+        ]:
+            Livestock.objects.create(
+                owner=cls.user, tag_number=tag_number, animal_type='cattle', breed=breed, gender='female',
+                birth_date=date(2020, 1, 1), weight=Decimal('450'), notes=notes,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {AccessToken.for_user(self.user)}'
+
+    def search(self, term):
+        response = self.client.get('/api/livestock/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return sorted(animal['tag_number'] for animal in response.json()['results'])
+
+    def test_word_prefixes_match(self):
+        self.assertEqual(self.search('A-1'), ['A-10'])
+        self.assertEqual(self.search('holst'), ['A-10'])
+        self.assertEqual(self.search('A'), ['A-10', 'A-2'])
+        self.assertEqual(self.search('lim leg'), ['B-17'])
+        self.assertEqual(self.search('jersey angus'), [])
+
+    def test_query_syntax_is_taken_literally(self):
+        self.assertEqual(self.search("O'Brien"), ['A-2'])
+        for term in ['a & !b', "x':* | 'y", '\\', ':*', '(']:
+            with self.subTest(term=term):
+                self.search(term)
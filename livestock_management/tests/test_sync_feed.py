@@ -0,0 +1,123 @@
+import base64
+import json
+import threading
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from health_records.models import HealthRecord
+from livestock.models import Livestock
+from sync.feed import STREAMS
+
+User = get_user_model()
+
+
+# The feed only serves committed transactions, which TestCase never has.
+@override_settings(AUTH_USER_CACHE_TTL=0)
+class SyncFeedTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('owner', password='pw', role='standard')
+        for index in range(25):
+            self.create_animal(f'A-{index}')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_animal(self, tag_number):
+        return Livestock.objects.create(
+            owner=self.user, tag_number=tag_number, animal_type='cattle', breed='Holstein', gender='female',
+            birth_date=date(2018, 1, 1), weight=Decimal('400'),
+        )
+
+    def sync(self, cursor=None, limit=500):
+        params = {'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        response = self.client.get('/api/sync/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_queries_do_not_depend_on_the_page_size(self):
+        counts = []
+        for limit in (2, 20):
+            with CaptureQueriesContext(connection) as queries:
+                data = self.sync(limit=limit)
+            counts.append(len(queries))
+            self.assertEqual(len(data['livestock']['changed']), limit)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_pages_cover_every_change_once(self):
+        tags, cursor, more = [], None, True
+        while more:
+            data = self.sync(cursor, limit=7)
+            tags += [row['tag_number'] for row in data['livestock']['changed']]
+            cursor, more = data['cursor'], data['has_more']
+        self.assertEqual(sorted(tags), sorted(f'A-{index}' for index in range(25)))
+        self.assertEqual(self.sync(cursor)['livestock']['changed'], [])
+
+    def test_late_commit_is_not_skipped(self):
+        cursor = self.sync()['cursor']
+        slow, fast = Livestock.objects.order_by('pk')[:2]
+        written, release = threading.Event(), threading.Event()
+
+        def write_slowly():
+            # Starts writing first, so its transaction id is below the other one.
+            with transaction.atomic():
+                Livestock.objects.filter(pk=slow.pk).update(notes='slow')
+                written.set()
+                release.wait(10)
+            connection.close()
+
+        writer = threading.Thread(target=write_slowly)
+        writer.start()
+        written.wait(10)
+        Livestock.objects.filter(pk=fast.pk).update(notes='fast')
+        data = self.sync(cursor)
+        self.assertEqual(data['livestock']['changed'], [])
+
+        release.set()
+        writer.join()
+        data = self.sync(data['cursor'])
+        self.assertEqual(sorted(row['notes'] for row in data['livestock']['changed']), ['fast', 'slow'])
+
+    def test_deletions_and_updates_reach_the_feed(self):
+        cursor = self.sync()['cursor']
+        first, second = Livestock.objects.order_by('pk')[:2]
+        deleted_pk = first.pk
+        first.delete()
+        Livestock.objects.filter(pk=second.pk).update(status='sick')
+        data = self.sync(cursor)
+        self.assertEqual(data['livestock']['deleted'], [deleted_pk])
+        self.assertEqual([row['id'] for row in data['livestock']['changed']], [second.pk])
+
+    def test_health_records_follow_a_transferred_animal(self):
+        animal = Livestock.objects.order_by('pk').first()
+        record = HealthRecord.objects.create(
+            livestock=animal, record_type='checkup', date=date(2024, 1, 1), diagnosis='ok', treatment='none',
+            created_by=self.user,
+        )
+        self.assertEqual(record.owner_id, self.user.pk)
+        cursor = self.sync()['cursor']
+        buyer = User.objects.create_user('buyer', password='pw', role='standard')
+        animal.owner = buyer
+        animal.save()
+
+        self.assertEqual(self.sync(cursor)['health_records']['deleted'], [record.pk])
+        self.client.force_authenticate(buyer)
+        with CaptureQueriesContext(connection) as queries:
+            data = self.sync()
+        self.assertEqual([row['id'] for row in data['health_records']['changed']], [record.pk])
+        feed_sql = [q['sql'] for q in queries if 'FROM "health_records_healthrecord"' in q['sql']]
+        self.assertTrue(feed_sql)
+        self.assertFalse(any('JOIN "livestock_livestock"' in sql for sql in feed_sql))
+
+    def test_cursors_from_before_transaction_ordering_reset(self):
+        position = ['2024-01-01T00:00:00+00:00', 1]
+        legacy = base64.urlsafe_b64encode(json.dumps(dict.fromkeys(STREAMS, position)).encode()).decode()
+        data = self.sync(legacy)
+        self.assertTrue(data['reset'])
+        self.assertEqual(len(data['livestock']['changed']), 25)
@@ -3,11 +3,20 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from .events import EventStreamView, EventTicketView
+from .metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('accounts.urls')),
     path('api/livestock/', include('livestock.urls')),
     path('api/health/', include('health_records.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('api/sync/', include('sync.urls')),
+    path('api/breeding/', include('breeding.urls')),
+    path('api/events/', EventStreamView.as_view(), name='events'),
+    path('api/events/ticket/', EventTicketView.as_view(), name='event-ticket'),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
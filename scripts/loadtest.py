@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+HTTP load generator for the Django API.
+
+Logs in once, then fires GET requests at the given paths from a pool of
+worker threads, each holding its own keep-alive connection, and prints
+throughput and latency percentiles as JSON. Uses only the standard library
+and this repository's livestock_management.percentiles, so it can run next to
+any deployment without installing Django:
+
+    python scripts/loadtest.py --base-url http://127.0.0.1:8000 \\
+        --username admin --password secret --concurrency 32 --requests 5000 \\
+        /api/livestock/ /api/livestock/stats/
+"""
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from livestock_management.percentiles import percentile  # noqa: E402
+
+
+def login(base_url, username, password):
+    parts = urlsplit(base_url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    body = json.dumps({'username': username, 'password': password})
+    connection.request('POST', '/api/auth/login/', body, {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    payload = json.loads(response.read())
+    if response.status != 200:
+        sys.exit(f'Login failed ({response.status}): {payload}')
+    return payload['access']
+
+
+def run(base_url, paths, token, concurrency, total_requests, timeout=30):
+    parts = urlsplit(base_url)
+    headers = {'Authorization': f'Bearer {token}', 'Connection': 'keep-alive'}
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+    start_barrier = threading.Barrier(concurrency + 1)
+
+    def worker():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+        local_latencies, local_errors = [], []
+        start_barrier.wait()
+        while True:
+            with lock:
+                number = next(counter, None)
+            if number is None:
+                break
+            path = paths[number % len(paths)]
+            started = time.perf_counter()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors.append(response.status)
+                if response.getheader('Connection', '').lower() == 'close':
+                    connection.close()
+            except (OSError, http.client.HTTPException) as exc:
+                local_errors.append(type(exc).__name__)
+                connection.close()
+            local_latencies.append(time.perf_counter() - started)
+        connection.close()
+        with lock:
+            latencies.extend(local_latencies)
+            errors.extend(local_errors)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'paths': paths,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'error_samples': errors[:10],
+        'elapsed_s': round(elapsed, 3),
+        'requests_per_s': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+            'p50': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+            'p95': round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+            'p99': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('paths', nargs='*', default=['/api/livestock/'])
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--username')
+    parser.add_argument('--password')
+    parser.add_argument('--token', help='Use this access token instead of logging in')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--warmup', type=int, default=50, help='Requests sent before measuring')
+    parser.add_argument('--label', help='Free-form label stored with the result')
+    args = parser.parse_args()
+
+    token = args.token or login(args.base_url, args.username, args.password)
+    if args.warmup:
+        run(args.base_url, args.paths, token, min(args.concurrency, args.warmup), args.warmup)
+    result = run(args.base_url, args.paths, token, args.concurrency, args.requests)
+    if args.label:
+        result['label'] = args.label
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
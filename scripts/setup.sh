@@ -147,10 +147,6 @@ run_migrations() {
     cd backend
     source ../venv/bin/activate
     
-    python manage.py makemigrations
-    python manage.py makemigrations accounts
-    python manage.py makemigrations livestock
-    python manage.py makemigrations health_records
     python manage.py migrate
     
     cd ..
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Tombstone
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ('owner', 'kind', 'object_id', 'transferred', 'deleted_at')
+    list_filter = ('kind', 'transferred', 'deleted_at')
+    search_fields = ('owner__username',)
+    readonly_fields = ('owner', 'kind', 'object_id', 'transferred', 'deleted_at')
@@ -0,0 +1,139 @@
+"""
+Change feed for offline-capable clients.
+
+A client keeps the opaque cursor of its last sync and sends it back to get
+only the Livestock and HealthRecord rows created or updated since, plus the
+ids of rows that left its herd (Tombstone). Each stream is read in
+(change_txid, id) order off an index, so a sync costs the number of changes
+rather than the size of the herd.
+
+change_txid is the id of the transaction that last wrote a row, set by a
+trigger installed by the sync migrations; it also covers bulk_create() and
+update(). Transaction ids are handed out when a transaction starts
+writing, not when it commits, so the feed only serves
+rows below the oldest transaction still running: everything there has
+committed, and no later commit can land behind a cursor that moved past it.
+A long transaction holds the feed back until it finishes instead of its
+rows being skipped.
+"""
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from livestock_management.fastpath import get_row_plan
+from livestock_management.optimization import optimize_queryset
+
+STREAMS = ('livestock', 'health_records', 'deleted')
+# Position of a stream that has served everything below its horizon.
+END_OF_STREAM = 2 ** 63 - 1
+
+
+def get_horizon():
+    """
+    The oldest transaction id still running; every row below it has
+    committed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT txid_snapshot_xmin(txid_current_snapshot())')
+        return cursor.fetchone()[0]
+
+
+def end_position(horizon):
+    return horizon - 1, END_OF_STREAM
+
+
+def is_expired(cursor, now=None):
+    """
+    Whether tombstones the cursor has not seen may have been pruned, in
+    which case the client has to start over from a full sync.
+    """
+    cutoff = (now or timezone.now()) - timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+    return cursor['since'] is None or cursor['since'] < cutoff
+
+
+def encode_cursor(positions, since):
+    payload = {name: [txid, pk] for name, (txid, pk) in positions.items()}
+    payload['since'] = since.isoformat()
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(encoded):
+    """
+    Returns {stream: (txid, pk), 'since': issue time}; raises ValueError
+    for anything that is not a cursor issued by encode_cursor(). Cursors
+    from before the feed was ordered by transaction have no issue time and
+    are treated as expired.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        if 'since' not in payload and all(name in payload for name in STREAMS):
+            return {'since': None}
+        since = parse_datetime(payload['since'])
+        if since is None or timezone.is_naive(since):
+            raise ValueError('Invalid cursor time')
+        cursor = {'since': since}
+        for name in STREAMS:
+            txid, pk = payload[name]
+            if not isinstance(txid, int) or not isinstance(pk, int):
+                raise ValueError(f'Invalid {name} position')
+            cursor[name] = txid, pk
+        return cursor
+    except (TypeError, KeyError, AttributeError, json.JSONDecodeError, UnicodeDecodeError) as exc:
+        raise ValueError('Invalid cursor') from exc
+
+
+def changed_since(queryset, position, horizon):
+    """
+    Rows after position and below horizon, in (change_txid, id) order.
+    """
+    queryset = queryset.filter(change_txid__lt=horizon)
+    if position is not None:
+        txid, pk = position
+        queryset = queryset.filter(Q(change_txid__gt=txid) | Q(change_txid=txid, pk__gt=pk))
+    return queryset.order_by('change_txid', 'pk')
+
+
+def next_position(rows, limit, horizon):
+    """
+    Returns the page, the stream's next position and whether it has more;
+    rows holds up to limit + 1 rows.
+    """
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        return rows[:limit], (last.change_txid, last.pk), True
+    return rows, end_position(horizon), False
+
+
+def read_changes(queryset, serializer_class, position, horizon, limit):
+    """
+    Serialized rows changed since position, through the compiled row plan
+    when the serializer allows it.
+    """
+    queryset = changed_since(queryset, position, horizon)
+    plan = get_row_plan(serializer_class, queryset)
+    if plan is None:
+        queryset = optimize_queryset(queryset, serializer_class, ('change_txid',))
+        rows, position, more = next_position(list(queryset[:limit + 1]), limit, horizon)
+        return serializer_class(rows, many=True).data, position, more
+    rows = list(plan.get_rows(queryset, ('change_txid',))[:limit + 1])
+    rows, position, more = next_position(rows, limit, horizon)
+    return plan.serialize(rows), position, more
+
+
+def read_deletions(queryset, position, horizon, limit):
+    """
+    Object ids from tombstones since position, grouped by kind.
+    """
+    queryset = changed_since(queryset, position, horizon)
+    rows = list(queryset.values_list('change_txid', 'pk', 'kind', 'object_id', named=True)[:limit + 1])
+    rows, position, more = next_position(rows, limit, horizon)
+    deleted = {'livestock': [], 'health_record': []}
+    for row in rows:
+        deleted[row.kind].append(row.object_id)
+    return deleted, position, more
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sync.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = ('Delete change feed tombstones older than SYNC_TOMBSTONE_DAYS. '
+            'Clients whose cursor is older than that are told to resync from scratch')
+
+    def handle(self, *args, **options):
+        days = settings.SYNC_TOMBSTONE_DAYS
+        deleted = Tombstone.prune(timezone.now() - timedelta(days=days))
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones older than {days} days'))
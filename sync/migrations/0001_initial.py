@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('livestock', 'Livestock'), ('health_record', 'Health record')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('transferred', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('change_txid', models.BigIntegerField(default=0, editable=False)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tombstones', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', 'change_txid', 'id'], name='tombstone_owner_idx'), models.Index(fields=['change_txid', 'id'], name='tombstone_txid_idx'), models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'), models.Index(fields=['owner', 'kind', 'object_id'], name='tombstone_object_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# Tables served by the change feed (sync.feed); change_txid is kept by a
+# trigger so bulk_create() and update(), which bypass save() and the model
+# signals, are covered too.
+FEED_TABLES = ('livestock_livestock', 'health_records_healthrecord', 'sync_tombstone')
+
+CREATE_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION sync_set_change_txid() RETURNS trigger AS $$
+BEGIN
+    NEW.change_txid := txid_current();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+DROP_FUNCTION_SQL = 'DROP FUNCTION IF EXISTS sync_set_change_txid()'
+CREATE_TRIGGER_SQL = """
+CREATE TRIGGER change_txid BEFORE INSERT OR UPDATE ON "{table}"
+    FOR EACH ROW EXECUTE PROCEDURE sync_set_change_txid()
+"""
+DROP_TRIGGER_SQL = 'DROP TRIGGER IF EXISTS change_txid ON "{table}"'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+        ('livestock', '0001_initial'),
+        ('health_records', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FUNCTION_SQL, DROP_FUNCTION_SQL),
+        *(
+            migrations.RunSQL(CREATE_TRIGGER_SQL.format(table=table), DROP_TRIGGER_SQL.format(table=table))
+            for table in FEED_TABLES
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+User = get_user_model()
+
+class Tombstone(models.Model):
+    """
+    A row that left an owner's herd, either deleted or transferred to
+    another owner, kept so offline clients can drop their copy on the next sync.
+    """
+    KIND_CHOICES = [
+        ('livestock', 'Livestock'),
+        ('health_record', 'Health record'),
+    ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tombstones')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    transferred = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(default=timezone.now)
+    # Transaction that last wrote the row, set by a trigger; the sync change
+    # feed is ordered by it (see sync.feed).
+    change_txid = models.BigIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # The change feed seeks on (change_txid, id), per owner and globally for admins.
+            models.Index(fields=['owner', 'change_txid', 'id'], name='tombstone_owner_idx'),
+            models.Index(fields=['change_txid', 'id'], name='tombstone_txid_idx'),
+            # Pruning.
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+            models.Index(fields=['owner', 'kind', 'object_id'], name='tombstone_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner} - {self.kind} #{self.object_id} at {self.deleted_at}"
+
+    @classmethod
+    def record(cls, owner_id, kind, object_ids, transferred=False):
+        if owner_id is None or not object_ids:
+            return
+        cls.objects.bulk_create([
+            cls(owner_id=owner_id, kind=kind, object_id=object_id, transferred=transferred)
+            for object_id in object_ids
+        ])
+
+    @classmethod
+    def record_transfer(cls, previous_owner_id, owner_id, kind, object_ids):
+        """
+        Rows moving to another owner leave the previous owner's feed. Any
+        tombstones the new owner has for them are dropped, so a late client
+        never deletes an animal that came back.
+        """
+        cls.objects.filter(owner_id=owner_id, kind=kind, object_id__in=object_ids).delete()
+        cls.record(previous_owner_id, kind, object_ids, transferred=True)
+
+    @classmethod
+    def prune(cls, before):
+        return cls.objects.filter(deleted_at__lt=before).delete()[0]
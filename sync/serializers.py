@@ -0,0 +1,9 @@
+from django.conf import settings
+from rest_framework import serializers
+
+MAX_SYNC_LIMIT = 5000
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_SYNC_LIMIT, default=settings.SYNC_PAGE_SIZE)
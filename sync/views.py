@@ -0,0 +1,72 @@
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from health_records.models import HealthRecord
+from health_records.serializers import HealthRecordSyncSerializer
+from livestock.models import Livestock
+from livestock.serializers import LivestockSerializer
+from .feed import decode_cursor, encode_cursor, end_position, get_horizon, is_expired, read_changes, read_deletions
+from .models import Tombstone
+from .serializers import SyncQuerySerializer
+
+
+class SyncView(APIView):
+    """
+    Delta sync: rows of the user's herd changed since ?cursor=, and the ids
+    of rows that left it. Without a cursor the whole herd is sent. Clients
+    apply deletions before changes and call again while has_more is true;
+    reset means the cursor expired and the local copy must be replaced.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_querysets(self):
+        user = self.request.user
+        if user.is_admin:
+            # Admins see every herd, so animals changing owner are not removed.
+            return (Livestock.objects.with_age(), HealthRecord.objects.all(),
+                    Tombstone.objects.filter(transferred=False))
+        return (Livestock.objects.filter(owner=user).with_age(), HealthRecord.objects.filter(owner=user),
+                Tombstone.objects.filter(owner=user))
+
+    def get(self, request):
+        params = SyncQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        limit = params.validated_data['limit']
+        now = timezone.now()
+        horizon = get_horizon()
+
+        cursor = None
+        if 'cursor' in params.validated_data:
+            try:
+                cursor = decode_cursor(params.validated_data['cursor'])
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+        reset = cursor is not None and is_expired(cursor, now)
+        if cursor is None or reset:
+            # A fresh copy has nothing to delete.
+            cursor = {'livestock': None, 'health_records': None, 'deleted': end_position(horizon), 'since': now}
+
+        livestock, health_records, tombstones = self.get_querysets()
+        changed_livestock, livestock_position, livestock_more = read_changes(
+            livestock, LivestockSerializer, cursor['livestock'], horizon, limit)
+        changed_records, records_position, records_more = read_changes(
+            health_records, HealthRecordSyncSerializer, cursor['health_records'], horizon, limit)
+        deleted, deleted_position, deleted_more = read_deletions(tombstones, cursor['deleted'], horizon, limit)
+
+        # Unread tombstones may be as old as the cursor they were left behind by.
+        since = cursor['since'] if deleted_more else now
+        return Response({
+            'cursor': encode_cursor({
+                'livestock': livestock_position,
+                'health_records': records_position,
+                'deleted': deleted_position,
+            }, since),
+            'has_more': livestock_more or records_more or deleted_more,
+            'reset': reset,
+            'livestock': {'changed': changed_livestock, 'deleted': deleted['livestock']},
+            'health_records': {'changed': changed_records, 'deleted': deleted['health_record']},
+        })